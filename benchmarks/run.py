@@ -0,0 +1,222 @@
+"""
+Benchmark der Scoring- und Render-Stufen auf synthetischen INKAR-Daten.
+
+Aufruf (aus dem Projektverzeichnis):
+    python -m benchmarks.run --regions 1000 10000 100000 --years 20 --output bench.json
+    python -m benchmarks.run --regions 1000 --compare bench.json --guard 1.5
+
+Jede Stufe wird einzeln gemessen (Wall-Time, CPU-Zeit, Zeilenzahl, maximaler
+RSS des Prozesses, optional Spitzenwert der Python-Allokationen über
+tracemalloc). Die Ergebnisse werden als JSON geschrieben; mit --compare wird
+ein früherer Lauf als Referenz gegenübergestellt.
+
+Leistungsschranken (Exit-Code 1 bei Verletzung):
+- Kendalls Tau eines Stichprobenblocks darf höchstens TAU_GUARD-mal so lange
+  dauern wie np.sort desselben Blocks (unabhängig von der Maschine).
+- Mit --compare und --guard FAKTOR darf keine Stufe mehr als FAKTOR-mal so
+  lange dauern wie im Vergleichslauf.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.synthetic import generate_inkar, generate_reference
+from supplyscore.instrument import max_rss_bytes, rows_of
+from supplyscore.panel import score_panel
+from supplyscore.pipeline import STAGE_NAMES, ScoringParams, ScoringPipeline
+from supplyscore.regions import RegionIndex
+from supplyscore.selection import select_top, select_top_per_group
+from supplyscore.sensitivity import CHUNK_ELEMENTS, kendall_tau, rank_stability
+
+# Elemente (Regionen x Stichproben) der gemessenen Sensitivitätsanalyse
+SENSITIVITY_ELEMENTS = 10_000_000
+# Höchstzulässige Laufzeit von kendall_tau relativ zu np.sort desselben Blocks
+TAU_GUARD = 40
+
+
+def measure(stage, func, trace=False):
+    """Führt 'func' aus und misst Zeiten und Speicher; Rückgabe (Ergebnis, Messwerte)."""
+    if trace:
+        tracemalloc.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    result = func()
+    record = {
+        "stage": stage,
+        "wall_s": time.perf_counter() - wall,
+        "cpu_s": time.process_time() - cpu,
+        "rows": rows_of(result),
+        "max_rss_bytes": max_rss_bytes(),
+        "arrow_pool_max_bytes": pa.default_memory_pool().max_memory(),
+    }
+    if trace:
+        record["py_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, record
+
+
+def bench_case(workdir, n_regions, n_years, n_extra, figures, trace):
+    """Benchmark eines Datensatzes; Rückgabe: Liste der Messwerte je Stufe."""
+    path = Path(workdir) / f"inkar_{n_regions}_{n_years}_{n_extra}.parquet"
+    _, gen = measure("generate", lambda: generate_inkar(path, n_regions, n_years, n_extra))
+    store = generate_reference(Path(workdir) / f"referenz_{n_regions}", n_regions)
+
+    pipeline = ScoringPipeline(path, ScoringParams(), reference=store)
+    records = [gen]
+    pipeline.source_hash()  # Hash der Eingabedatei nicht der Stufe 'load' zurechnen
+
+    for stage in STAGE_NAMES:
+        if stage == "index":
+            # Referenzdaten-Join separat messen (Ersatz für die get_manual_data-Applies)
+            df = pipeline.stage("aggregate")
+            einwohner, filialen = pipeline.reference_data()
+
+            def join():
+                regions = RegionIndex(df[["Kennziffer", "Name"]])
+                regions.lookup(df["Kennziffer"], einwohner, 0)
+                return regions.lookup(df["Kennziffer"], filialen, 0)
+
+            _, rec = measure("reference_join", join, trace)
+            records.append(rec)
+        _, rec = measure(stage, lambda: pipeline.stage(stage), trace)
+        records.append(rec)
+
+    df_trend = pipeline.stage("index")
+    top, rec = measure("select", lambda: select_top(df_trend), trace)
+    records.append(rec)
+    # Top-N je Gruppe von 1000 aufeinanderfolgenden Kennziffern (vgl. Regierungsbezirke)
+    _, rec = measure("select_groups", lambda: select_top_per_group(df_trend, by=df_trend["Kennziffer"].str[:5]),
+                     trace)
+    records.append(rec)
+    # Trendmerkmale und Score-Historie aller Jahre
+    _, rec = measure("panel", lambda: score_panel(pipeline)[1], trace)
+    records.append(rec)
+    # Rangstabilität und Kendalls Tau eines Stichprobenblocks (Schranke relativ zu np.sort)
+    n_samples = max(100, SENSITIVITY_ELEMENTS // len(df_trend))
+    _, rec = measure("sensitivity", lambda: rank_stability(df_trend, n=n_samples, blacklist=())[0], trace)
+    records.append(rec)
+    records.append(bench_tau(len(df_trend)))
+
+    if figures:
+        from supplyscore.render import FIGURES, apply_style, render_figure
+        apply_style()
+        out = Path(workdir) / "figures"
+        out.mkdir(exist_ok=True)
+        for name, (_, cols) in FIGURES.items():
+            _, rec = measure(f"figure:{name}", lambda: render_figure(name, top[cols].copy(), out), trace)
+            records.append(rec)
+
+    for rec in records:
+        rec.update(regions=n_regions, years=n_years, extra_indikatoren=n_extra)
+    return records
+
+
+def bench_tau(n_regions, seed=0):
+    """Laufzeit von kendall_tau für einen Block aus CHUNK_ELEMENTS Elementen, relativ zu np.sort."""
+    rng = np.random.default_rng(seed)
+    baseline = rng.random(n_regions)
+    scores = (baseline + rng.normal(0, 0.1, (max(1, CHUNK_ELEMENTS // n_regions), n_regions))).T
+    wall = time.perf_counter()
+    np.sort(scores.T, axis=-1)
+    sort_s = time.perf_counter() - wall
+    _, rec = measure("kendall_tau", lambda: kendall_tau(scores, baseline))
+    rec.update(sort_s=sort_s, faktor_sort=rec["wall_s"] / sort_s, rows=n_regions)
+    return rec
+
+
+def guard(records, factor=None, baseline_path=None):
+    """Verletzte Leistungsschranken (Liste von Meldungen)."""
+    failures = [f"kendall_tau ({r['regions']} Regionen): {r['faktor_sort']:.1f}x np.sort > {TAU_GUARD}"
+                for r in records if r["stage"] == "kendall_tau" and r["faktor_sort"] > TAU_GUARD]
+    if factor and baseline_path:
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        old = {(r["regions"], r["years"], r["extra_indikatoren"], r["stage"]): r["wall_s"] for r in baseline}
+        for r in records:
+            o = old.get((r["regions"], r["years"], r["extra_indikatoren"], r["stage"]))
+            if o and r["wall_s"] > factor * o:
+                failures.append(f"{r['stage']} ({r['regions']} Regionen): {r['wall_s']:.4f} s > {factor} x {o:.4f} s")
+    return failures
+
+
+def git_version():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(records, baseline_path):
+    """Gegenüberstellung mit einem früheren Lauf (Faktor der Wall-Time je Stufe)."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    key = lambda r: (r["regions"], r["years"], r["extra_indikatoren"], r["stage"])
+    old = {key(r): r for r in baseline}
+    print(f"{'Stufe':<40} {'Regionen':>9} {'alt [s]':>10} {'neu [s]':>10} {'Faktor':>8}")
+    for r in records:
+        o = old.get(key(r))
+        if o is None:
+            continue
+        ratio = r["wall_s"] / o["wall_s"] if o["wall_s"] else float("nan")
+        flag = "  <-- langsamer" if ratio > 1.2 else ""
+        print(f"{r['stage']:<40} {r['regions']:>9} {o['wall_s']:>10.4f} {r['wall_s']:>10.4f} {ratio:>8.2f}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark der SupplyScore-Stufen")
+    parser.add_argument("--regions", type=int, nargs="+", default=[1000, 10000], help="Anzahl der Regionen")
+    parser.add_argument("--years", type=int, default=10, help="Anzahl der Jahre")
+    parser.add_argument("--extra-indikatoren", type=int, default=0, help="zusätzliche (ungenutzte) Indikatoren")
+    parser.add_argument("--ohne-abbildungen", action="store_true", help="Render-Stufen nicht messen")
+    parser.add_argument("--tracemalloc", action="store_true", help="Python-Allokationen je Stufe messen (langsamer)")
+    parser.add_argument("--workdir", help="Ordner für synthetische Daten (Standard: temporär)")
+    parser.add_argument("--output", help="Ergebnisdatei (JSON)")
+    parser.add_argument("--compare", help="früherer Lauf (JSON) zum Vergleich")
+    parser.add_argument("--guard", type=float, metavar="FAKTOR",
+                        help="mit --compare: Exit-Code 1, wenn eine Stufe mehr als FAKTOR-mal langsamer ist")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(args.workdir or tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        records = []
+        for n in args.regions:
+            records.extend(bench_case(workdir, n, args.years, args.extra_indikatoren, not args.ohne_abbildungen,
+                                      args.tracemalloc))
+
+    result = {
+        "meta": {
+            "version": git_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "pyarrow": pa.__version__,
+            "platform": platform.platform(),
+        },
+        "results": records,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    for rec in records:
+        print(json.dumps(rec))
+    if args.compare:
+        compare(records, args.compare)
+    failures = guard(records, args.guard, args.compare)
+    if failures:
+        raise SystemExit("Leistungsschranke verletzt:\n" + "\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
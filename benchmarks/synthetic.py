@@ -0,0 +1,98 @@
+"""
+Synthetische INKAR-Daten für Benchmarks.
+
+Erzeugt einen Extrakt im INKAR-Long-Format (Kennziffer, Name, Nordbayern,
+Raumbezug, Zeitbezug, Indikator, Wert) mit frei wählbarer Anzahl an Regionen,
+Jahren und zusätzlichen Indikatoren sowie passende Referenzdaten (Einwohner,
+Filialen). Die Parquet-Datei wird blockweise geschrieben, sodass auch
+10^6 Regionen ohne vollständige Materialisierung im Speicher erzeugt werden.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from supplyscore import config
+from supplyscore.reference import EINWOHNER, FILIALEN, ReferenceStore
+
+# Größenordnung der Indikatorwerte (Mittelwert) für plausible Verteilungen
+INDIKATOR_NIVEAU = {
+    "Einzelhandelsrelevante Kaufkraft": 8000.0, "Haushalte mit hohem Einkommen": 30.0, "Medianeinkommen": 3600.0,
+    "Einwohnerdichte": 300.0, "Beschäftigtendichte (AO)": 350.0,
+    "Bruttoinlandsprodukt je Einwohner in Kaufkraftstandards (KKS)": 38000.0, "Pkw-Dichte": 600.0,
+    "Arbeitslosenquote": 4.0, "Haushalte mit niedrigem Einkommen": 22.0,
+}
+
+SCHEMA = pa.schema([
+    ("Kennziffer", pa.string()), ("Name", pa.string()), ("Nordbayern", pa.bool_()), ("Raumbezug", pa.string()),
+    ("Zeitbezug", pa.string()), ("Indikator", pa.string()), ("Wert", pa.float64()),
+])
+
+
+def kennziffern(n_regions):
+    """Eindeutige 8-stellige Kennziffern."""
+    return np.char.zfill(np.arange(1, n_regions + 1).astype(str), 8)
+
+
+def region_names(n_regions):
+    """Regionsnamen; jede zehnte Region ist eine kreisfreie Stadt mit gleichnamigem Landkreis."""
+    idx = np.arange(n_regions)
+    names = np.array([f"Region {i}" for i in idx - (idx % 10 == 1)], dtype=object)
+    stadt = idx % 10 == 0
+    names[stadt] = names[stadt] + ", Stadt"
+    return names
+
+
+def generate_inkar(path, n_regions=1000, n_years=10, n_extra_indikatoren=0, nordbayern_anteil=0.5,
+                   first_year=2000, block_regions=10_000, row_group_size=1_000_000, seed=0):
+    """
+    Schreibt einen synthetischen INKAR-Extrakt als Parquet-Datei und gibt die
+    Anzahl der geschriebenen Zeilen zurück.
+    """
+    rng = np.random.default_rng(seed)
+    indikatoren = list(config.INDIKATOREN) + [f"Zusatzindikator {i}" for i in range(n_extra_indikatoren)]
+    niveau = np.array([INDIKATOR_NIVEAU.get(i, 100.0) for i in indikatoren])
+    years = np.array([str(first_year + y) for y in range(n_years)], dtype=object)
+    kz_all, names_all = kennziffern(n_regions), region_names(n_regions)
+    nb_all = rng.random(n_regions) < nordbayern_anteil
+
+    n_ind, n_y = len(indikatoren), n_years
+    rows = 0
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with pq.ParquetWriter(path, SCHEMA) as writer:
+        for start in range(0, n_regions, block_regions):
+            stop = min(start + block_regions, n_regions)
+            n_r = stop - start
+            r = np.repeat(np.arange(start, stop), n_ind * n_y)
+            i = np.tile(np.repeat(np.arange(n_ind), n_y), n_r)
+            y = np.tile(np.arange(n_y), n_r * n_ind)
+
+            # Werte: regionales Niveau, leichter Trend über die Jahre, Rauschen
+            regional = rng.lognormal(0.0, 0.25, size=(n_r, n_ind))
+            trend = 1 + 0.01 * y
+            wert = niveau[i] * regional[r - start, i] * trend * rng.normal(1.0, 0.02, size=len(r))
+
+            table = pa.table({
+                "Kennziffer": kz_all[r], "Name": names_all[r], "Nordbayern": nb_all[r],
+                "Raumbezug": np.full(len(r), "Kreise", dtype=object), "Zeitbezug": years[y],
+                "Indikator": np.array(indikatoren, dtype=object)[i], "Wert": wert,
+            }, schema=SCHEMA)
+            writer.write_table(table, row_group_size=row_group_size)
+            rows += len(r)
+    return rows
+
+
+def generate_reference(root, n_regions, abdeckung=0.8, stand="2026-01-01", seed=0):
+    """Schreibt synthetische Referenzdaten (Einwohner, Filialen) für einen Anteil der Regionen."""
+    rng = np.random.default_rng(seed + 1)
+    kz = kennziffern(n_regions)
+    covered = kz[rng.random(n_regions) < abdeckung]
+    einwohner = rng.lognormal(11.0, 0.6, size=len(covered)).round()
+    filialen = np.maximum(1, (einwohner / rng.normal(3800, 600, size=len(covered))).round())
+    store = ReferenceStore(root)
+    store.write(EINWOHNER, pd.Series(einwohner, index=covered), stand)
+    store.write(FILIALEN, pd.Series(filialen, index=covered), stand)
+    return store
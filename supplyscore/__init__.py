@@ -0,0 +1,34 @@
+"""
+SupplyScore - Analyse der regionalen Bankenversorgung.
+
+Das Paket enthält den Datenimport und das Scoring-Modell und lässt sich ohne
+die Plot-Bibliotheken (matplotlib, seaborn) importieren. Die Exporte werden
+erst beim ersten Zugriff geladen, sodass z. B. die Kommandozeile ohne pandas
+und pyarrow startet.
+"""
+
+import importlib
+
+# Exporte: Name -> Modul
+_EXPORTS = {
+    "config": "supplyscore.config",
+    "INKAR_PATH": "supplyscore.config",
+    "load_inkar": "supplyscore.data",
+    "ScoringParams": "supplyscore.pipeline",
+    "ScoringPipeline": "supplyscore.pipeline",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'supplyscore' has no attribute '{name}'")
+    module = importlib.import_module(_EXPORTS[name])
+    value = module if name == "config" else getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,3 @@
+from supplyscore.cli import main
+
+main()
@@ -0,0 +1,127 @@
+"""
+Batch-Berichte: ein Scoring-Lauf, viele Regionsgruppen.
+
+Das Scoring wird einmal auf dem gemeinsamen Indikator-Würfel berechnet; für
+jede Gruppe erfolgen danach nur noch Selektion und Rendering. Jede Gruppe
+erhält einen eigenen Ausgabeordner mit den Abbildungen und einer
+Ergebnistabelle ('ergebnisse.csv') sowie die Abdeckung der Referenzdaten
+für die Regionen der Gruppe ('abdeckung.json', siehe
+ScoringPipeline.coverage). Die Tabelle enthält alle Regionen der
+Gruppe; Regionen der Blacklist stehen mit 'ausgeschlossen' am Ende und
+erhalten keinen Rang, sodass 'Rang' der Reihenfolge der Abbildungen folgt.
+
+Gruppen werden als JSON-Liste beschrieben, z. B.:
+    [
+        {"name": "mittelfranken", "kennziffern": ["095"], "blacklist": ["Mittelfranken"]},
+        {"name": "nordbayern", "blacklist": ["Schweinfurt, Stadt"], "top_n": 8}
+    ]
+Felder: name (Pflicht), kennziffern (Präfixe), namen (exakte Namen),
+blacklist, top_n, sort_by. Fehlende Felder übernehmen die Standardwerte aus
+supplyscore/config.py.
+"""
+
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from supplyscore import config
+from supplyscore.pipeline import ScoringPipeline
+from supplyscore.selection import select_top, selection_mask
+
+RESULTS_FILE = "ergebnisse.csv"
+COVERAGE_FILE = "abdeckung.json"
+
+
+def load_groups(path):
+    """Liest die Gruppendefinitionen aus einer JSON-Datei."""
+    with open(path, encoding="utf-8") as f:
+        groups = json.load(f)
+    if isinstance(groups, dict):
+        groups = [dict(name=name, **spec) for name, spec in groups.items()]
+    for group in groups:
+        if "name" not in group:
+            raise ValueError(f"Gruppe ohne 'name': {group}")
+    return groups
+
+
+def group_dirname(name):
+    """Ordnername einer Gruppe (Pfadtrenner und Leerzeichen werden ersetzt)."""
+    return re.sub(r"[\\/\s]+", "_", str(name)).strip("_")
+
+
+def group_dirnames(groups):
+    """
+    Ordnernamen aller Gruppen. Gruppen, deren Namen auf denselben Ordner
+    führen (auch bei abweichender Groß-/Kleinschreibung), erhalten die Zusätze
+    '_2', '_3', ...; doppelte Gruppennamen sind ein Fehler.
+    """
+    names = [group["name"] for group in groups]
+    duplicates = sorted({str(n) for n in names if names.count(n) > 1})
+    if duplicates:
+        raise ValueError(f"Doppelte Gruppennamen: {', '.join(duplicates)}")
+    dirnames, used = {}, set()
+    for name in names:
+        base = dirname = group_dirname(name)
+        suffix = 1
+        while dirname.casefold() in used:
+            suffix += 1
+            dirname = f"{base}_{suffix}"
+        used.add(dirname.casefold())
+        dirnames[name] = dirname
+    return dirnames
+
+
+def select_group(df_trend, group):
+    """
+    Ergebnistabelle und Top-N-Auswahl einer Gruppe. Die Tabelle enthält alle
+    Regionen der Gruppe nach 'sort_by'; gerankt werden nur Regionen außerhalb
+    der Blacklist, ausgeschlossene folgen ohne Rang (ausgeschlossen=True).
+    """
+    sort_by = group.get("sort_by", config.SORT_BY)
+    table = select_top(df_trend, blacklist=(), top_n=len(df_trend), sort_by=sort_by,
+                       kennziffern=group.get("kennziffern"), namen=group.get("namen"))
+    allowed = selection_mask(table, group.get("blacklist", config.BLACKLIST))
+    top = table[allowed].head(group.get("top_n", config.TOP_N))
+
+    table = pd.concat([table[allowed], table[~allowed]])
+    rang = pd.array(np.arange(1, len(table) + 1), dtype="Int64")
+    rang[int(allowed.sum()):] = pd.NA
+    table.insert(0, "ausgeschlossen", np.sort(~allowed))
+    table.insert(0, "Rang", rang)
+    return table, top
+
+
+def run_batch(groups, output_root="reports", pipeline=None, processes=None, render=True, formate=("print",),
+              cache=True):
+    """
+    Berechnet das Scoring einmal und erzeugt für jede Gruppe Ergebnistabelle,
+    Abdeckung der Referenzdaten und Abbildungen. Das Rendering aller Gruppen läuft in einem gemeinsamen
+    Prozess-Pool; unveränderte Abbildungen werden übersprungen (Render-Cache,
+    abschaltbar mit cache=False). 'formate' sind Ausgabeformate aus
+    render.OUTPUTS. Rückgabe: {Gruppenname: Ausgabeordner}.
+    """
+    pipeline = ScoringPipeline() if pipeline is None else pipeline
+    df_trend = pipeline.run()
+    output_root = Path(output_root)
+
+    outputs, jobs = {}, []
+    dirnames = group_dirnames(groups)
+    if render:
+        from supplyscore.render import figure_jobs, render_jobs
+    for group in groups:
+        out = output_root / dirnames[group["name"]]
+        out.mkdir(parents=True, exist_ok=True)
+        table, top = select_group(df_trend, group)
+        table.to_csv(out / RESULTS_FILE, index=False)
+        with open(out / COVERAGE_FILE, "w", encoding="utf-8") as f:
+            json.dump(pipeline.coverage(kennziffern=table["Kennziffer"]), f, ensure_ascii=False, indent=2)
+        if render and len(top):
+            jobs.extend(figure_jobs(top, out, outputs=formate))
+        outputs[group["name"]] = out
+
+    if jobs:
+        render_jobs(jobs, processes, cache)
+    return outputs
@@ -0,0 +1,137 @@
+"""
+Persistenter Ergebnis-Cache für die Scoring-Tabelle.
+
+Die vollständige Ergebnistabelle (Rohwerte, S_*, Cat_*, Score_*, Hunter_Index,
+Index_Vorher, Index_Nachher) wird als Parquet-Datei unter
+'cache/ergebnisse/<schlüssel>.parquet' abgelegt. Der Schlüssel ist ein
+SHA-256-Hash über den Inhalt der INKAR-Datei, den Inhalt der verwendeten
+Referenzdateien (Einwohner, Filialen), sämtliche Scoring-Parameter und die
+CACHE_VERSION (bei Änderungen am Scoring-Modell zu erhöhen). Ändert sich eine
+dieser Eingaben, entsteht ein neuer Schlüssel; veraltete Einträge werden nie
+gelesen.
+
+Damit spätere Läufe die Eingabedateien nicht erneut vollständig lesen müssen,
+werden deren Inhalts-Hashes zusätzlich nach Pfad, Größe und Änderungszeit in
+'hashes.json' vorgehalten. 'manifest.json' verzeichnet je Schlüssel Erstellzeit,
+Eingaben und Parameter für nachgelagerte Werkzeuge (z. B. BI-Tool).
+
+Beispiel:
+    pipeline = ScoringPipeline(result_cache=ResultCache())
+    df_trend = pipeline.run()     # erster Lauf: Berechnung und Ablage
+    df_trend = pipeline.run()     # spätere Läufe/Prozesse: Laden aus dem Cache
+    ResultCache().latest()        # zuletzt abgelegte Tabelle (ohne Pipeline)
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+from supplyscore.pipeline import file_hash
+
+CACHE_PATH = Path("cache/ergebnisse")
+CACHE_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+HASHES_FILE = "hashes.json"
+
+
+class ResultCache:
+    """Ablage der Ergebnistabellen nach Inhalts-Schlüssel."""
+
+    def __init__(self, root=CACHE_PATH):
+        self.root = Path(root)
+        self._hashes = None
+
+    def path(self, key):
+        return self.root / f"{key}.parquet"
+
+    # ------------------------------------------
+    # Inhalts-Hashes der Eingabedateien
+    # ------------------------------------------
+    def file_hash(self, path):
+        """SHA-256 des Dateiinhalts; bekannte Dateien (gleiche Größe/Änderungszeit) werden nicht erneut gelesen."""
+        path = Path(path)
+        stat = path.stat()
+        entry = str(path.resolve())
+        hashes = self._load_hashes()
+        known = hashes.get(entry)
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            return known["sha256"]
+        digest = file_hash(path)
+        hashes[entry] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        self._write_json(HASHES_FILE, hashes)
+        return digest
+
+    def _load_hashes(self):
+        if self._hashes is None:
+            self._hashes = self._read_json(HASHES_FILE)
+        return self._hashes
+
+    # ------------------------------------------
+    # Ergebnistabellen
+    # ------------------------------------------
+    def load(self, key):
+        """Ergebnistabelle zu 'key' oder None, falls nicht vorhanden."""
+        path = self.path(key)
+        if not path.exists():
+            return None
+        return pq.read_table(path, memory_map=True).to_pandas()
+
+    def store(self, key, df, inputs=None, params=None):
+        """Legt eine Ergebnistabelle ab (atomar über eine temporäre Datei) und ergänzt das Manifest."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        df.to_parquet(tmp, index=False, compression="zstd")
+        os.replace(tmp, path)
+
+        manifest = self._read_json(MANIFEST_FILE)
+        manifest.pop(key, None)  # Reihenfolge des Manifests = Reihenfolge der Ablage
+        manifest[key] = {
+            "datei": path.name,
+            "erstellt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "zeilen": len(df),
+            "eingaben": inputs or {},
+            "parameter": params or {},
+        }
+        self._write_json(MANIFEST_FILE, manifest)
+        return path
+
+    def manifest(self):
+        """Alle Einträge: Schlüssel -> Metadaten (Datei, Erstellzeit, Eingaben, Parameter)."""
+        return self._read_json(MANIFEST_FILE)
+
+    def latest(self):
+        """Zuletzt abgelegte Ergebnistabelle (None bei leerem Cache)."""
+        keys = [k for k in self.manifest() if self.path(k).exists()]
+        if not keys:
+            return None
+        return self.load(keys[-1])
+
+    def clear(self):
+        """Entfernt alle Einträge des Caches."""
+        for path in self.root.glob("*.parquet"):
+            path.unlink()
+        for name in (MANIFEST_FILE, HASHES_FILE):
+            (self.root / name).unlink(missing_ok=True)
+        self._hashes = None
+
+    # ------------------------------------------
+    # Hilfsfunktionen
+    # ------------------------------------------
+    def _read_json(self, name):
+        try:
+            with open(self.root / name, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_json(self, name, data):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f"{name}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.root / name)
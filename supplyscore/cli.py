@@ -0,0 +1,259 @@
+"""
+Kommandozeile von SupplyScore.
+
+Beim Start werden nur argparse und die Konfiguration geladen; pandas, pyarrow
+und die Plot-Bibliotheken (matplotlib, seaborn) erst im jeweiligen
+Unterbefehl, die Plot-Bibliotheken nur bei 'render' und 'batch'.
+
+Aufruf:
+    python -m supplyscore score --top-n 8
+    python -m supplyscore export ergebnisse.parquet
+    python -m supplyscore render --output figures --formate print web svg
+    python -m supplyscore batch data/gruppen/regierungsbezirke.json --output reports
+    python -m supplyscore update state/ --delta neue_zeilen.parquet
+    python -m supplyscore sensitivity --ziel Hunter_Index --methode dirichlet --stichproben 100000
+    python -m supplyscore --alle-regionen --blockgroesse 1000000 stream ergebnisse.parquet
+    python -m supplyscore panel panel/ --fenster 3
+    python -m supplyscore serve --port 8765
+"""
+
+import argparse
+import sys
+
+from supplyscore import config
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="supplyscore", description="Analyse der regionalen Bankenversorgung")
+    parser.add_argument("--data", default=str(config.INKAR_PATH), help="INKAR-Extrakt (Parquet)")
+    parser.add_argument("--alle-regionen", action="store_true",
+                        help="alle Regionen der Datei bewerten statt nur Nordbayern")
+    parser.add_argument("--ohne-cache", action="store_true",
+                        help="Ergebnistabelle nicht aus cache/ergebnisse laden bzw. dort ablegen")
+    parser.add_argument("--normalisierung", default=config.NORMALISIERUNG,
+                        choices=["minmax", "winsorized", "rank", "zscore"],
+                        help="Normalisierung der Indikatoren und Sub-Scores (siehe supplyscore/normalization.py)")
+    parser.add_argument("--winsor", type=float, nargs=2, default=config.WINSOR_QUANTILE, metavar=("UNTEN", "OBEN"),
+                        help="Quantile der Begrenzung bei --normalisierung winsorized")
+    parser.add_argument("--blockgroesse", type=int, metavar="ZEILEN",
+                        help="INKAR-Extrakt blockweise mit höchstens ZEILEN Zeilen je Block lesen (Out-of-core)")
+    parser.add_argument("--instrument", metavar="ZIEL",
+                        help="Laufzeit je Stufe als JSON-Zeilen ausgeben: 'stderr' oder Dateipfad")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    score = sub.add_parser("score", help="Scoring ausführen und die Top-N-Regionen ausgeben (ohne Abbildungen)")
+    add_selection_args(score)
+
+    render = sub.add_parser("render", help="Scoring ausführen und die fünf Abbildungen erzeugen")
+    add_selection_args(render)
+    render.add_argument("--output", default="figures", help="Zielordner der Abbildungen")
+    render.add_argument("--processes", type=int, default=None, help="Anzahl der Render-Prozesse")
+    add_render_args(render)
+
+    export = sub.add_parser("export", help="vollständige Ergebnistabelle schreiben (CSV oder Parquet)")
+    export.add_argument("output", help="Zieldatei; Format nach Endung (.csv, .parquet)")
+
+    batch = sub.add_parser("batch", help="Berichte für mehrere Regionsgruppen in einem Lauf erzeugen")
+    batch.add_argument("groups", help="JSON-Datei mit den Gruppendefinitionen")
+    batch.add_argument("--output", default="reports", help="Zielordner (ein Unterordner je Gruppe)")
+    batch.add_argument("--processes", type=int, default=None, help="Anzahl der Render-Prozesse")
+    batch.add_argument("--ohne-abbildungen", action="store_true", help="nur Ergebnistabellen schreiben")
+    add_render_args(batch)
+
+    update = sub.add_parser("update", help="persistierten Scoring-Zustand inkrementell aktualisieren")
+    update.add_argument("state", help="Ordner des Scoring-Zustands")
+    update.add_argument("--delta", help="neue Zeilen im INKAR-Long-Format (Parquet); ohne Angabe: Neuaufbau")
+
+    sens = sub.add_parser("sensitivity", help="Rangstabilität unter variierenden Gewichten/Faktoren")
+    sens.add_argument("--ziel", default="Hunter_Index", choices=["Hunter_Index", "Index_Nachher", "Index_Final"],
+                      help="bewertete Zielgröße (Gewichte, straf_faktor bzw. scaling_factor)")
+    sens.add_argument("--methode", choices=["dirichlet", "lhs", "grid"],
+                      help="Stichprobenverfahren (Standard: dirichlet für Hunter_Index, sonst lhs)")
+    sens.add_argument("--stichproben", type=int, default=10_000, help="Anzahl der Stichproben (dirichlet, lhs)")
+    sens.add_argument("--stufen", type=int, default=10, help="Gitterpunkte je Parameter (grid)")
+    sens.add_argument("--konzentration", type=float, default=1.0,
+                      help="Dirichlet-Konzentration um die Standardgewichte (1 = gleichverteilt)")
+    sens.add_argument("--top-n", type=int, default=8, help="Größe der Spitzengruppe")
+    sens.add_argument("--seed", type=int, default=0)
+    sens.add_argument("--stichproben-je-block", type=int, default=None,
+                      help="Stichproben je Rechenblock (Standard: sensitivity.CHUNK_ELEMENTS / Anzahl der Regionen)")
+    sens.add_argument("--output", help="Ergebnistabelle (CSV)")
+
+    stream = sub.add_parser("stream", help="Ergebnistabelle blockweise berechnen und als Parquet schreiben")
+    stream.add_argument("output", help="Zieldatei (Parquet)")
+    stream.add_argument("--regionen-je-block", type=int, default=None,
+                        help="Regionen je Scoring-Block (Standard: streaming.CHUNK_REGIONS)")
+
+    panel = sub.add_parser("panel", help="Trendmerkmale je Indikator und Score-Historie aller Jahre schreiben")
+    panel.add_argument("output", help="Zielordner (trends und historie)")
+    panel.add_argument("--fenster", type=int, default=config.TREND_FENSTER,
+                       help="Vorjahre im gleitenden Mittel der Dynamik")
+    panel.add_argument("--format", default="parquet", choices=["parquet", "csv"], help="Dateiformat")
+
+    serve = sub.add_parser("serve", help="Was-wäre-wenn-Abfragen (Filialen, Einwohner) über einen lokalen HTTP-Dienst")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    return parser
+
+
+def add_selection_args(parser):
+    parser.add_argument("--top-n", type=int, default=config.TOP_N, help="Anzahl der ausgewählten Regionen")
+    parser.add_argument("--sort-by", default=config.SORT_BY, help="Indexspalte für die Auswahl")
+
+
+def add_render_args(parser):
+    parser.add_argument("--formate", nargs="+", default=["print"], choices=["print", "web", "svg", "pdf"],
+                        help="Ausgabeformate: PNG für Druck (300 dpi) bzw. Web (100 dpi), SVG, PDF")
+    parser.add_argument("--neu", action="store_true", help="alle Abbildungen neu erzeugen (Render-Cache ignorieren)")
+
+
+def make_pipeline(args):
+    from supplyscore.pipeline import ScoringParams, ScoringPipeline
+    from supplyscore.cache import ResultCache
+    params = ScoringParams(nordbayern=None if args.alle_regionen else True, normalisierung=args.normalisierung,
+                           winsor_quantile=tuple(args.winsor))
+    return ScoringPipeline(args.data, params, result_cache=None if args.ohne_cache else ResultCache(),
+                           batch_size=args.blockgroesse)
+
+
+def report_coverage(pipeline):
+    """Meldet Regionen ohne Referenzwert (Ersatzwert aus der Konfiguration) auf stderr."""
+    for dataset, info in pipeline.coverage().items():
+        if info["fallback"]:
+            print(f"Hinweis: {dataset}: {info['fallback']} von {info['regionen']} Regionen ohne Referenzwert "
+                  f"(Ersatzwert): {', '.join(info['fallback_kennziffern'])}", file=sys.stderr)
+
+
+def select(args):
+    """Top-N der Ergebnistabelle (ohne Blacklist) für 'score' und 'render'."""
+    from supplyscore.selection import select_top
+    pipeline = make_pipeline(args)
+    top = select_top(pipeline.run(), blacklist=config.BLACKLIST, top_n=args.top_n, sort_by=args.sort_by)
+    report_coverage(pipeline)
+    return top
+
+
+def cmd_score(args):
+    top = select(args)
+    print(top[["Kennziffer", "Name", "Index_Vorher", "Index_Nachher", "Hunter_Index"]].to_string(index=False))
+
+
+def cmd_render(args):
+    from supplyscore.render import render_all
+    for path in render_all(select(args), args.output, processes=args.processes, outputs=args.formate,
+                           cache=not args.neu):
+        print(path)
+
+
+def cmd_export(args):
+    from pathlib import Path
+    pipeline = make_pipeline(args)
+    df = pipeline.run()
+    report_coverage(pipeline)
+    suffix = Path(args.output).suffix.lower()
+    if suffix == ".csv":
+        df.to_csv(args.output, index=False)
+    elif suffix in (".parquet", ".pq"):
+        df.to_parquet(args.output, index=False, compression="zstd")
+    else:
+        raise SystemExit(f"Fehler: unbekanntes Format '{suffix}' (erwartet .csv oder .parquet)")
+    print(f"{len(df)} Regionen nach {args.output} geschrieben")
+
+
+def cmd_batch(args):
+    from supplyscore.batch import load_groups, run_batch
+    pipeline = make_pipeline(args)
+    outputs = run_batch(load_groups(args.groups), args.output, pipeline=pipeline,
+                        processes=args.processes, render=not args.ohne_abbildungen, formate=args.formate,
+                        cache=not args.neu)
+    report_coverage(pipeline)
+    for name, out in outputs.items():
+        print(f"{name}: {out}")
+
+
+def cmd_update(args):
+    from pathlib import Path
+    from supplyscore.data import load_inkar
+    from supplyscore.incremental import STATE_FILE, IncrementalScorer, StructuralChange
+    pipeline = make_pipeline(args)
+    if args.delta is None or not (Path(args.state) / STATE_FILE).exists():
+        IncrementalScorer.build(args.state, pipeline)
+        print(f"Zustand neu aufgebaut: {args.state}")
+        return
+    scorer = IncrementalScorer.open(args.state)
+    rows = load_inkar(args.delta, indikatoren=pipeline.params.indikatoren, nordbayern=pipeline.params.nordbayern)
+    try:
+        report = scorer.apply(rows)
+    except StructuralChange as e:
+        print(f"Strukturelle Änderung ({e}), vollständiger Neuaufbau")
+        IncrementalScorer.build(args.state, pipeline)
+        return
+    print(f"{len(report['regionen'])} Regionen aktualisiert, neu normalisiert: "
+          f"{', '.join(report['normalisiert']) or '-'}, Indizes neu berechnet: {report['neu_berechnet']}")
+
+
+def cmd_sensitivity(args):
+    import numpy as np
+    from supplyscore.sensitivity import default_method, rank_stability
+    if args.methode == "dirichlet" and default_method(args.ziel) != "dirichlet":
+        raise SystemExit(f"Fehler: --methode dirichlet variiert Gewichte und ist für {args.ziel} "
+                         f"(ein Faktor) nicht möglich; lhs oder grid verwenden")
+    try:
+        table, taus = rank_stability(make_pipeline(args).run(), args.ziel, top_n=args.top_n,
+                                     method=args.methode or default_method(args.ziel),
+                                     n=args.stichproben, steps=args.stufen, seed=args.seed,
+                                     konzentration=args.konzentration, chunk_size=args.stichproben_je_block)
+    except ValueError as e:
+        raise SystemExit(f"Fehler: {e}")
+    if args.output:
+        table.to_csv(args.output, index=False)
+    print(table.head(2 * args.top_n).to_string(index=False))
+    print(f"\nKendalls Tau gegenüber der Basis ({len(taus)} Stichproben): Mittel {taus.mean():.3f}, "
+          f"5 %-Quantil {np.quantile(taus, 0.05):.3f}, Minimum {taus.min():.3f}")
+
+
+def cmd_stream(args):
+    from supplyscore.streaming import CHUNK_REGIONS, stream_scores
+    rows = stream_scores(make_pipeline(args), args.output, chunk_regions=args.regionen_je_block or CHUNK_REGIONS)
+    print(f"{rows} Regionen nach {args.output} geschrieben")
+
+
+def cmd_panel(args):
+    from pathlib import Path
+    from supplyscore.panel import score_panel
+    out = Path(args.output)
+    out.mkdir(parents=True, exist_ok=True)
+    for name, df in zip(("trends", "historie"), score_panel(make_pipeline(args), fenster=args.fenster)):
+        path = out / f"{name}.{args.format}"
+        if args.format == "csv":
+            df.to_csv(path, index=False)
+        else:
+            df.to_parquet(path, index=False, compression="zstd")
+        print(f"{len(df)} Zeilen nach {path} geschrieben")
+
+
+def cmd_serve(args):
+    from supplyscore.whatif import WhatIfModel, serve
+    try:
+        model = WhatIfModel.from_pipeline(make_pipeline(args))
+    except ValueError as e:
+        raise SystemExit(f"Fehler: {e}")
+    print(f"Was-wäre-wenn-Dienst auf http://{args.host}:{args.port} (GET /basis, POST /szenario)")
+    serve(model, args.host, args.port)
+
+
+COMMANDS = {"score": cmd_score, "render": cmd_render, "export": cmd_export, "batch": cmd_batch, "update": cmd_update,
+            "sensitivity": cmd_sensitivity, "stream": cmd_stream, "panel": cmd_panel,
+            "serve": cmd_serve}
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.instrument:
+        from supplyscore.instrument import instrumentation
+        instrumentation.enable(args.instrument)
+    COMMANDS[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
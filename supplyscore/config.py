@@ -0,0 +1,92 @@
+"""
+Zentrale Konfiguration des Scoring-Modells: Datenbasis, Indikatoren,
+Kategorien und Gewichtungen.
+"""
+
+from pathlib import Path
+
+# ==========================================
+# DATENBASIS
+# ==========================================
+# Standardpfad des im Repository enthaltenen INKAR-Extrakts
+INKAR_PATH = Path("data/inkar/inkar_bayern_nordbayern.parquet")
+
+# ==========================================
+# INDIKATOREN UND KATEGORIEN
+# ==========================================
+# Definition der relevanten Indikatoren für die Analyse
+INDIKATOREN = (
+    "Einzelhandelsrelevante Kaufkraft", "Haushalte mit hohem Einkommen", "Medianeinkommen",
+    "Einwohnerdichte", "Beschäftigtendichte (AO)", "Bruttoinlandsprodukt je Einwohner in Kaufkraftstandards (KKS)",
+    "Pkw-Dichte",
+    "Arbeitslosenquote", "Haushalte mit niedrigem Einkommen",
+)
+
+# Bei Arbeitslosenquote und niedrigen Einkommen ist ein niedriger Wert besser (Invertierung)
+INVERTIERTE_INDIKATOREN = ("Arbeitslosenquote", "Haushalte mit niedrigem Einkommen")
+
+# Zuordnung der Indikatoren zu den vier Hauptkategorien
+KATEGORIEN = {
+    "Cat_Wohlstand": ("Einzelhandelsrelevante Kaufkraft", "Haushalte mit hohem Einkommen", "Medianeinkommen"),
+    "Cat_Wirtschaft": ("Einwohnerdichte", "Beschäftigtendichte (AO)",
+                       "Bruttoinlandsprodukt je Einwohner in Kaufkraftstandards (KKS)"),
+    "Cat_Mobilitaet": ("Pkw-Dichte",),
+    "Cat_Stabilitaet": ("Arbeitslosenquote", "Haushalte mit niedrigem Einkommen"),
+}
+
+# Indikator, auf dessen Basis das prozentuale Wachstum berechnet wird
+TREND_INDIKATOR = "Medianeinkommen"
+
+# Panel-Scoring (supplyscore/panel.py): Anzahl der Vorjahre im gleitenden Mittel
+# (Dynamik) und Gewichte der Trendmerkmale im Score_Trend je Indikator
+TREND_FENSTER = 3
+TREND_GEWICHTE = {
+    "Steigung": 1.0,
+    "CAGR": 1.0,
+    "Dynamik": 1.0,
+    "Volatilitaet": 0.5,
+}
+
+# Normalisierung der Indikatoren und Sub-Scores: "minmax", "winsorized", "rank" oder "zscore"
+# (siehe supplyscore/normalization.py); Quantile der Begrenzung bei "winsorized"
+NORMALISIERUNG = "minmax"
+WINSOR_QUANTILE = (0.05, 0.95)
+
+# ==========================================
+# GEWICHTUNGEN
+# ==========================================
+# Gewichte der Sub-Scores im Hunter-Index (gewichteter Durchschnitt, Divisor 5.0)
+HUNTER_GEWICHTE = {
+    "Score_Hunger": 2.0,
+    "Score_Trend": 1.5,
+    "Score_Security": 1.0,
+    "Score_Geld": 0.5,
+}
+HUNTER_DIVISOR = 5.0
+
+# Abzug der normierten Bankdichte vom strukturellen Index (Index_Nachher)
+STRAF_FAKTOR = 0.25
+
+# Skalierung der Abweichung vom Referenzwert Einwohner/Bank (Abbildung 4b)
+SCALING_FAKTOR = 0.004
+REF_EW_PRO_BANK = 3792
+
+# ==========================================
+# SELEKTION
+# ==========================================
+# Ausschluss definierter Städte (Blacklist) und Anzahl der dargestellten Regionen
+BLACKLIST = ("Schweinfurt, Stadt",)
+TOP_N = 8
+SORT_BY = "Index_Vorher"
+
+# ==========================================
+# DATENBASIS (REFERENZDATEN)
+# ==========================================
+# Einwohnerzahlen und Filialanzahlen je Kennziffer liegen versioniert unter
+# 'data/referenz/' (siehe supplyscore/reference.py). Stand, der standardmäßig
+# verwendet wird (None = jüngster verfügbarer Stand):
+REFERENZ_STAND = None
+
+# Ersatzwerte, falls keine Referenzdaten für eine Region vorliegen
+DEFAULT_EINWOHNER = 50000
+DEFAULT_FILIALEN = 20
@@ -0,0 +1,123 @@
+"""
+Mehrjähriger Indikator-Würfel (Region x Indikator x Jahr).
+
+Der Würfel wird in einem einzigen Durchlauf über die Long-Daten aufgebaut:
+Region, Indikator und Zeitbezug werden in Integer-Codes übersetzt, daraus
+ergibt sich ein flacher Index in ein dichtes NumPy-Array. Mehrfache Einträge
+je Zelle werden (wie bei pivot_table) gemittelt, leere Zellen sind NaN.
+Wachstumskennzahlen lassen sich anschließend für beliebige Jahrespaare oder
+als CAGR über die gesamte Reihe ohne erneutes Pivotieren berechnen.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class IndicatorCube:
+    """
+    Dichter Würfel 'values[region, indikator, jahr]' mit Index-Zuordnungen.
+
+    Regionen werden über die Kennziffer (AGS) geführt, 'names' enthält den
+    zugehörigen Anzeigenamen je Region.
+    """
+
+    def __init__(self, values, regions, names, indikatoren, years):
+        self.values = values
+        self.regions = pd.Index(regions, name="Kennziffer")
+        self.names = np.asarray(names, dtype=object)
+        self.indikatoren = pd.Index(indikatoren, name="Indikator")
+        self.years = pd.Index(years, name="Zeitbezug")
+        self.region_index = {r: i for i, r in enumerate(self.regions)}
+        self.indikator_index = {k: i for i, k in enumerate(self.indikatoren)}
+        self.year_index = {y: i for i, y in enumerate(self.years)}
+
+    @classmethod
+    def from_long(cls, df):
+        """Aufbau des Würfels aus Long-Daten (Kennziffer, Name, Indikator, Zeitbezug, Wert)."""
+        r_codes, regions = pd.factorize(df["Kennziffer"].astype(str), sort=True)
+        i_codes, indikatoren = pd.factorize(df["Indikator"].astype(str), sort=True)
+        y_codes, years = pd.factorize(df["Zeitbezug"].astype(str), sort=True)
+        n_r, n_i, n_y = len(regions), len(indikatoren), len(years)
+
+        wert = df["Wert"].to_numpy(dtype="float64", na_value=np.nan)
+        valid = ~np.isnan(wert)
+        flat = (r_codes.astype(np.int64) * n_i + i_codes) * n_y + y_codes
+
+        # Mittelwert je Zelle über Summe und Anzahl der gültigen Werte
+        sums = np.bincount(flat[valid], weights=wert[valid], minlength=n_r * n_i * n_y)
+        counts = np.bincount(flat[valid], minlength=n_r * n_i * n_y)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values = np.where(counts > 0, sums / counts, np.nan).reshape(n_r, n_i, n_y)
+
+        names = np.empty(n_r, dtype=object)
+        names[r_codes] = df["Name"].astype(str).to_numpy()
+        return cls(values, regions, names, indikatoren, years)
+
+    # ------------------------------------------
+    # Zugriff
+    # ------------------------------------------
+    @property
+    def year_numbers(self):
+        """Zeitbezüge als Zahlen (nicht numerische Angaben = NaN)."""
+        return pd.to_numeric(pd.Series(self.years), errors="coerce").to_numpy(dtype="float64")
+
+    def series(self, indikator):
+        """Zeitreihen eines Indikators als Matrix (Region x Jahr)."""
+        return self.values[:, self.indikator_index[indikator], :]
+
+    def year_slice(self, year):
+        """Querschnitt eines Jahres als Matrix (Region x Indikator)."""
+        return self.values[:, :, self.year_index[str(year)]]
+
+    def frame(self, year, suffix=""):
+        """
+        Querschnitt eines Jahres als DataFrame mit einer Zeile je Region.
+        Wie bei pivot_table entfallen Regionen und Indikatoren ohne Werte.
+        """
+        data = self.year_slice(year)
+        has_region = ~np.isnan(data).all(axis=1)
+        has_ind = ~np.isnan(data).all(axis=0)
+        out = pd.DataFrame(data[np.ix_(has_region, has_ind)],
+                           columns=[f"{c}{suffix}" for c in self.indikatoren[has_ind]])
+        out.insert(0, "Name", self.names[has_region])
+        out.insert(0, "Kennziffer", self.regions[has_region])
+        return out
+
+    # ------------------------------------------
+    # Wachstumskennzahlen
+    # ------------------------------------------
+    def growth(self, indikator, past_year, latest_year):
+        """Prozentuales Wachstum eines Indikators zwischen zwei Jahren (je Region)."""
+        s = self.series(indikator)
+        return growth(s[:, self.year_index[str(past_year)]], s[:, self.year_index[str(latest_year)]])
+
+    def cagr(self, indikator):
+        """
+        Durchschnittliche jährliche Wachstumsrate (in Prozent) je Region zwischen
+        dem ersten und dem letzten verfügbaren Wert der Reihe.
+        """
+        return cagr(self.series(indikator), self.year_numbers)
+
+
+def growth(old, new):
+    """Prozentuales Wachstum von 'old' auf 'new' (fehlende Werte bleiben fehlend)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (new - old) / old * 100
+
+
+def cagr(values, year_numbers):
+    """
+    CAGR (in Prozent) zwischen dem ersten und dem letzten verfügbaren Wert
+    entlang der letzten Achse von 'values' (z. B. Region x Jahr oder
+    Region x Indikator x Jahr).
+    """
+    valid = ~np.isnan(values)
+    n_y = values.shape[-1]
+    first = np.argmax(valid, axis=-1)
+    last = n_y - 1 - np.argmax(valid[..., ::-1], axis=-1)
+    periods = year_numbers[last] - year_numbers[first]
+    v0 = np.take_along_axis(values, first[..., None], axis=-1)[..., 0]
+    v1 = np.take_along_axis(values, last[..., None], axis=-1)[..., 0]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rate = (np.power(v1 / v0, 1 / periods) - 1) * 100
+    return np.where(valid.any(axis=-1) & (periods > 0) & (v0 > 0), rate, np.nan)
@@ -0,0 +1,74 @@
+"""
+Datenimport der INKAR-Extrakte.
+
+Die Parquet-Datei wird spaltenorientiert gelesen: Filter auf 'Nordbayern',
+'Indikator' und 'Zeitbezug' werden an den Parquet-Reader durchgereicht
+(Predicate Pushdown), und es werden nur die für das Scoring benötigten
+Spalten geladen (Projection Pushdown).
+"""
+
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from supplyscore.config import INKAR_PATH
+
+# Projektion: nur diese Spalten werden aus der Datei gelesen
+INKAR_COLUMNS = ["Name", "Kennziffer", "Indikator", "Zeitbezug", "Wert"]
+
+# Zeichenketten-Spalten, die als Kategorien (Dictionary-Encoding) geladen werden
+CATEGORICAL_COLUMNS = ["Name", "Kennziffer", "Indikator", "Zeitbezug"]
+
+# Zeilen je Block beim blockweisen Lesen (Out-of-core-Modus)
+BATCH_SIZE = 1 << 20
+
+
+def build_filters(indikatoren=None, zeitbezug=None, nordbayern=True):
+    """
+    Erzeugt die Filterausdrücke (DNF-Liste) für den Parquet-Reader.
+    Nicht gesetzte Parameter (None) werden nicht gefiltert.
+    """
+    filters = []
+    if nordbayern is not None:
+        filters.append(("Nordbayern", "==", bool(nordbayern)))
+    if indikatoren is not None:
+        filters.append(("Indikator", "in", list(indikatoren)))
+    if zeitbezug is not None:
+        filters.append(("Zeitbezug", "in", [str(z) for z in zeitbezug]))
+    return filters or None
+
+
+def load_inkar(path=INKAR_PATH, indikatoren=None, zeitbezug=None, nordbayern=True):
+    """
+    Lädt den INKAR-Extrakt im Long-Format aus einer Parquet-Datei.
+
+    Es werden nur die Spalten aus INKAR_COLUMNS gelesen; die Zeichenketten-Spalten
+    kommen als pandas-Kategorien zurück, 'Wert' als float64 (fehlende Werte = NaN).
+    """
+    table = pq.read_table(
+        path,
+        columns=INKAR_COLUMNS,
+        filters=build_filters(indikatoren, zeitbezug, nordbayern),
+        read_dictionary=CATEGORICAL_COLUMNS,
+    )
+    df = table.to_pandas(ignore_metadata=True)
+
+    # Das Dictionary enthält auch Werte herausgefilterter Zeilen
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].cat.remove_unused_categories()
+    df["Wert"] = pd.to_numeric(df["Wert"], errors="coerce").astype("float64")
+    return df
+
+
+def iter_inkar_batches(path=INKAR_PATH, indikatoren=None, zeitbezug=None, nordbayern=True, batch_size=BATCH_SIZE,
+                       columns=INKAR_COLUMNS):
+    """
+    Liest den INKAR-Extrakt blockweise (Arrow RecordBatches mit höchstens
+    'batch_size' Zeilen) mit denselben Filtern und derselben Projektion wie
+    load_inkar. Es liegt jeweils nur ein Block im Speicher (kein Vorauslesen).
+    """
+    filters = build_filters(indikatoren, zeitbezug, nordbayern)
+    dataset = ds.dataset(path, format="parquet")
+    yield from dataset.to_batches(columns=list(columns), batch_size=batch_size,
+                                  filter=pq.filters_to_expression(filters) if filters else None,
+                                  batch_readahead=0, fragment_readahead=0)
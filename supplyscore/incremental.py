@@ -0,0 +1,204 @@
+"""
+Inkrementelle Neuberechnung bei Teilaktualisierungen der INKAR-Daten.
+
+Der Zustand eines vollständigen Laufs wird persistiert: die Ergebnistabelle
+mit allen S_*-, Cat_*- und Score_*-Spalten ('scores.parquet') sowie Minimum und
+Maximum jeder normalisierten Spalte ('state.json'). Neue Zeilen im Long-Format
+aktualisieren nur die betroffenen Regionen; eine Spalte wird nur dann für alle
+Regionen neu normalisiert, wenn sich ihr Minimum oder Maximum tatsächlich
+verschoben hat. Kategorien und Indizes werden nur für die Regionen neu
+berechnet, deren Scores sich geändert haben.
+
+Strukturelle Änderungen (neue Regionen, neue Spalten, Werte anderer Jahre als
+des aktuellen und des Vergleichsjahres, die bei einem vollständigen Lauf die
+Jahreswahl verschieben können) lassen sich nicht inkrementell abbilden und
+führen zu einem StructuralChange; in diesem Fall ist ein vollständiger Lauf
+(IncrementalScorer.build) nötig. Gleiches gilt für Zustände, die nicht mit
+Min-Max-Normalisierung aufgebaut wurden. Normalisierung, Kategorien und
+Indizes laufen über dieselben Funktionen wie die Pipeline (supplyscore.kernel).
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from supplyscore import kernel, scoring
+from supplyscore.cube import growth
+from supplyscore.pipeline import ScoringPipeline
+
+TABLE_FILE = "scores.parquet"
+STATE_FILE = "state.json"
+
+
+class StructuralChange(ValueError):
+    """Die neuen Daten verändern die Struktur der Ergebnistabelle."""
+
+
+class IncrementalScorer:
+    """Persistierter Scoring-Zustand mit inkrementeller Aktualisierung."""
+
+    def __init__(self, state_dir, table, extrema, meta):
+        self.state_dir = Path(state_dir)
+        self.table = table
+        self.extrema = extrema
+        self.meta = meta
+
+    # ------------------------------------------
+    # Aufbau und Persistenz
+    # ------------------------------------------
+    @classmethod
+    def build(cls, state_dir, pipeline=None):
+        """Vollständiger Lauf über die Pipeline und Anlage des Zustands."""
+        pipeline = ScoringPipeline() if pipeline is None else pipeline
+        params = pipeline.params
+        table = pipeline.run()
+        latest_year, past_year = scoring.resolve_years(pipeline.stage("cube", params).years, params.latest_year,
+                                                       params.past_year)
+        meta = {
+            "latest_year": latest_year,
+            "past_year": past_year,
+            "trend_indikator": params.trend_indikator,
+            "indikatoren": list(params.indikatoren),
+            "invertiert": list(params.invertiert),
+            "kategorien": {k: list(v) for k, v in params.kategorien},
+            "gewichte": dict(params.gewichte),
+            "straf_faktor": params.straf_faktor,
+            "normalisierung": params.normalisierung,
+        }
+        scorer = cls(state_dir, table, {}, meta)
+        scorer.extrema = {col: scorer._column_extrema(source) for col, (source, _) in scorer.norm_columns().items()}
+        scorer.save()
+        return scorer
+
+    @classmethod
+    def open(cls, state_dir):
+        """Lädt einen gespeicherten Zustand."""
+        state_dir = Path(state_dir)
+        table = pd.read_parquet(state_dir / TABLE_FILE)
+        with open(state_dir / STATE_FILE, encoding="utf-8") as f:
+            state = json.load(f)
+        extrema = {k: tuple(v) for k, v in state["extrema"].items()}
+        return cls(state_dir, table, extrema, state["meta"])
+
+    def save(self):
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.table.to_parquet(self.state_dir / TABLE_FILE, index=False)
+        state = {"meta": self.meta, "extrema": {k: list(v) for k, v in self.extrema.items()}}
+        with open(self.state_dir / STATE_FILE, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+
+    # ------------------------------------------
+    # Hilfsfunktionen
+    # ------------------------------------------
+    def norm_columns(self):
+        """Alle normalisierten Spalten: Zielspalte -> (Quellspalte, Invertierung)."""
+        cols = {f"S_{c}": (c, c in self.meta["invertiert"])
+                for c in self.meta["indikatoren"] if c in self.table.columns}
+        cols.update(scoring.SUB_SCORES)
+        return cols
+
+    def _column_extrema(self, source):
+        s = self.table[source]
+        return float(s.min()), float(s.max())
+
+    def _target_column(self, indikator, year):
+        """
+        Spalte der Ergebnistabelle, in die ein Wert (Indikator, Jahr) einfließt.
+        Werte anderer Jahre sowie Werte des Vergleichsjahres ohne Spalte
+        '<Indikator>_OLD' verändern den Querschnitt (neues Jahr bzw. neue
+        Spalte) und führen zu einem StructuralChange.
+        """
+        latest_year, past_year = self.meta["latest_year"], self.meta["past_year"]
+        if year == latest_year:
+            col = indikator
+        elif year == past_year:
+            col = f"{indikator}_OLD"
+        else:
+            raise StructuralChange(f"Zeitbezug {year} ist weder das aktuelle Jahr ({latest_year}) "
+                                   f"noch das Vergleichsjahr ({past_year})")
+        if col not in self.table.columns:
+            raise StructuralChange(f"Neue Spalte '{col}' in der Ergebnistabelle")
+        return col
+
+    # ------------------------------------------
+    # Aktualisierung
+    # ------------------------------------------
+    def apply(self, rows, save=True):
+        """
+        Übernimmt neue bzw. korrigierte Zeilen im Long-Format (Kennziffer,
+        Indikator, Zeitbezug, Wert) und aktualisiert die betroffenen Scores.
+        Rückgabe: Bericht mit geänderten Regionen und neu normalisierten Spalten.
+        """
+        if self.meta.get("normalisierung", "minmax") != "minmax":
+            raise StructuralChange(f"Normalisierung '{self.meta['normalisierung']}' nur vollständig berechenbar")
+        rows = rows[rows["Indikator"].astype(str).isin(self.meta["indikatoren"])]
+        delta = (rows.assign(Kennziffer=rows["Kennziffer"].astype(str), Indikator=rows["Indikator"].astype(str),
+                             Zeitbezug=rows["Zeitbezug"].astype(str))
+                 .groupby(["Kennziffer", "Indikator", "Zeitbezug"], observed=True)["Wert"].mean().reset_index())
+        delta["Spalte"] = [self._target_column(i, y) for i, y in zip(delta["Indikator"], delta["Zeitbezug"])]
+
+        table = self.table
+        position = pd.Index(table["Kennziffer"].astype(str))
+        unknown = ~delta["Kennziffer"].isin(position)
+        if unknown.any():
+            raise StructuralChange(f"Unbekannte Regionen: {', '.join(delta.loc[unknown, 'Kennziffer'].unique())}")
+        if delta.empty:
+            return {"regionen": [], "normalisiert": [], "neu_berechnet": 0}
+
+        norm_cols = self.norm_columns()
+        targets = list(norm_cols)
+        columns = [source for source, _ in norm_cols.values()]
+        invert = np.array([inv for _, inv in norm_cols.values()], dtype=bool)
+        rows_aff = np.unique(position.get_indexer(delta["Kennziffer"]))
+        held = table.loc[rows_aff, columns].to_numpy(dtype=float)
+
+        # Rohwerte setzen (fehlende Werte = 0 wie nach der Pivotierung)
+        for col, part in delta.groupby("Spalte"):
+            table.loc[position.get_indexer(part["Kennziffer"]), col] = part["Wert"].fillna(0).to_numpy()
+
+        # Abgeleitete Größen der betroffenen Regionen (0 in der Tabelle = fehlender Rohwert)
+        sub = table.loc[rows_aff].copy()
+        trend, old = self.meta["trend_indikator"], f"{self.meta['trend_indikator']}_OLD"
+        if trend in sub.columns and old in sub.columns:
+            sub["Wachstum_Prozent"] = growth(sub[old].replace(0, np.nan), sub[trend].replace(0, np.nan)).fillna(0)
+        scoring.derive_kpis(sub)
+        for col in ["Wachstum_Prozent", "Versorgung", "Marktvolumen_Mio", "Risiko", "Dichte"]:
+            table.loc[rows_aff, col] = sub[col]
+
+        # Normalisierung über den Kern: vollständig nur bei verschobenen Extremwerten
+        lo, hi = (np.array([self.extrema[t][i] for t in targets]) for i in (0, 1))
+        values = table.loc[rows_aff, columns].to_numpy(dtype=float)
+        held_extreme = ((held == lo) | (held == hi)).any(axis=0)
+        check = np.flatnonzero(held_extreme | (values.min(axis=0) < lo) | (values.max(axis=0) > hi))
+
+        renormalized = []
+        if len(check):
+            new_lo, new_hi = kernel.extrema(table[[columns[j] for j in check]].to_numpy(dtype=float))
+            moved = check[(new_lo != lo[check]) | (new_hi != hi[check])]
+            lo[check], hi[check] = new_lo, new_hi
+            for j in moved:
+                self.extrema[targets[j]] = (float(lo[j]), float(hi[j]))
+                renormalized.append(targets[j])
+            if len(moved):
+                full = kernel.min_max(table[[columns[j] for j in moved]].to_numpy(dtype=float), invert[moved],
+                                      lo=lo[moved], hi=hi[moved])
+                scoring.assign_columns(table, renormalized, full)
+        table.loc[rows_aff, targets] = kernel.min_max(values, invert, lo=lo, hi=hi)
+
+        # Kategorien und Indizes nur für Regionen mit geänderten Scores
+        rows_scores = table.index if renormalized else rows_aff
+        kategorien = self.meta["kategorien"]
+        sub = scoring.aggregate_categories(table.loc[rows_scores], kategorien)
+        scoring.combine_indices(sub, self.meta["gewichte"], self.meta["straf_faktor"], kategorien)
+        cols = list(kategorien) + list(kernel.ScoringKernel.INDEX_COLUMNS)
+        table.loc[rows_scores, cols] = sub[cols]
+
+        if save:
+            self.save()
+        return {
+            "regionen": list(table.loc[rows_aff, "Kennziffer"]),
+            "normalisiert": renormalized,
+            "neu_berechnet": len(rows_scores),
+        }
@@ -0,0 +1,125 @@
+"""
+Optionale Laufzeit-Instrumentierung der Pipeline.
+
+Für jede Stufe (Import, Würfel, Pivotierung, Normalisierung, Aggregation,
+Indexierung, Selektion sowie jede Abbildung) werden Wall-Time, CPU-Zeit,
+maximaler RSS und Zeilenzahl erfasst. Die Messwerte werden als JSON-Zeilen
+ausgegeben und/oder an registrierte Callbacks übergeben.
+
+'peak_rss_prozess_bytes' ist das Maximum über die bisherige Lebensdauer des
+Prozesses (ru_maxrss), kein Spitzenwert der einzelnen Stufe: Der Wert steigt
+nur, wenn eine Stufe mehr Speicher belegt als alle vorherigen.
+
+Aktivierung über die Umgebungsvariable SUPPLYSCORE_INSTRUMENT:
+    SUPPLYSCORE_INSTRUMENT=1            JSON-Zeilen auf stderr (auch stderr/true/yes/on)
+    SUPPLYSCORE_INSTRUMENT=stufen.jsonl JSON-Zeilen an eine Datei anhängen
+    SUPPLYSCORE_INSTRUMENT=0            deaktiviert (wie leer, false/no/off)
+oder im Code über instrumentation.enable(...) bzw. instrumentation.add_hook(...).
+Ohne Aktivierung ist der Aufwand je Stufe ein einzelner Flag-Vergleich.
+"""
+
+import contextlib
+import json
+import os
+import resource
+import sys
+import time
+
+ENV_VAR = "SUPPLYSCORE_INSTRUMENT"
+DISABLED = ("", "0", "false", "no", "off")
+STDERR = ("1", "stderr", "true", "yes", "on")
+
+
+def parse_target(value):
+    """Ziel der JSON-Ausgabe: None (deaktiviert), 'stderr' oder ein Dateipfad."""
+    if value is None:
+        return None
+    key = str(value).strip().lower()
+    if key in DISABLED:
+        return None
+    return "stderr" if key in STDERR else str(value)
+
+
+def max_rss_bytes():
+    """Maximaler RSS des Prozesses (Linux: ru_maxrss in KiB, macOS in Byte)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def rows_of(result):
+    """Zeilenzahl eines Stufenergebnisses (DataFrame, Würfel, Liste), sonst None."""
+    if hasattr(result, "shape") and len(getattr(result, "shape", ())) > 0:
+        return int(result.shape[0])
+    values = getattr(result, "values", None)
+    if hasattr(values, "shape"):
+        return int(values.shape[0])
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return None
+
+
+class Instrumentation:
+    """Sammelt Messwerte je Stufe und leitet sie an Ausgabe und Callbacks weiter."""
+
+    def __init__(self, target=None):
+        self.hooks = []
+        self.target = None
+        self.enabled = False
+        if parse_target(target):
+            self.enable(target)
+
+    @classmethod
+    def from_env(cls):
+        return cls(os.environ.get(ENV_VAR))
+
+    def enable(self, target="stderr"):
+        """
+        Aktiviert die JSON-Ausgabe ('stderr', '1' oder Dateipfad); Werte aus
+        DISABLED schalten sie ab (registrierte Callbacks bleiben aktiv).
+        """
+        self.target = parse_target(target)
+        self.enabled = self.target is not None or bool(self.hooks)
+
+    def add_hook(self, hook):
+        """Registriert einen Callback, der jeden Messwert (dict) erhält."""
+        self.hooks.append(hook)
+        self.enabled = True
+
+    def emit(self, record):
+        """Gibt einen Messwert aus (JSON-Zeile) und ruft die Callbacks auf."""
+        if self.target == "stderr":
+            print(json.dumps(record, ensure_ascii=False), file=sys.stderr)
+        elif self.target:
+            with open(self.target, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        for hook in self.hooks:
+            hook(record)
+
+    @contextlib.contextmanager
+    def stage(self, name, emit=True, **extra):
+        """
+        Misst den umschlossenen Block. Das gelieferte dict kann im Block
+        ergänzt werden (z. B. record["rows"] = len(df)).
+        """
+        if not self.enabled and emit:
+            yield {}
+            return
+        record = {"stage": name, **extra}
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record.update(
+                wall_s=time.perf_counter() - wall,
+                cpu_s=time.process_time() - cpu,
+                peak_rss_prozess_bytes=max_rss_bytes(),
+                pid=os.getpid(),
+                ts=time.time(),
+            )
+            record.setdefault("rows", None)
+            if emit:
+                self.emit(record)
+
+
+# Prozessweite Instanz, konfiguriert über SUPPLYSCORE_INSTRUMENT
+instrumentation = Instrumentation.from_env()
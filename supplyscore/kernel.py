@@ -0,0 +1,165 @@
+"""
+Vektorisierter Scoring-Kern auf dichten NumPy-Matrizen.
+
+Normalisierung, Invertierung, Kategorie-Mittelwerte und die zusammengesetzten
+Indizes (Hunter-Index, Index_Vorher, Index_Nachher) werden als wenige
+Broadcast- bzw. Matrixoperationen über eine Matrix (Regionen x Spalten)
+berechnet statt Spalte für Spalte in pandas. Alle Funktionen akzeptieren ein
+vorab angelegtes Ergebnis-Array ('out='), sodass wiederholte Läufe (z. B.
+Monte-Carlo-Studien über die Gewichte) ohne neue Allokationen auskommen.
+
+NaN-Behandlung wie in pandas: fehlende Werte bleiben bei der Normalisierung
+fehlend und werden beim Kategorie-Mittelwert übersprungen.
+"""
+
+import numpy as np
+
+from supplyscore import config
+
+
+def extrema(X):
+    """Spaltenweises Minimum und Maximum (fehlende Werte werden übersprungen)."""
+    X = np.asarray(X, dtype=float)
+    return np.fmin.reduce(X, axis=0), np.fmax.reduce(X, axis=0)
+
+
+def min_max(X, invert=None, out=None, lo=None, hi=None):
+    """
+    Spaltenweise Min-Max-Normalisierung auf 0 bis 100.
+    'invert' ist eine boolesche Maske je Spalte (niedriger Wert = hoher Score);
+    konstante Spalten erhalten den Score 0. Mit 'lo'/'hi' werden vorab
+    bestimmte Extremwerte verwendet (z. B. aus einem ersten Durchlauf über alle
+    Regionen), sonst die der Matrix selbst.
+    """
+    X = np.asarray(X, dtype=float)
+    if lo is None or hi is None:
+        lo, hi = extrema(X)
+    span = hi - lo
+    # Invertierte Spalten vor der Subtraktion bestimmen ('out' darf X sein)
+    flipped = None
+    if invert is not None and np.any(invert):
+        invert = np.asarray(invert, dtype=bool)
+        flipped = hi[invert] - X[:, invert]
+    out = np.subtract(X, lo, out=out)
+    if flipped is not None:
+        out[:, invert] = flipped
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out /= span
+    out *= 100
+    out[:, span == 0] = 0
+    return out
+
+
+def category_matrix(columns, kategorien):
+    """Zugehörigkeitsmatrix (Spalten x Kategorien) mit 1 für jeden Indikator einer Kategorie."""
+    position = {c: i for i, c in enumerate(columns)}
+    membership = np.zeros((len(columns), len(kategorien)))
+    for j, cols in enumerate(kategorien.values()):
+        for c in cols:
+            if c in position:
+                membership[position[c], j] = 1.0
+    return membership
+
+
+def category_means(S, membership, out=None):
+    """
+    Mittelwert der normalisierten Indikatoren je Kategorie.
+    Fehlende Werte werden übersprungen; Kategorien ohne verfügbare Indikatoren
+    erhalten 0.
+    """
+    valid = ~np.isnan(S)
+    out = np.matmul(np.where(valid, S, 0.0), membership, out=out)
+    count = valid @ membership
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out /= count
+    out[:, membership.sum(axis=0) == 0] = 0
+    return out
+
+
+def composite_indices(sub, weights, cats, penalty, straf_faktor=config.STRAF_FAKTOR,
+                      divisor=config.HUNTER_DIVISOR, out=None):
+    """
+    Hunter-Index, Index_Vorher und Index_Nachher (Spalten 0, 1, 2 von 'out').
+    'sub' enthält die Sub-Scores, 'weights' deren Gewichte (gleiche Reihenfolge),
+    'cats' die Kategorie-Scores und 'penalty' den Score der Bankdichte.
+    """
+    if out is None:
+        out = np.empty((len(sub), 3))
+    np.matmul(sub, weights, out=out[:, 0])
+    out[:, 0] /= divisor
+    np.mean(cats, axis=1, out=out[:, 1])
+    np.multiply(penalty, straf_faktor, out=out[:, 2])
+    np.subtract(out[:, 1], out[:, 2], out=out[:, 2])
+    return out
+
+
+class ScoringKernel:
+    """
+    Vorbereitete Matrizen für einen vollständigen Scoring-Lauf.
+
+    Eingaben sind die Rohwerte der Indikatoren (Regionen x 'indikatoren') und
+    die Quellspalten der Sub-Scores (Regionen x 'sources', z. B. Versorgung,
+    Marktvolumen_Mio, ...). Das Ergebnis ist eine Matrix mit den Spalten
+    'columns': S_*, Cat_*, Score_* sowie Hunter_Index, Index_Vorher und
+    Index_Nachher.
+
+    Beispiel:
+        kernel = ScoringKernel.from_frame(df_trend)
+        X, K = kernel.inputs(df_trend)
+        out = kernel.allocate(len(X))
+        for w in gewichte_stichproben:
+            kernel.weights[:] = w
+            kernel(X, K, out=out)
+    """
+
+    INDEX_COLUMNS = ("Hunter_Index", "Index_Vorher", "Index_Nachher")
+
+    def __init__(self, indikatoren, sub_scores, invertiert=config.INVERTIERTE_INDIKATOREN, kategorien=None,
+                 gewichte=None, straf_faktor=config.STRAF_FAKTOR, divisor=config.HUNTER_DIVISOR,
+                 penalty="Score_Penalty"):
+        kategorien = config.KATEGORIEN if kategorien is None else dict(kategorien)
+        gewichte = config.HUNTER_GEWICHTE if gewichte is None else dict(gewichte)
+        self.indikatoren = list(indikatoren)
+        self.invert = np.array([c in invertiert for c in self.indikatoren], dtype=bool)
+        self.kategorien = list(kategorien)
+        self.membership = category_matrix(self.indikatoren, kategorien)
+        self.sub_scores = list(sub_scores)
+        self.sources = [source for source, _ in sub_scores.values()]
+        self.sub_invert = np.array([invert for _, invert in sub_scores.values()], dtype=bool)
+        self.weights = np.array([float(gewichte.get(c, 0.0)) for c in self.sub_scores])
+        self.penalty = self.sub_scores.index(penalty)
+        self.straf_faktor = straf_faktor
+        self.divisor = divisor
+
+        self.columns = ([f"S_{c}" for c in self.indikatoren] + self.kategorien + self.sub_scores +
+                        list(self.INDEX_COLUMNS))
+        n_ind, n_cat, n_sub = len(self.indikatoren), len(self.kategorien), len(self.sub_scores)
+        self.s_cols = slice(0, n_ind)
+        self.cat_cols = slice(n_ind, n_ind + n_cat)
+        self.sub_cols = slice(n_ind + n_cat, n_ind + n_cat + n_sub)
+        self.index_cols = slice(n_ind + n_cat + n_sub, len(self.columns))
+
+    @classmethod
+    def from_frame(cls, df, indikatoren=config.INDIKATOREN, **kwargs):
+        """Kern für die in 'df' vorhandenen Indikatoren (Reihenfolge wie 'indikatoren')."""
+        from supplyscore.scoring import SUB_SCORES
+        return cls([c for c in indikatoren if c in df.columns], SUB_SCORES, **kwargs)
+
+    def inputs(self, df):
+        """Eingabematrizen (Rohwerte der Indikatoren, Quellspalten der Sub-Scores) aus einem DataFrame."""
+        return df[self.indikatoren].to_numpy(dtype=float), df[self.sources].to_numpy(dtype=float)
+
+    def allocate(self, n_regions):
+        """Ergebnis-Array für 'n_regions' Regionen (für wiederholte Läufe mit 'out=')."""
+        return np.empty((n_regions, len(self.columns)))
+
+    def __call__(self, X, K, out=None):
+        """Vollständiger Scoring-Lauf; Rückgabe: Ergebnis-Matrix mit den Spalten 'columns'."""
+        if out is None:
+            out = self.allocate(len(X))
+        S = min_max(X, self.invert, out=out[:, self.s_cols])
+        cats = category_means(S, self.membership, out=out[:, self.cat_cols])
+        sub = min_max(K, self.sub_invert, out=out[:, self.sub_cols])
+        composite_indices(sub, self.weights, cats, sub[:, self.penalty], self.straf_faktor, self.divisor,
+                          out=out[:, self.index_cols])
+        return out
@@ -0,0 +1,140 @@
+"""
+Kollisionsfreie Platzierung von Beschriftungen in Scatter- und Bubble-Plots.
+
+Die Beschriftungen werden zunächst an ihrer Wunschposition gezeichnet und ihre
+tatsächliche Ausdehnung (Bounding Box in Pixeln) gemessen. Anschließend wird
+jede Beschriftung an der ersten Kandidatenposition (Wunschposition, dann
+schrittweise nach oben/unten/seitlich versetzt) platziert, die weder bereits
+platzierte Beschriftungen noch Hindernisse (z. B. Bubbles) überdeckt und
+innerhalb der Achse liegt. Kollisionen werden über ein gleichmäßiges Gitter
+(Spatial Hash) geprüft, sodass jede Abfrage nur die Boxen der berührten Zellen
+betrachtet. Die Anzahl der Kandidaten je Beschriftung ist begrenzt.
+"""
+
+import math
+
+import numpy as np
+
+# Reihenfolge der Versatzrichtungen je Schritt (x, y)
+DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (-1, 1), (1, -1), (-1, -1))
+
+
+def overlap_area(a, b):
+    """Überdeckungsfläche zweier Boxen (x0, y0, x1, y1)."""
+    w = min(a[2], b[2]) - max(a[0], b[0])
+    h = min(a[3], b[3]) - max(a[1], b[1])
+    return w * h if w > 0 and h > 0 else 0.0
+
+
+class SpatialGrid:
+    """Gleichmäßiges Gitter über Boxen in Pixelkoordinaten."""
+
+    def __init__(self, cell_size):
+        self.cell = max(float(cell_size), 1.0)
+        self.cells = {}
+        self.boxes = []
+
+    def _cell_range(self, box):
+        c = self.cell
+        return (range(math.floor(box[0] / c), math.floor(box[2] / c) + 1),
+                range(math.floor(box[1] / c), math.floor(box[3] / c) + 1))
+
+    def insert(self, box):
+        idx = len(self.boxes)
+        self.boxes.append(box)
+        xs, ys = self._cell_range(box)
+        for ix in xs:
+            for iy in ys:
+                self.cells.setdefault((ix, iy), []).append(idx)
+
+    def overlap(self, box):
+        """Summe der Überdeckungsflächen mit allen eingetragenen Boxen."""
+        seen, total = set(), 0.0
+        xs, ys = self._cell_range(box)
+        for ix in xs:
+            for iy in ys:
+                for idx in self.cells.get((ix, iy), ()):
+                    if idx not in seen:
+                        seen.add(idx)
+                        total += overlap_area(box, self.boxes[idx])
+        return total
+
+
+def marker_boxes(collection):
+    """Boxen (Pixel) der Marker einer PathCollection (z. B. sns.scatterplot), aus Position und Größe."""
+    ax = collection.axes
+    offsets = ax.transData.transform(collection.get_offsets())
+    sizes = np.broadcast_to(collection.get_sizes(), (len(offsets),))
+    radius = np.sqrt(sizes) / 2 * ax.figure.dpi / 72
+    return [(x - r, y - r, x + r, y + r) for (x, y), r in zip(offsets, radius)]
+
+
+def artist_box(artist, renderer):
+    """Box (Pixel) eines Artists; bei Texten mit Rahmen die Ausdehnung des Rahmens."""
+    patch = artist.get_bbox_patch() if hasattr(artist, "get_bbox_patch") else None
+    bbox = (patch if patch is not None else artist).get_window_extent(renderer)
+    return bbox.x0, bbox.y0, bbox.x1, bbox.y1
+
+
+def place_labels(ax, annotations, obstacles=(), max_steps=12, padding=3.0):
+    """
+    Verschiebt Annotationen ('ax.annotate'-Objekte mit textcoords='data') so,
+    dass sich ihre Texte nicht überlappen. Die aktuelle Textposition jeder
+    Annotation gilt als Wunschposition. 'obstacles' sind Boxen in Pixeln
+    (z. B. marker_boxes(...)) oder Artists (z. B. eine Text-Box), die möglichst
+    nicht überdeckt werden sollen.
+    Rückgabe: Anzahl der Beschriftungen, für die keine überlappungsfreie
+    Position gefunden wurde.
+    """
+    if not annotations:
+        return 0
+    fig = ax.figure
+    fig.draw_without_rendering()  # aktualisiert Layout und Textboxen
+    renderer = fig.canvas.get_renderer()
+    axes_box = ax.get_window_extent(renderer)
+    axes_box = (axes_box.x0, axes_box.y0, axes_box.x1, axes_box.y1)
+
+    # Gemessene Ausdehnung der Texte relativ zum Textanker (Pixel)
+    measured = []
+    for ann in annotations:
+        anchor = ax.transData.transform(ann.xyann)
+        x0, y0, x1, y1 = artist_box(ann, renderer)
+        measured.append((anchor, (x0 - anchor[0] - padding, y0 - anchor[1] - padding,
+                                  x1 - anchor[0] + padding, y1 - anchor[1] + padding)))
+
+    heights = [m[1][3] - m[1][1] for m in measured]
+    labels_grid = SpatialGrid(np.median(heights) * 2)
+    obstacle_grid = SpatialGrid(np.median(heights) * 2)
+    for box in obstacles:
+        obstacle_grid.insert(artist_box(box, renderer) if hasattr(box, "get_window_extent") else box)
+
+    to_data = ax.transData.inverted()
+    unresolved = 0
+    # Platzierung von unten nach oben (Wunschposition)
+    for k in sorted(range(len(annotations)), key=lambda k: measured[k][0][1]):
+        (ax0, ay0), rel = measured[k]
+        step_x, step_y = (rel[2] - rel[0]) / 2, rel[3] - rel[1]
+
+        best, best_cost = None, None
+        for step in range(max_steps + 1):
+            for dx, dy in (DIRECTIONS if step else ((0, 0),)):
+                x, y = ax0 + dx * step * step_x, ay0 + dy * step * step_y
+                box = (x + rel[0], y + rel[1], x + rel[2], y + rel[3])
+                outside = (box[0] < axes_box[0] or box[1] < axes_box[1] or
+                           box[2] > axes_box[2] or box[3] > axes_box[3])
+                label_cost = labels_grid.overlap(box)
+                # Rangfolge: innerhalb der Achse, ohne Textüberlappung, wenig Hindernisse, nah an der Wunschposition
+                cost = (outside, label_cost, obstacle_grid.overlap(box), step)
+                if best_cost is None or cost < best_cost:
+                    best, best_cost = (x, y, box), cost
+                if cost[:3] == (False, 0.0, 0.0):
+                    break
+            if best_cost[:3] == (False, 0.0, 0.0):
+                break
+
+        x, y, box = best
+        if best_cost[0] or best_cost[1] > 0:
+            unresolved += 1
+        labels_grid.insert(box)
+        annotations[k].xyann = tuple(to_data.transform((x, y)))
+    return unresolved
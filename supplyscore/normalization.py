@@ -0,0 +1,113 @@
+"""
+Austauschbare Normalisierung der Indikatoren (S_*) und Sub-Scores (Score_*).
+
+Alle Verfahren bilden auf 0 bis 100 ab; 'invert' kehrt die Richtung je Spalte
+um (niedriger Wert = hoher Score), konstante Spalten erhalten 0, fehlende Werte
+bleiben fehlend:
+
+    minmax      (x - min) / (max - min) (bisheriges Verfahren)
+    winsorized  Min-Max zwischen den Quantilen 'winsor' (config.WINSOR_QUANTILE);
+                Werte außerhalb werden auf 0 bzw. 100 begrenzt
+    rank        Perzentilrang (mittlerer Rang bei Gleichstand)
+    zscore      Standardwert, auf +/- ZSCORE_CLIP begrenzt und linear auf
+                0 bis 100 abgebildet (Mittelwert = 50)
+
+Die Lage- und Streuungsmaße stammen aus je einer QuantileSketch je Spalte
+(supplyscore.sketch). Ein Normalizer lässt sich daher blockweise anpassen
+(partial_fit) und mit den Skizzen anderer Blöcke oder Rechner zusammenführen
+(merge), ohne eine Spalte vollständig zu sortieren. Bei winsorized und rank
+verschiebt ein einzelner Ausreißer die Scores der übrigen Regionen kaum.
+"""
+
+import numpy as np
+
+from supplyscore import config, kernel
+from supplyscore.sketch import COMPRESSION, QuantileSketch
+
+METHODS = ("minmax", "winsorized", "rank", "zscore")
+
+# Begrenzung der Standardwerte für 'zscore'
+ZSCORE_CLIP = 3.0
+
+
+class Normalizer:
+    """
+    Normalisierung einer Matrix (Regionen x Spalten) mit Skizzen je Spalte.
+
+    Beispiel (zwei Durchläufe über Regionsblöcke):
+        normalizer = Normalizer("winsorized", invert=[False, True])
+        for block in blocks:
+            normalizer.partial_fit(block)
+        scores = [normalizer.transform(block) for block in blocks]
+    """
+
+    def __init__(self, method="minmax", invert=None, winsor=config.WINSOR_QUANTILE, compression=COMPRESSION):
+        if method not in METHODS:
+            raise ValueError(f"Unbekanntes Normalisierungsverfahren '{method}' (erlaubt: {', '.join(METHODS)})")
+        self.method = method
+        self.invert = None if invert is None else np.asarray(invert, dtype=bool)
+        self.winsor = tuple(winsor)
+        self.compression = compression
+        self.sketches = None
+
+    def partial_fit(self, X):
+        """Ergänzt die Skizzen um einen Block (Rückgabe: self)."""
+        X = np.asarray(X, dtype=float)
+        if self.sketches is None:
+            self.sketches = [QuantileSketch(self.compression) for _ in range(X.shape[1])]
+        for sketch, column in zip(self.sketches, X.T):
+            sketch.update(column)
+        return self
+
+    def fit(self, X):
+        self.sketches = None
+        return self.partial_fit(X)
+
+    def merge(self, other):
+        """Führt die Skizzen eines zweiten Normalizers (gleiche Spalten) hinzu (Rückgabe: self)."""
+        if self.sketches is None:
+            self.sketches = [QuantileSketch(self.compression) for _ in other.sketches]
+        for sketch, part in zip(self.sketches, other.sketches):
+            sketch.merge(part)
+        return self
+
+    def bounds(self):
+        """Untere und obere Grenze je Spalte (minmax: Extremwerte, winsorized: Quantile)."""
+        if self.method == "winsorized":
+            q = np.array([sketch.quantile(self.winsor) for sketch in self.sketches])
+            return q[:, 0], q[:, 1]
+        return (np.array([sketch.min for sketch in self.sketches]),
+                np.array([sketch.max for sketch in self.sketches]))
+
+    def transform(self, X, out=None):
+        """Normalisierte Scores (0 bis 100) mit den angepassten Skizzen."""
+        X = np.asarray(X, dtype=float)
+        invert = np.zeros(X.shape[1], dtype=bool) if self.invert is None else self.invert
+        if self.method in ("minmax", "winsorized"):
+            lo, hi = self.bounds()
+            if self.method == "winsorized":
+                X = np.clip(X, lo, hi)
+            return kernel.min_max(X, invert, out=out, lo=lo, hi=hi)
+
+        if out is None:
+            out = np.empty(X.shape)
+        for j, sketch in enumerate(self.sketches):
+            if self.method == "rank":
+                out[:, j] = sketch.rank(X[:, j]) * 100
+            else:
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    z = (X[:, j] - sketch.mean) / sketch.std
+                out[:, j] = (np.clip(z, -ZSCORE_CLIP, ZSCORE_CLIP) + ZSCORE_CLIP) / (2 * ZSCORE_CLIP) * 100
+        out[:, invert] = 100 - out[:, invert]
+        out[:, np.array([sketch.min == sketch.max for sketch in self.sketches], dtype=bool)] = 0
+        return out
+
+
+def normalize_matrix(X, invert=None, method=config.NORMALISIERUNG, winsor=config.WINSOR_QUANTILE, out=None):
+    """
+    Normalisierung einer vollständigen Matrix in einem Schritt. Min-Max läuft
+    direkt über kernel.min_max (ohne Skizzen).
+    """
+    if method == "minmax":
+        return kernel.min_max(X, invert, out=out)
+    return Normalizer(method, invert, winsor).fit(X).transform(X, out=out)
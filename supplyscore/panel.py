@@ -0,0 +1,204 @@
+"""
+Panel-Scoring über alle Jahre des Indikator-Würfels.
+
+Statt die Pipeline einmal je Jahr zu durchlaufen, werden beide Ergebnisse
+direkt auf dem Würfel (Region x Indikator x Jahr) berechnet:
+
+1. Trendmerkmale (trend_table): für jeden Indikator und jede Region in einem
+   vektorisierten Durchlauf über die gesamte Reihe
+       Steigung       Kleinste-Quadrate-Steigung je Jahr
+       CAGR           durchschnittliche jährliche Wachstumsrate in Prozent
+                      (erster bis letzter verfügbarer Wert, wie IndicatorCube.cagr)
+       Volatilitaet   Standardabweichung der prozentualen Veränderungen
+                      gegenüber dem Vorjahr
+       Dynamik        jüngster Wert gegenüber dem Mittel der config.TREND_FENSTER
+                      vorangehenden Jahre in Prozent
+   Die Merkmale werden je Indikator normalisiert (Verfahren der Pipeline) und
+   mit config.TREND_GEWICHTE zu 'Score_Trend_<Indikator>' gemittelt; bei
+   invertierten Indikatoren zählt ein Rückgang positiv, eine hohe Volatilität
+   zählt stets negativ. 'Index_Trend' ist das Mittel über alle Indikatoren.
+2. Score-Historie (panel_history): Cat_*, Score_Penalty, Index_Vorher und
+   Index_Nachher für jedes Jahr, wie ein Lauf der Pipeline mit diesem Jahr
+   als 'latest_year'. Alle Jahre werden in einem Aufruf normalisiert (eine
+   Spalte je Indikator und Jahr). Filialen und Einwohner stammen für alle
+   Jahre aus demselben Stand der Referenzdaten.
+
+Fehlende Werte werden bei den Trendmerkmalen übersprungen; Merkmale mit zu
+wenigen Werten (z. B. Steigung aus weniger als zwei Jahren) bleiben fehlend.
+
+Beispiel:
+    trends, historie = score_panel(ScoringPipeline())
+    historie.pivot(index="Name", columns="Zeitbezug", values="Index_Nachher")
+"""
+
+import numpy as np
+import pandas as pd
+
+from supplyscore import config, kernel
+from supplyscore.cube import cagr
+from supplyscore.normalization import normalize_matrix
+from supplyscore.regions import RegionIndex
+from supplyscore.scoring import SUB_SCORES, assign_columns
+
+# Merkmale, bei denen ein höherer Wert unabhängig vom Indikator schlechter ist
+STABILITAETS_MERKMALE = ("Volatilitaet",)
+
+
+def weighted_nanmean(values, weights=None, axis=-1):
+    """Gewichteter Mittelwert entlang 'axis'; fehlende Werte werden übersprungen (keine Werte: NaN)."""
+    valid = ~np.isnan(values)
+    weights = np.ones(values.shape[axis]) if weights is None else np.asarray(weights, dtype=float)
+    shape = [1] * values.ndim
+    shape[axis] = -1
+    weights = weights.reshape(shape)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (np.where(valid, values, 0.0) * weights).sum(axis=axis) / (valid * weights).sum(axis=axis)
+
+
+def indicator_columns(cube, params):
+    """Bewertete Indikatoren des Würfels (Reihenfolge wie params.indikatoren) und ihre Positionen."""
+    cols = [c for c in params.indikatoren if c in cube.indikator_index]
+    return cols, [cube.indikator_index[c] for c in cols]
+
+
+# ==========================================
+# TRENDMERKMALE
+# ==========================================
+def trend_features(values, year_numbers, fenster=config.TREND_FENSTER):
+    """
+    Trendmerkmale einer Matrix 'values' (Region x Indikator x Jahr) entlang der
+    Jahresachse. Rückgabe: {Merkmal: Matrix (Region x Indikator)}.
+    """
+    n_y = values.shape[-1]
+    valid = ~np.isnan(values) & ~np.isnan(year_numbers)
+    n = valid.sum(axis=-1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Steigung: Kovarianz(Jahr, Wert) / Varianz(Jahr) über die verfügbaren Jahre
+        t = np.where(valid, year_numbers, 0.0)
+        v = np.where(valid, values, 0.0)
+        dt = np.where(valid, t - (t.sum(axis=-1) / n)[..., None], 0.0)
+        dv = np.where(valid, v - (v.sum(axis=-1) / n)[..., None], 0.0)
+        steigung = (dt * dv).sum(axis=-1) / (dt * dt).sum(axis=-1)
+
+        # Volatilität: Streuung der Veränderungen gegenüber dem Vorjahr (in Prozent)
+        change = np.diff(values, axis=-1) / values[..., :-1] * 100
+        change[~np.isfinite(change)] = np.nan
+        n_change = (~np.isnan(change)).sum(axis=-1)
+        mean = weighted_nanmean(change)
+        volatilitaet = np.sqrt(weighted_nanmean((change - mean[..., None]) ** 2))
+
+        # Dynamik: jüngster Wert gegenüber dem Mittel der 'fenster' vorangehenden Jahre
+        last = n_y - 1 - np.argmax(valid[..., ::-1], axis=-1)
+        latest = np.take_along_axis(values, last[..., None], axis=-1)[..., 0]
+        idx = np.arange(n_y)
+        window = valid & (idx < last[..., None]) & (idx >= last[..., None] - fenster)
+        basis = np.where(window, values, 0.0).sum(axis=-1) / window.sum(axis=-1)
+        dynamik = (latest - basis) / np.abs(basis) * 100
+
+    steigung[~np.isfinite(steigung) | (n < 2)] = np.nan
+    volatilitaet[n_change < 2] = np.nan
+    dynamik[~np.isfinite(dynamik)] = np.nan
+    return {
+        "Steigung": steigung,
+        "CAGR": cagr(values, year_numbers),
+        "Volatilitaet": volatilitaet,
+        "Dynamik": dynamik,
+    }
+
+
+def trend_scores(features, invert, gewichte=None, normalisierung=config.NORMALISIERUNG,
+                 winsor=config.WINSOR_QUANTILE):
+    """
+    Normalisierte Trendmerkmale (0 bis 100, je Indikator) und deren gewichtetes
+    Mittel je Indikator. 'invert' ist die Maske der invertierten Indikatoren.
+    Rückgabe: ({Merkmal: Scores}, Score_Trend (Region x Indikator)).
+    """
+    gewichte = config.TREND_GEWICHTE if gewichte is None else gewichte
+    invert = np.asarray(invert, dtype=bool)
+    scores = {}
+    for merkmal in gewichte:
+        mask = np.ones_like(invert) if merkmal in STABILITAETS_MERKMALE else invert
+        scores[merkmal] = normalize_matrix(features[merkmal], mask, normalisierung, winsor)
+    stack = np.stack([scores[merkmal] for merkmal in gewichte], axis=-1)
+    return scores, weighted_nanmean(stack, list(gewichte.values()))
+
+
+def trend_table(cube, params, fenster=config.TREND_FENSTER, gewichte=None):
+    """
+    Tabelle der Trendmerkmale mit einer Zeile je Region: Trend_<Merkmal>_<Indikator>,
+    Score_Trend_<Indikator> und Index_Trend.
+    """
+    cols, positions = indicator_columns(cube, params)
+    values = cube.values[:, positions, :]
+    rows = ~np.isnan(values).all(axis=(1, 2))
+    values = values[rows]
+
+    features = trend_features(values, cube.year_numbers, fenster)
+    _, score_trend = trend_scores(features, [c in params.invertiert for c in cols], gewichte,
+                                  params.normalisierung, params.winsor_quantile)
+
+    df = pd.DataFrame({"Kennziffer": cube.regions[rows], "Name": cube.names[rows]})
+    for merkmal, matrix in features.items():
+        assign_columns(df, [f"Trend_{merkmal}_{c}" for c in cols], matrix)
+    assign_columns(df, [f"Score_Trend_{c}" for c in cols], score_trend)
+    df["Index_Trend"] = weighted_nanmean(score_trend)
+    return df
+
+
+# ==========================================
+# SCORE-HISTORIE
+# ==========================================
+def panel_history(cube, params, einwohner, filialen):
+    """
+    Kategorien, Score_Penalty, Index_Vorher und Index_Nachher je Region und
+    Jahr (Long-Format mit der Spalte 'Zeitbezug').
+
+    Je Jahr gelten die Regeln des Querschnitts (scoring.pivot_trend): bewertet
+    werden Regionen mit Werten in diesem Jahr, fehlende Werte vorhandener
+    Indikatoren zählen als 0, Indikatoren ohne Werte in diesem Jahr entfallen.
+    """
+    cols, positions = indicator_columns(cube, params)
+    kategorien = dict(params.kategorien)
+    n_r, n_y = len(cube.regions), len(cube.years)
+
+    present = ~np.isnan(cube.values).all(axis=1)  # Region x Jahr
+    # Matrix (Region x Jahr*Indikator): eine Spalte je Indikator und Jahr
+    X = cube.values[:, positions, :].transpose(0, 2, 1).reshape(n_r, n_y * len(cols))
+    has_ind = ~np.isnan(X).all(axis=0)
+    X[np.isnan(X) & np.repeat(present, len(cols), axis=1) & has_ind] = 0
+
+    invert = np.tile([c in params.invertiert for c in cols], n_y)
+    S = normalize_matrix(X, invert, params.normalisierung, params.winsor_quantile).reshape(n_r * n_y, len(cols))
+    rows = present.ravel()
+    cats = kernel.category_means(S[rows], kernel.category_matrix(cols, kategorien))
+    cats[np.isnan(cats)] = 0  # Kategorie ohne Indikatoren in diesem Jahr
+
+    # Bankdichte aus den Referenzdaten, je Jahr über die bewerteten Regionen normalisiert
+    regions = RegionIndex(pd.DataFrame({"Kennziffer": cube.regions, "Name": cube.names}))
+    kz = pd.Series(cube.regions, name="Kennziffer")
+    dichte = (np.asarray(regions.lookup(kz, filialen, params.default_filialen), dtype=float) /
+              np.asarray(regions.lookup(kz, einwohner, params.default_einwohner), dtype=float))
+    D = np.where(present, dichte[:, None], np.nan)
+    penalty = normalize_matrix(D, np.full(n_y, SUB_SCORES["Score_Penalty"][1]), params.normalisierung,
+                               params.winsor_quantile).ravel()[rows]
+
+    r_idx, y_idx = np.nonzero(present)
+    df = pd.DataFrame({"Kennziffer": cube.regions[r_idx], "Name": cube.names[r_idx],
+                       "Zeitbezug": cube.years[y_idx]})
+    assign_columns(df, list(kategorien), cats)
+    df["Score_Penalty"] = penalty
+    df["Index_Vorher"] = cats.mean(axis=1)
+    df["Index_Nachher"] = df["Index_Vorher"] - penalty * params.straf_faktor
+    return df
+
+
+def score_panel(pipeline, params=None, fenster=config.TREND_FENSTER, gewichte=None):
+    """
+    Trendmerkmale und Score-Historie aller Jahre auf dem Würfel einer Pipeline.
+    Rückgabe: (Trendtabelle je Region, Historie je Region und Jahr).
+    """
+    params = pipeline.params if params is None else params
+    cube = pipeline.stage("cube", params)
+    einwohner, filialen = pipeline.reference_data(params)
+    return trend_table(cube, params, fenster, gewichte), panel_history(cube, params, einwohner, filialen)
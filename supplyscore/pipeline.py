@@ -0,0 +1,255 @@
+"""
+Scoring-Pipeline mit zwischengespeicherten Stufen.
+
+Die Stufen load -> cube -> pivot -> normalize -> aggregate -> index bilden
+einen linearen Berechnungsgraphen. Jedes Zwischenergebnis wird unter einem
+Schlüssel aus dem Hash der Eingabedatei, dem Schlüssel der Vorstufe und den
+für die Stufe relevanten Parametern gespeichert. Ändert sich z. B. nur
+'straf_faktor', wird ausschließlich die Stufe 'index' neu berechnet. Je Stufe
+werden die zuletzt verwendeten CACHE_ENTRIES Ergebnisse gehalten (LRU), ältere
+werden verworfen.
+"""
+
+import dataclasses
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from supplyscore import config
+from supplyscore import scoring
+from supplyscore.cube import IndicatorCube
+from supplyscore.data import INKAR_PATH, load_inkar
+from supplyscore.instrument import instrumentation, rows_of
+from supplyscore.reference import EINWOHNER, FILIALEN, ReferenceStore, coverage
+from supplyscore.regions import RegionIndex
+
+
+@dataclasses.dataclass(frozen=True)
+class ScoringParams:
+    """Sämtliche Parameter des Scoring-Modells."""
+    indikatoren: tuple = config.INDIKATOREN
+    nordbayern: bool = True
+    latest_year: str = None
+    past_year: str = None
+    trend_indikator: str = config.TREND_INDIKATOR
+    invertiert: tuple = config.INVERTIERTE_INDIKATOREN
+    normalisierung: str = config.NORMALISIERUNG
+    winsor_quantile: tuple = config.WINSOR_QUANTILE
+    kategorien: tuple = tuple((k, tuple(v)) for k, v in config.KATEGORIEN.items())
+    referenz_stand: str = config.REFERENZ_STAND
+    einwohner: tuple = None  # None = Referenzdaten aus dem ReferenceStore
+    filialen: tuple = None
+    gewichte: tuple = tuple(config.HUNTER_GEWICHTE.items())
+    straf_faktor: float = config.STRAF_FAKTOR
+    default_einwohner: int = config.DEFAULT_EINWOHNER
+    default_filialen: int = config.DEFAULT_FILIALEN
+
+    def replace(self, **changes):
+        """Liefert eine Kopie mit geänderten Parametern."""
+        return dataclasses.replace(self, **changes)
+
+
+# Parameter, von denen die jeweilige Stufe (zusätzlich zur Vorstufe) abhängt
+STAGES = (
+    ("load", ("indikatoren", "nordbayern")),
+    ("cube", ()),
+    ("pivot", ("latest_year", "past_year", "trend_indikator")),
+    ("normalize", ("indikatoren", "invertiert", "normalisierung", "winsor_quantile")),
+    ("aggregate", ("kategorien",)),
+    ("index", ("referenz_stand", "einwohner", "filialen", "gewichte", "straf_faktor", "default_einwohner",
+               "default_filialen")),
+)
+STAGE_NAMES = tuple(name for name, _ in STAGES)
+
+# Zwischenergebnisse je Stufe im Speicher (z. B. Würfel mehrerer Eingabestände)
+CACHE_ENTRIES = 4
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """SHA-256-Hash des Dateiinhalts (blockweise gelesen)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ScoringPipeline:
+    """
+    Importierbare Scoring-Pipeline ohne Abhängigkeit zu den Plot-Bibliotheken.
+
+    Beispiel:
+        pipeline = ScoringPipeline()
+        df_trend = pipeline.run()
+        df_strenger = pipeline.run(straf_faktor=0.5)  # nur Stufe 'index' wird neu berechnet
+        df_2020 = pipeline.run(latest_year="2020")     # Würfel bleibt erhalten, nur Querschnitt neu
+    """
+
+    def __init__(self, path=INKAR_PATH, params=None, reference=None, result_cache=None, batch_size=None,
+                 cache_entries=CACHE_ENTRIES):
+        self.path = Path(path)
+        self.params = ScoringParams() if params is None else params
+        self.reference = ReferenceStore() if reference is None else reference
+        self.result_cache = result_cache  # optional: persistenter Ergebnis-Cache (supplyscore.cache.ResultCache)
+        self.batch_size = batch_size  # optional: Eingabedatei blockweise lesen (supplyscore.streaming)
+        self.cache_entries = cache_entries  # Anzahl der Ergebnisse je Stufe im Speicher (LRU)
+        self._cache = {name: OrderedDict() for name in STAGE_NAMES}
+        self._hashes = {}
+
+    # ------------------------------------------
+    # Schlüsselbildung
+    # ------------------------------------------
+    def source_hash(self):
+        """Hash der Eingabedatei; wird nur bei geänderter Größe/Änderungszeit neu berechnet."""
+        stat = self.path.stat()
+        sig = (str(self.path.resolve()), stat.st_size, stat.st_mtime_ns)
+        if sig not in self._hashes:
+            self._hashes[sig] = (self.result_cache.file_hash(self.path) if self.result_cache is not None
+                                 else file_hash(self.path))
+        return self._hashes[sig]
+
+    def stage_key(self, stage, params=None):
+        """Cache-Schlüssel einer Stufe (verkettet über alle Vorstufen)."""
+        params = self.params if params is None else params
+        key = self.source_hash()
+        for name, fields in STAGES:
+            payload = repr((key, name, [(f, getattr(params, f)) for f in fields], self._external_key(name, params)))
+            key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+            if name == stage:
+                return key
+        raise KeyError(f"Unbekannte Stufe: {stage}")
+
+    def result_inputs(self, params=None):
+        """Inhalts-Hashes aller Eingabedateien der Ergebnistabelle (INKAR-Extrakt, Referenzdaten)."""
+        params = self.params if params is None else params
+        inputs = {"inkar": self.source_hash()}
+        for dataset, explicit in ((EINWOHNER, params.einwohner), (FILIALEN, params.filialen)):
+            if explicit is None:
+                inputs[dataset] = self.result_cache.file_hash(self.reference.resolve(dataset, params.referenz_stand))
+        return inputs
+
+    def result_key(self, params=None):
+        """Schlüssel des persistenten Ergebnis-Caches: Inhalt aller Eingaben, Parameter und Cache-Version."""
+        from supplyscore.cache import CACHE_VERSION
+        params = self.params if params is None else params
+        payload = repr((CACHE_VERSION, sorted(self.result_inputs(params).items()), params))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _external_key(self, stage, params):
+        """Externe Eingaben einer Stufe (Stand der Referenzdateien) für den Cache-Schlüssel."""
+        if stage != "index":
+            return None
+        return tuple(self.reference.signature(dataset, params.referenz_stand)
+                     for dataset, explicit in ((EINWOHNER, params.einwohner), (FILIALEN, params.filialen))
+                     if explicit is None)
+
+    def reference_data(self, params=None):
+        """Einwohner und Filialen (Serien mit Kennziffer-Index bzw. Mappings) für die Stufe 'index'."""
+        params = self.params if params is None else params
+        einwohner = (self.reference.load(EINWOHNER, params.referenz_stand) if params.einwohner is None
+                     else dict(params.einwohner))
+        filialen = (self.reference.load(FILIALEN, params.referenz_stand) if params.filialen is None
+                    else dict(params.filialen))
+        return einwohner, filialen
+
+    # ------------------------------------------
+    # Berechnung
+    # ------------------------------------------
+    def _compute(self, stage, params, upstream):
+        if stage == "load":
+            if self.batch_size:
+                from supplyscore.streaming import InkarBatches
+                return InkarBatches(self.path, indikatoren=params.indikatoren, nordbayern=params.nordbayern,
+                                    batch_size=self.batch_size)
+            return load_inkar(self.path, indikatoren=params.indikatoren, nordbayern=params.nordbayern)
+        if stage == "cube":
+            if self.batch_size:
+                from supplyscore.streaming import stream_cube
+                return stream_cube(upstream)
+            return IndicatorCube.from_long(upstream)
+        if stage == "pivot":
+            latest_year, past_year = scoring.resolve_years(upstream.years, params.latest_year, params.past_year)
+            return scoring.pivot_trend(upstream, latest_year, past_year, params.trend_indikator)
+        if stage == "normalize":
+            return scoring.normalize(upstream, params.indikatoren, params.invertiert, params.normalisierung,
+                                     params.winsor_quantile)
+        if stage == "aggregate":
+            return scoring.aggregate_categories(upstream, dict(params.kategorien))
+        if stage == "index":
+            einwohner, filialen = self.reference_data(params)
+            return scoring.compute_index(upstream, einwohner=einwohner, filialen=filialen,
+                                         gewichte=dict(params.gewichte), straf_faktor=params.straf_faktor,
+                                         default_einwohner=params.default_einwohner,
+                                         default_filialen=params.default_filialen,
+                                         normalisierung=params.normalisierung, winsor=params.winsor_quantile,
+                                         kategorien=dict(params.kategorien))
+        raise KeyError(f"Unbekannte Stufe: {stage}")
+
+    def stage(self, stage, params=None):
+        """
+        Liefert das (gecachte) Ergebnis einer Stufe. Fehlende Vorstufen werden
+        rekursiv berechnet. Das Ergebnis ist ein geteiltes Objekt und darf
+        nicht verändert werden.
+        """
+        params = self.params if params is None else params
+        key = self.stage_key(stage, params)
+        cache = self._cache[stage]
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        if stage == STAGE_NAMES[-1] and self.result_cache is not None:
+            result = self._persistent_result(params)
+        else:
+            pos = STAGE_NAMES.index(stage)
+            upstream = self.stage(STAGE_NAMES[pos - 1], params) if pos > 0 else None
+            with instrumentation.stage(stage) as record:
+                result = self._compute(stage, params, upstream)
+                record["rows"] = rows_of(result)
+        cache[key] = result
+        while len(cache) > self.cache_entries:
+            cache.popitem(last=False)
+        return result
+
+    def _persistent_result(self, params):
+        """Ergebnistabelle aus dem persistenten Cache laden bzw. nach der Berechnung dort ablegen."""
+        result_key = self.result_key(params)
+        with instrumentation.stage("result_cache") as record:
+            df = self.result_cache.load(result_key)
+            record["rows"] = rows_of(df)
+        if df is None:
+            upstream = self.stage(STAGE_NAMES[-2], params)
+            with instrumentation.stage(STAGE_NAMES[-1]) as record:
+                df = self._compute(STAGE_NAMES[-1], params, upstream)
+                record["rows"] = rows_of(df)
+            self.result_cache.store(result_key, df, inputs=self.result_inputs(params),
+                                    params={k: repr(v) for k, v in dataclasses.asdict(params).items()})
+        return df
+
+    def run(self, **overrides):
+        """Führt die komplette Pipeline aus und gibt eine Kopie der Ergebnistabelle zurück."""
+        params = self.params.replace(**overrides) if overrides else self.params
+        return self.stage("index", params).copy()
+
+    def coverage(self, params=None, kennziffern=None):
+        """
+        Abdeckung der Referenzdaten für die Regionen der Ergebnistabelle (bzw.
+        nur für 'kennziffern'): je Datensatz die Anzahl der Regionen mit
+        Referenzwert bzw. Ersatzwert.
+        """
+        params = self.params if params is None else params
+        df = self.stage("index", params)
+        regions = RegionIndex(df[["Kennziffer", "Name"]])
+        kennziffern = df["Kennziffer"] if kennziffern is None else kennziffern
+        out = {}
+        for dataset, values in zip((EINWOHNER, FILIALEN), self.reference_data(params)):
+            if not isinstance(values, pd.Series):
+                values = regions.resolve(values, warn=False)
+            out[dataset] = coverage(kennziffern, values)
+        return out
+
+    def clear(self):
+        """Verwirft alle zwischengespeicherten Stufen."""
+        for cache in self._cache.values():
+            cache.clear()
@@ -0,0 +1,130 @@
+"""
+Externe Referenzdaten (Einwohner, Filialen) je Kennziffer.
+
+Die Referenzdaten liegen spaltenorientiert unter 'data/referenz/<datensatz>/'
+mit einer Datei je Stand, z. B. 'data/referenz/filialen/2026-10-18.arrow'.
+Arrow-IPC-Dateien (.arrow) werden per Memory-Mapping ohne Kopie gelesen,
+Parquet-Dateien (.parquet) mit memory_map=True. Jede Datei enthält die Spalten
+'Kennziffer' (string) und 'Wert' (numerisch).
+"""
+
+import datetime as dt
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+REFERENZ_PATH = Path("data/referenz")
+
+# Datensätze, die vom Scoring-Modell verwendet werden
+EINWOHNER = "einwohner"
+FILIALEN = "filialen"
+
+SUFFIXES = (".arrow", ".parquet")
+
+
+class ReferenceStore:
+    """
+    Versionierter Zugriff auf Referenzdaten. Geladene Tabellen werden anhand
+    von Pfad, Größe und Änderungszeit zwischengespeichert, sodass ein erneutes
+    Laden nach einer Aktualisierung nur die geänderte Datei betrifft.
+    """
+
+    def __init__(self, root=REFERENZ_PATH):
+        self.root = Path(root)
+        self._tables = {}
+
+    # ------------------------------------------
+    # Versionen
+    # ------------------------------------------
+    def versions(self, dataset):
+        """Verfügbare Stände eines Datensatzes (aufsteigend sortiert) mit Dateipfad."""
+        folder = self.root / dataset
+        if not folder.is_dir():
+            return []
+        out = []
+        for path in folder.iterdir():
+            if path.suffix not in SUFFIXES:
+                continue
+            try:
+                out.append((dt.date.fromisoformat(path.stem), path))
+            except ValueError:
+                continue
+        return sorted(out)
+
+    def resolve(self, dataset, stand=None):
+        """Datei des jüngsten Stands, der nicht nach 'stand' liegt (None = jüngster Stand)."""
+        if isinstance(stand, str):
+            stand = dt.date.fromisoformat(stand)
+        candidates = [(d, p) for d, p in self.versions(dataset) if stand is None or d <= stand]
+        if not candidates:
+            raise FileNotFoundError(f"Keine Referenzdaten für '{dataset}' (Stand {stand or 'aktuell'}) in {self.root}")
+        return candidates[-1][1]
+
+    def signature(self, dataset, stand=None):
+        """Kennung des verwendeten Stands (Pfad, Größe, Änderungszeit) für Cache-Schlüssel."""
+        path = self.resolve(dataset, stand)
+        stat = path.stat()
+        return str(path), stat.st_size, stat.st_mtime_ns
+
+    # ------------------------------------------
+    # Laden
+    # ------------------------------------------
+    def table(self, dataset, stand=None):
+        """Arrow-Tabelle eines Stands (memory-mapped, zero-copy für .arrow)."""
+        sig = self.signature(dataset, stand)
+        if sig not in self._tables:
+            path = Path(sig[0])
+            if path.suffix == ".arrow":
+                table = ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+            else:
+                table = pq.read_table(path, memory_map=True)
+            self._tables[sig] = table
+        return self._tables[sig]
+
+    def load(self, dataset, stand=None):
+        """Referenzwerte als Serie mit Kennziffer-Index."""
+        table = self.table(dataset, stand)
+        kennziffer = table.column("Kennziffer").to_pandas().astype(str)
+        wert = table.column("Wert").to_pandas().astype("float64")
+        return pd.Series(wert.to_numpy(), index=pd.Index(kennziffer, name="Kennziffer"), name=dataset)
+
+    # ------------------------------------------
+    # Schreiben
+    # ------------------------------------------
+    def write(self, dataset, values, stand=None):
+        """
+        Schreibt einen neuen Stand als Arrow-IPC-Datei.
+        Parameter 'values': Mapping oder Serie {Kennziffer: Wert}.
+        """
+        stand = dt.date.today() if stand is None else stand
+        if isinstance(stand, str):
+            stand = dt.date.fromisoformat(stand)
+        values = pd.Series(values)
+        table = pa.table({
+            "Kennziffer": pa.array(values.index.astype(str), pa.string()),
+            "Wert": pa.array(values.to_numpy(dtype="float64"), pa.float64()),
+        })
+        folder = self.root / dataset
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / f"{stand.isoformat()}.arrow"
+        with ipc.new_file(str(path), table.schema) as writer:
+            writer.write_table(table)
+        return path
+
+
+def coverage(kennziffern, values):
+    """
+    Abdeckung der Referenzdaten: Anzahl der Regionen, davon mit Referenzwert
+    und mit Ersatzwert (Fallback), sowie die Liste der Fallback-Kennziffern.
+    """
+    kennziffern = pd.Index(pd.Series(kennziffern).astype(str).unique())
+    covered = kennziffern.isin(values.index)
+    return {
+        "regionen": len(kennziffern),
+        "abgedeckt": int(covered.sum()),
+        "fallback": int((~covered).sum()),
+        "fallback_kennziffern": list(kennziffern[~covered]),
+    }
@@ -0,0 +1,113 @@
+"""
+Zuordnung von Referenzdaten zu Regionen über die Kennziffer (AGS).
+
+Referenzdaten (Einwohner, Filialen) können über die Kennziffer oder über den
+Namen einer Gebietskörperschaft gepflegt werden. Der RegionIndex löst jeden
+Schlüssel einmalig in eine Kennziffer auf; die Übernahme in die Ergebnistabelle
+erfolgt danach als vektorisierter Join auf der Kennziffer.
+
+Reihenfolge der Auflösung eines Namensschlüssels:
+    1. Kennziffer (reine Ziffernfolge)
+    2. 'X, Landkreis'  -> Landkreis X (nicht die gleichnamige kreisfreie Stadt)
+    3. 'X'             -> 'X, Stadt', sonst exakt 'X'
+    4. normalisierter Name (ohne Zusätze wie ', Stadt' oder 'i.d.OPf.'),
+       nur wenn eindeutig
+Nicht oder nicht eindeutig auflösbare Schlüssel werden gemeldet statt geraten.
+"""
+
+import re
+import warnings
+
+import pandas as pd
+
+# Zusätze nach einem Komma (', Stadt', ', Landkreis', ', Landeshauptstadt', ...)
+_SUFFIX = re.compile(r",.*$")
+# Lagebezeichnungen wie 'i.d.OPf.', 'a.d.Waldnaab', 'i.Fichtelgebirge'
+_QUALIFIER = re.compile(r"\s+(?:i|a|am|an|in|ob|b)\.\S*.*$")
+
+
+def normalize_name(name):
+    """Normalisierter Vergleichsname: ohne Zusätze, Kleinschreibung, einfache Leerzeichen."""
+    clean = _SUFFIX.sub("", str(name))
+    clean = _QUALIFIER.sub("", clean)
+    return " ".join(clean.split()).casefold()
+
+
+class RegionIndex:
+    """Einmalig aufgebauter Index zur Auflösung von Referenzschlüsseln auf Kennziffern."""
+
+    def __init__(self, regions):
+        """
+        Parameter 'regions': DataFrame mit den Spalten 'Kennziffer' und 'Name'
+        (eine Zeile je Region).
+        """
+        regions = regions[["Kennziffer", "Name"]].astype(str).drop_duplicates("Kennziffer")
+        self.kennziffern = set(regions["Kennziffer"])
+
+        names = regions["Name"]
+        counts = names.value_counts()
+        self.by_name = dict(zip(names, regions["Kennziffer"]))
+        self.by_name = {n: k for n, k in self.by_name.items() if counts[n] == 1}
+
+        # Art der Region: kreisfreie Stadt ('X, Stadt') bzw. gleichnamiger Landkreis ('X')
+        self.kind = {}
+        for name, kz in zip(names, regions["Kennziffer"]):
+            if name.endswith(", Stadt"):
+                self.kind[kz] = "Stadt"
+            elif f"{name}, Stadt" in self.by_name:
+                self.kind[kz] = "Landkreis"
+
+        self.by_norm = {}
+        for name, kz in zip(names, regions["Kennziffer"]):
+            self.by_norm.setdefault(normalize_name(name), []).append(kz)
+
+    def resolve_key(self, key):
+        """
+        Löst einen Referenzschlüssel in eine Kennziffer auf.
+        Liefert (Kennziffer, None) oder (None, Grund) bei fehlender/mehrdeutiger Zuordnung.
+        """
+        key = str(key).strip()
+        if key.isdigit():
+            return (key, None) if key in self.kennziffern else (None, "unbekannte Kennziffer")
+
+        if key.endswith(", Landkreis"):
+            base = key[: -len(", Landkreis")]
+            if key in self.by_name:
+                return self.by_name[key], None
+            candidates = [kz for kz in self.by_norm.get(normalize_name(base), []) if self.kind.get(kz) != "Stadt"]
+        else:
+            for exact in (f"{key}, Stadt", key):
+                if exact in self.by_name:
+                    return self.by_name[exact], None
+            candidates = [kz for kz in self.by_norm.get(normalize_name(key), [])
+                          if self.kind.get(kz) != "Landkreis"]
+
+        if len(candidates) == 1:
+            return candidates[0], None
+        return None, "mehrdeutig" if candidates else "nicht gefunden"
+
+    def resolve(self, reference, warn=True):
+        """
+        Überführt eine Referenztabelle {Schlüssel: Wert} in eine Serie mit
+        Kennziffer-Index. Mehrdeutige Schlüssel werden nicht zugeordnet und
+        (optional) als Warnung gemeldet.
+        """
+        resolved, problems = {}, {}
+        for key, value in reference.items():
+            kz, reason = self.resolve_key(key)
+            if kz is None:
+                problems[key] = reason
+            elif kz in resolved:
+                problems[key] = "doppelt"
+            else:
+                resolved[kz] = value
+        ambiguous = [k for k, r in problems.items() if r in ("mehrdeutig", "doppelt")]
+        if warn and ambiguous:
+            warnings.warn(f"Referenzschlüssel nicht eindeutig zuordenbar: {', '.join(map(str, ambiguous))}")
+        self.problems = problems
+        return pd.Series(resolved, dtype="float64", name="Wert").rename_axis("Kennziffer")
+
+    def lookup(self, kennziffern, reference, default, warn=True):
+        """Vektorisierter Join der Referenzwerte auf eine Kennziffer-Spalte (Fehlwerte = default)."""
+        values = self.resolve(reference, warn=warn) if not isinstance(reference, pd.Series) else reference
+        return kennziffern.astype(str).map(values).fillna(default).to_numpy()
@@ -0,0 +1,542 @@
+"""
+Visualisierung der Ergebnisse (fünf Abbildungen).
+
+Alle Abbildungen werden über die objektorientierte Figure/Axes-API mit dem
+nicht-interaktiven Agg-Backend erzeugt, ohne den globalen pyplot-Zustand.
+render_all() verteilt die Abbildungen auf einen Prozess-Pool; jeder Worker
+erhält nur die für seine Abbildung benötigten Spalten von 'top_8_global'.
+
+Jede Abbildung wird einmal gezeichnet und in allen gewünschten Formaten
+gespeichert (OUTPUTS: PNG für Druck und Web, SVG, PDF). Ein Manifest im
+Zielordner vermerkt je Datei einen Hash über Datenausschnitt, Stil und Format;
+unveränderte Abbildungen werden bei erneuten Läufen übersprungen.
+"""
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import seaborn as sns
+from matplotlib.artist import setp
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.figure import Figure
+
+from supplyscore import config
+from supplyscore.instrument import Instrumentation, instrumentation
+from supplyscore.labels import marker_boxes, place_labels
+
+OUTPUT_DIR = Path("figures")
+DPI = 300
+WEB_DPI = 100
+
+# Ausgabeformat -> (Dateiendung, Namenszusatz, dpi; None = Vektorformat)
+# Alle Formate einer Abbildung werden aus derselben, einmal gezeichneten Figure gespeichert.
+OUTPUTS = {
+    "print": ("png", "", DPI),
+    "web": ("png", "_web", WEB_DPI),
+    "svg": ("svg", "", None),
+    "pdf": ("pdf", "", None),
+}
+DEFAULT_OUTPUTS = ("print",)
+
+# Ohne Erstellungsdatum, damit unveränderte Abbildungen identische Dateien ergeben
+VECTOR_METADATA = {"svg": {"Date": None}, "pdf": {"CreationDate": None}}
+
+# Render-Cache: Manifest je Zielordner; bei Änderungen an den Plotfunktionen zu erhöhen
+RENDER_MANIFEST = ".render_cache.json"
+RENDER_VERSION = 1
+
+# Globales Design-Thema für Plots
+RC_PARAMS = {
+    'font.family': 'sans-serif',
+    'font.size': 11,
+    'font.weight': 'bold',
+    'axes.labelweight': 'bold',
+    'axes.titleweight': 'bold',
+    'figure.titleweight': 'bold',
+    'text.color': '#222222',
+    'axes.labelcolor': '#444444',
+    'xtick.color': '#444444',
+    'ytick.color': '#444444'
+}
+
+
+def apply_style():
+    """Setzt das globale Design-Thema (im Hauptprozess und in jedem Worker)."""
+    sns.set_theme(style="whitegrid")
+    matplotlib.rcParams.update(RC_PARAMS)
+
+
+def new_figure(figsize):
+    """Erzeugt eine Figure mit Agg-Canvas und einer Achse."""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+
+# =============================================================================
+# VISUALISIERUNG 1: ANALYSE DER BANKDICHTE (LOLLIPOP CHART)
+# =============================================================================
+def plot_bankdichte(top):
+    fig, ax = new_figure((14, 9))
+
+    # Datenvorbereitung
+    # Metrik: Einwohner pro Bank (Hoher Wert = Unterversorgung/Potenzial)
+    plot_radar = top.assign(Ew_pro_Bank=top["Einwohner"] / top["Filialen"])
+
+    # Berechnung des Durchschnitts als Referenzlinie
+    avg_ew_pro_bank = plot_radar["Ew_pro_Bank"].mean()
+
+    # Sortierung für treppenförmige Darstellung
+    plot_radar = plot_radar.sort_values("Ew_pro_Bank", ascending=True)
+
+    # Farbkodierung basierend auf Durchschnitt:
+    # Grün = Überdurchschnittlich viele Einwohner/Filiale (Potenzial)
+    # Rot = Unterdurchschnittlich viele Einwohner/Filiale (Sättigung)
+    colors = ['#2ca02c' if x < avg_ew_pro_bank else '#d62728' for x in plot_radar["Ew_pro_Bank"]]
+
+    # Plot erstellen (Lollipop Style)
+    ax.hlines(y=plot_radar["Name"], xmin=avg_ew_pro_bank, xmax=plot_radar["Ew_pro_Bank"], color=colors, alpha=0.8,
+              linewidth=6)
+    ax.scatter(plot_radar["Ew_pro_Bank"], plot_radar["Name"], color=colors, s=150, alpha=1, zorder=3)
+
+    # Referenzlinie Durchschnitt
+    ax.axvline(x=avg_ew_pro_bank, color='#333333', linestyle='-', linewidth=2)
+
+    # Layout und Labels
+    ax.set_title(f"BANKDICHTE", pad=25, fontsize=20)
+    ax.set_xlabel("← NIEDRIGE BANKDICHTE (HUNGRIG/GRÜN)        |       HOHE BANKDICHTE (GESÄTTIGT/ROT) →",
+                  fontweight='bold', fontsize=14, labelpad=15, ha='right', x=0.96, y=-0.7)
+
+    # Fußnote zur Einheit
+    ax.text(
+        x=-0.13, y=-0.12,
+        s="Einheit: Einwohner pro Bankfiliale",
+        transform=ax.transAxes,
+        ha='left', fontsize=15, color='#333333'
+    )
+
+    setp(ax.get_yticklabels(), fontsize=14, fontweight='bold', color='#222222')
+    # Durchschnittswert annotieren
+    ax.text(avg_ew_pro_bank, -0.8, f"Ø {int(avg_ew_pro_bank)}", ha='center', fontweight='bold', color='#3a2a22',
+            fontsize=18)
+
+    ax.grid(axis='x', alpha=0.5, linestyle='--')
+    fig.tight_layout()
+    return fig
+
+
+# =============================================================================
+# VISUALISIERUNG 2: MARKTMATRIX (BUBBLE PLOT)
+# =============================================================================
+def get_color_group(name):
+    """Weist Städten basierend auf Namen eine Farbgruppe zu (Highlight vs. Rest)."""
+    name_lower = str(name).lower()
+    if "aschaffenburg" in name_lower or "miltenberg" in name_lower or "fürth" in name_lower:
+        return "Highlight"  # Grün
+    return "Rest"  # Rot
+
+
+def plot_marktvolumen(top):
+    fig, ax = new_figure((14, 10))
+
+    plot_data = top.assign(ColorGroup=top["Name"].map(get_color_group))
+    custom_palette = {"Highlight": "#2ca02c", "Rest": "#d62728"}
+
+    # Bubble Plot erstellen
+    sns.scatterplot(
+        data=plot_data,
+        x="Score_Security", y="Marktvolumen_Mio",
+        size="Versorgung", sizes=(300, 3000),
+        hue="ColorGroup", palette=custom_palette, legend=False,
+        alpha=0.75, edgecolor="black", ax=ax
+    )
+
+    # Beschriftung an der Wunschposition (rechts neben dem Punkt, zur Mitte gezogen)
+    x_span = plot_data["Score_Security"].max() - plot_data["Score_Security"].min()
+    y_max = plot_data["Marktvolumen_Mio"].max()
+    annotations = [
+        ax.annotate(
+            row.Name, xy=(row.Score_Security, row.Marktvolumen_Mio),
+            xytext=(row.Score_Security + x_span * 0.02, 0.5 * row.Marktvolumen_Mio + 0.3 * y_max), textcoords='data',
+            fontsize=18, weight='bold', color='#222222',
+            arrowprops=dict(arrowstyle="-|>", color='#444444', lw=1.5, connectionstyle="arc3,rad=0.1"),
+            bbox=dict(boxstyle="round,pad=0.2", fc="white", ec="#cccccc", alpha=0.9)
+        )
+        for row in plot_data.itertuples()
+    ]
+
+    ax.set_title("Marktvolumen & Soziale Sicherheit", pad=20, fontsize=22)
+    ax.set_xlabel("Soziale Sicherheit", fontsize=16, weight='bold')
+    ax.set_ylabel("Marktvolumen (Mio. €)", fontsize=16, weight='bold')
+    ax.grid(True, linestyle='--', alpha=0.5)
+
+    # Legenden-Box im Plot
+    legend = ax.text(
+        plot_data["Score_Security"].min(), plot_data["Marktvolumen_Mio"].max(),
+        "Grün = Niedrige Konkurrenz\nRot = Hohe Konkurrenz",
+        ha='left', va='top', fontsize=15, bbox=dict(facecolor='white', alpha=0.9, edgecolor='gray')
+    )
+
+    fig.tight_layout()
+
+    # Kollisionsfreie Platzierung anhand der gemessenen Textausdehnung (Vermeidung von Überlappungen)
+    place_labels(ax, annotations, obstacles=marker_boxes(ax.collections[0]) + [legend])
+    return fig
+
+
+# =============================================================================
+# VISUALISIERUNG 3: STÄRKEN- UND SCHWÄCHENPROFIL (HEATMAP)
+# =============================================================================
+def plot_staerken_profil(top):
+    fig, ax = new_figure((14, 9))
+
+    plot_heatmap = top.sort_values(by="Index_Vorher", ascending=False)
+    plot_heatmap = plot_heatmap.set_index("Name")
+
+    # Datenselektion und Umbenennung für Anzeige
+    hm_data = plot_heatmap[["Cat_Mobilitaet", "Cat_Stabilitaet", "Cat_Wirtschaft", "Cat_Wohlstand"]]
+    hm_data.columns = ["Mobilität & Infra", "Soziale Stabilität", "Wirtschaftsaktivität", "Finanzkraft & Wohlstand"]
+
+    # Definition der Kategorie-Farben (analog zu Plot 4a)
+    column_colors = ["#3498db", "#9b59b6", "#f1c40f", "#2ecc71"]
+
+    # Technische Umsetzung: Überlagerung von vier separaten Heatmaps
+    for i, col_name in enumerate(hm_data.columns):
+        # Erstellung einer benutzerdefinierten Colormap (Weiß -> Zielfarbe)
+        cmap = LinearSegmentedColormap.from_list(f"custom_{i}", ["white", column_colors[i]])
+
+        # Maskierung aller anderen Spalten
+        mask = pd.DataFrame(True, index=hm_data.index, columns=hm_data.columns)
+        mask[col_name] = False
+
+        # Plot der Einzelspalte
+        sns.heatmap(
+            hm_data,
+            mask=mask,
+            cmap=cmap,
+            ax=ax,
+            annot=True,
+            fmt=".0f",
+            linewidths=2,
+            linecolor='white',
+            cbar=False,
+            annot_kws={"size": 13, "weight": "bold"}
+        )
+
+    ax.set_title("STÄRKEN-PROFILE NACH KATEGORIEN", pad=20, fontsize=18)
+    ax.set_ylabel("")
+    setp(ax.get_xticklabels(), fontsize=16, weight='bold')
+    setp(ax.get_yticklabels(), fontsize=16, weight='bold', rotation=0)
+    fig.tight_layout()
+    return fig
+
+
+# =============================================================================
+# VISUALISIERUNG 4a: ZUSAMMENSETZUNG DES GESAMT-SCORES (STACKED BAR)
+# =============================================================================
+def plot_gesamt_score(top):
+    fig, ax = new_figure((14, 9))
+
+    # Datenvorbereitung
+    plot_data_4a = top.sort_values(by="Index_Vorher", ascending=True)
+
+    # Definition der Kategorien und Farben
+    cols_heatmap = ["Cat_Mobilitaet", "Cat_Stabilitaet", "Cat_Wirtschaft", "Cat_Wohlstand"]
+    labels = ["Mobilität", "Stabilität", "Wirtschaft", "Finanzkraft"]
+    colors = ["#3498db", "#9b59b6", "#f1c40f", "#2ecc71"]
+
+    df_raw_scores = plot_data_4a[cols_heatmap].set_axis(labels, axis=1)
+
+    # Skalierung für Plot (Durchschnittsbildung statt Summe)
+    df_plot = df_raw_scores / 4
+
+    # Erstellung des Stacked Bar Charts
+    df_plot.plot(
+        kind='barh',
+        stacked=True,
+        ax=ax,
+        color=colors,
+        width=0.75,
+        edgecolor='white',
+        linewidth=1
+    )
+
+    # Beschriftung der Segmente (Prozente und absolute Scores)
+    for col_idx, container in enumerate(ax.containers):
+        cat_name = labels[col_idx]
+
+        for i, rect in enumerate(container):
+            city_name = df_plot.index[i]
+            real_score = df_raw_scores.loc[city_name, cat_name]
+            total_sum = df_raw_scores.loc[city_name].sum()
+
+            # Prozentanteil berechnen
+            if total_sum > 0:
+                pct = (real_score / total_sum) * 100
+            else:
+                pct = 0
+
+            # Beschriftung nur bei ausreichender Balkenbreite
+            if pct > 4:
+                face_color = rect.get_facecolor()
+                r, g, b = face_color[:3]
+                luminance = (0.299 * r + 0.587 * g + 0.114 * b)
+                # Automatische Kontrastfarbe für Text
+                if luminance > 0.55:
+                    text_color = '#222222'
+                else:
+                    text_color = 'white'
+
+                label_text = f"{int(round(pct))}%"
+
+                ax.text(
+                    rect.get_x() + rect.get_width() / 2,
+                    rect.get_y() + rect.get_height() / 2,
+                    label_text,
+                    ha='center', va='center',
+                    color=text_color, fontweight='bold', fontsize=15
+                )
+
+    ax.set_title("Der Gesamt-Score: Zusammensetzung nach Kategorien", pad=20, fontsize=20, color='#333333')
+    ax.set_xlabel("Index-Punkte (Durchschnitt aller Kategorien)", fontsize=18, fontweight='bold', color='#555555')
+    ax.set_ylabel("")
+
+    sns.despine(ax=ax, left=True, bottom=False)
+    ax.grid(axis='x', linestyle='-', alpha=0.15, color='black')
+    ax.grid(visible=False, axis='y')
+    ax.set_yticks(range(len(plot_data_4a)))
+    ax.set_yticklabels(plot_data_4a["Name"], fontsize=18, fontweight='bold', color='#222222')
+    setp(ax.get_xticklabels(), color='#555555')
+
+    ax.legend(
+        labels,
+        loc='upper center',
+        bbox_to_anchor=(0.5, -0.12),
+        ncol=4,
+        frameon=False,
+        fontsize=15,
+        handlelength=3,
+        handleheight=2
+    )
+
+    fig.tight_layout()
+    return fig
+
+
+# =============================================================================
+# VISUALISIERUNG 4b: EINFLUSS DER VERSORGUNGSDICHTE (VORHER/NACHHER)
+# =============================================================================
+def plot_finaler_score(top, ref_avg=config.REF_EW_PRO_BANK, scaling_factor=config.SCALING_FAKTOR):
+    fig, ax = new_figure((14, 9))
+
+    # Berechnung der Abweichung vom Referenzwert
+    # Anpassung des Scores basierend auf der Abweichung
+    # Logik: Hohe Einwohnerzahl pro Bank = Unterversorgung = Bonus (Potenzial)
+    #        Niedrige Einwohnerzahl pro Bank = Überversorgung = Malus (Sättigung)
+    plot_data_4b = top.assign(
+        Ew_pro_Bank=lambda d: d["Einwohner"] / d["Filialen"],
+        Abweichung=lambda d: d["Ew_pro_Bank"] - ref_avg,
+        Index_Nachher=lambda d: d["Index_Vorher"] - (d["Abweichung"] * scaling_factor),
+    ).sort_values(by="Index_Nachher", ascending=True)
+    my_range = range(1, len(plot_data_4b.index) + 1)
+
+    # Farbzuweisung für Verbesserung (Grün) vs. Verschlechterung (Rot)
+    colors_nachher = []
+    for i, row in plot_data_4b.iterrows():
+        if row["Index_Nachher"] > row["Index_Vorher"]:
+            colors_nachher.append('#2ca02c') # Grün (Bonus)
+        else:
+            colors_nachher.append('#d62728') # Rot (Abzug)
+
+    # Plotten der Rangveränderung
+    ax.hlines(y=my_range, xmin=plot_data_4b['Index_Nachher'], xmax=plot_data_4b['Index_Vorher'],
+              color='grey', alpha=0.4, linewidth=2.5)
+    ax.scatter(plot_data_4b['Index_Vorher'], my_range, color='grey', alpha=0.65, s=200,
+               label='Score ohne Einberechnung', zorder=4)
+    ax.scatter(plot_data_4b['Index_Nachher'], my_range, c=colors_nachher, alpha=0.65, s=200, zorder=5)
+
+    # Legende für den Plot
+    ax.scatter([], [], c='#2ca02c', s=200, label='Bonus (Schlechte Versorgung / Wenig Banken)')
+    ax.scatter([], [], c='#d62728', s=200, label='Strafe (Gute Versorgung / Viele Banken)')
+
+    # Indikatorpfeile für Score-Veränderung
+    for i in range(len(plot_data_4b)):
+        row = plot_data_4b.iloc[i]
+        if abs(row['Index_Vorher'] - row['Index_Nachher']) > 0.5:
+            ax.annotate('',
+                        xy=(row['Index_Nachher'], i+1),
+                        xytext=(row['Index_Vorher'], i+1),
+                        arrowprops=dict(arrowstyle='-> ', color='black', lw=2.5))
+
+    ax.set_yticks(my_range)
+    ax.set_yticklabels(plot_data_4b['Name'], fontsize=16, fontweight='bold', color='#222222')
+    ax.set_title("FINALES ERGEBNIS: PUNKTZAHL NACH INTEGRIERUNG DER BANKDICHTE", pad=20, fontsize=18)
+    ax.set_xlabel("Gesamt-Score ", fontsize=15, fontweight='bold')
+    ax.legend(loc='lower right', frameon=True, fontsize=15)
+    ax.grid(axis='x', linestyle='--', alpha=0.5)
+
+    # Erläuterungsbox zur Methodik
+    ax.text(
+        x=0.02, y=0.98,
+        s=f"Referenz: Ø {ref_avg} Einwohner pro Bank.\n• (< {ref_avg}) = Hohe Dichte = Bonus (Grün)"
+          f"\n• (> {ref_avg}) = Niedrige Dichte = Strafe (Rot)",
+        transform=ax.transAxes,
+        ha='left', va='top',
+        fontsize=16,
+        bbox=dict(facecolor='white', alpha=0.8, edgecolor='gray'),
+        zorder=20
+    )
+
+    fig.tight_layout()
+    return fig
+
+
+# =============================================================================
+# RENDER-STUFE
+# =============================================================================
+# Abbildung -> (Plotfunktion, benötigte Spalten von top_8_global)
+FIGURES = {
+    "1_Bankdichte": (plot_bankdichte, ["Name", "Einwohner", "Filialen"]),
+    "2_Markvolumen_Sicherheit": (plot_marktvolumen, ["Name", "Score_Security", "Marktvolumen_Mio", "Versorgung"]),
+    "3_Stärken_Profil": (plot_staerken_profil, ["Name", "Index_Vorher", "Cat_Mobilitaet", "Cat_Stabilitaet",
+                                                "Cat_Wirtschaft", "Cat_Wohlstand"]),
+    "4a_Gesamt_Score_Kateg": (plot_gesamt_score, ["Name", "Index_Vorher", "Cat_Mobilitaet", "Cat_Stabilitaet",
+                                                  "Cat_Wirtschaft", "Cat_Wohlstand"]),
+    "4b_Finaler_Score_Bankdichte": (plot_finaler_score, ["Name", "Einwohner", "Filialen", "Index_Vorher"]),
+}
+
+
+def output_paths(name, output_dir, outputs=DEFAULT_OUTPUTS):
+    """Zieldateien einer Abbildung je Ausgabeformat."""
+    return {output: Path(output_dir) / f"{name}{OUTPUTS[output][1]}.{OUTPUTS[output][0]}" for output in outputs}
+
+
+def render_figure(name, data, output_dir=OUTPUT_DIR, outputs=DEFAULT_OUTPUTS):
+    """
+    Zeichnet eine Abbildung einmal und speichert sie in allen angegebenen
+    Ausgabeformaten (Rückgabe: Liste der Pfade).
+    """
+    plot, _ = FIGURES[name]
+    fig = plot(data)
+    paths = []
+    for output, path in output_paths(name, output_dir, outputs).items():
+        ext, _, dpi = OUTPUTS[output]
+        fig.savefig(path, dpi=dpi, metadata=VECTOR_METADATA.get(ext))
+        paths.append(path)
+    return paths
+
+
+def render_job(name, data, output_dir=OUTPUT_DIR, outputs=DEFAULT_OUTPUTS):
+    """Rendert eine Abbildung und misst dabei die Laufzeit (Rückgabe: Pfade, Messwerte)."""
+    with Instrumentation().stage(f"figure:{name}", emit=False, formate=list(outputs)) as record:
+        paths = render_figure(name, data, output_dir, outputs)
+        record["rows"] = len(data)
+    return paths, record
+
+
+def figure_jobs(top, output_dir=OUTPUT_DIR, figures=None, outputs=DEFAULT_OUTPUTS):
+    """Render-Aufträge (Name, Datenausschnitt, Zielordner, Ausgabeformate) für eine Auswahl von Regionen."""
+    names = list(FIGURES) if figures is None else list(figures)
+    return [(name, top[FIGURES[name][1]], Path(output_dir), tuple(outputs)) for name in names]
+
+
+# =============================================================================
+# RENDER-CACHE
+# =============================================================================
+def figure_key(name, data):
+    """SHA-256 über Datenausschnitt, Stilparameter und Bibliotheksversionen einer Abbildung."""
+    digest = hashlib.sha256()
+    digest.update(repr((RENDER_VERSION, name, sorted(RC_PARAMS.items()), config.REF_EW_PRO_BANK,
+                        config.SCALING_FAKTOR, matplotlib.__version__, sns.__version__, list(data.columns),
+                        [str(t) for t in data.dtypes])).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def file_key(key, output):
+    """Schlüssel einer Zieldatei: Abbildungs-Schlüssel und Ausgabeformat."""
+    return hashlib.sha256(repr((key, OUTPUTS[output])).encode("utf-8")).hexdigest()
+
+
+def read_manifest(output_dir):
+    """Schlüssel der zuletzt in 'output_dir' geschriebenen Dateien: Dateiname -> Schlüssel."""
+    try:
+        with open(Path(output_dir) / RENDER_MANIFEST, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_manifest(output_dir, manifest):
+    tmp = Path(output_dir) / f"{RENDER_MANIFEST}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, Path(output_dir) / RENDER_MANIFEST)
+
+
+def render_jobs(jobs, processes=None, cache=True):
+    """
+    Führt Render-Aufträge aus. Mit processes=1 wird seriell im aktuellen
+    Prozess gerendert, sonst parallel in einem Prozess-Pool (Standard: höchstens
+    so viele Prozesse wie Aufträge bzw. CPU-Kerne).
+
+    Mit cache=True werden Zieldateien übersprungen, deren Schlüssel (Daten,
+    Stil, Format) dem im Zielordner vermerkten entspricht und die noch
+    vorhanden sind; Abbildungen ohne fehlende Dateien werden nicht gezeichnet.
+    Mit cache=False wird alles neu gezeichnet. Im Manifest werden in beiden
+    Fällen nur die Einträge der geschriebenen Dateien aktualisiert.
+    Rückgabe: Pfade aller Zieldateien (auch der übersprungenen).
+    """
+    for _, _, output_dir, _ in jobs:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Abgleich mit den Manifesten der Zielordner
+    with instrumentation.stage("render_cache") as record:
+        manifests = {output_dir: read_manifest(output_dir) for _, _, output_dir, _ in jobs}
+        pending, keys = [], {}
+        for name, data, output_dir, outputs in jobs:
+            key = figure_key(name, data)
+            paths = output_paths(name, output_dir, outputs)
+            for output, path in paths.items():
+                keys[path] = file_key(key, output)
+            missing = tuple(output for output, path in paths.items()
+                            if not cache or manifests[output_dir].get(path.name) != keys[path] or not path.exists())
+            if missing:
+                pending.append((name, data, output_dir, missing))
+        record["rows"] = len(jobs) - len(pending)
+
+    if pending:
+        if processes is None:
+            processes = min(len(pending), os.cpu_count() or 1)
+        if processes <= 1:
+            apply_style()
+            results = [render_job(*job) for job in pending]
+        else:
+            with ProcessPoolExecutor(max_workers=processes, initializer=apply_style) as pool:
+                futures = [pool.submit(render_job, *job) for job in pending]
+                results = [f.result() for f in futures]
+
+        # Messwerte der Worker werden im Hauptprozess ausgegeben (inkl. Callbacks)
+        if instrumentation.enabled:
+            for _, record in results:
+                instrumentation.emit(record)
+        for paths, _ in results:
+            for path in paths:
+                manifests[path.parent][path.name] = keys[path]
+        for output_dir, manifest in manifests.items():
+            write_manifest(output_dir, manifest)
+    return list(keys)
+
+
+def render_all(top, output_dir=OUTPUT_DIR, figures=None, processes=None, outputs=DEFAULT_OUTPUTS, cache=True):
+    """Erzeugt die Abbildungen für die ausgewählten Regionen ('top_8_global')."""
+    return render_jobs(figure_jobs(top, output_dir, figures, outputs), processes, cache)
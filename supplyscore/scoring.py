@@ -0,0 +1,157 @@
+"""
+Scoring-Modell: Pivotierung, Normalisierung, Kategorie-Aggregation und Indexierung.
+
+Die Funktionen bilden die einzelnen Stufen der Pipeline ab und verändern ihre
+Eingaben nicht; jede Stufe liefert einen neuen DataFrame zurück.
+"""
+
+import numpy as np
+import pandas as pd
+
+from supplyscore import config, kernel
+from supplyscore.normalization import normalize_matrix
+from supplyscore.reference import EINWOHNER, FILIALEN, ReferenceStore
+from supplyscore.regions import RegionIndex
+
+
+def assign_columns(df, columns, values):
+    """Übernimmt die Spalten einer Matrix in den DataFrame (vorhandene Spalten werden überschrieben)."""
+    for j, col in enumerate(columns):
+        df[col] = values[:, j]
+    return df
+
+
+# ==========================================
+# STUFE: PIVOTIERUNG
+# ==========================================
+def resolve_years(years, latest_year=None, past_year=None):
+    """
+    Ermittlung des Zeitbezugs (Vergleich Aktuell vs. Historisch).
+    Ohne Vorgabe wird das jüngste und das älteste verfügbare Jahr verwendet.
+    """
+    years = sorted(str(y) for y in years)
+    if latest_year is None: latest_year = years[-1]
+    if past_year is None: past_year = years[0]
+    return str(latest_year), str(past_year)
+
+
+def pivot_trend(cube, latest_year, past_year, trend_indikator=config.TREND_INDIKATOR):
+    """
+    Querschnitt des Indikator-Würfels mit einer Zeile je Region für das aktuelle
+    Jahr, ergänzt um die Werte des Vergleichsjahres (Suffix '_OLD') und das
+    prozentuale Wachstum des Trend-Indikators.
+    """
+    df_now = cube.frame(latest_year)
+    df_past = cube.frame(past_year).drop(columns="Name")
+    df_past.columns = [f"{c}_OLD" if c in df_now.columns and c != "Kennziffer" else c for c in df_past.columns]
+    df_trend = pd.merge(df_now, df_past, on="Kennziffer")
+
+    # Berechnung des prozentualen Wachstums
+    old = f"{trend_indikator}_OLD"
+    if trend_indikator in df_trend.columns and old in df_trend.columns:
+        rows = df_trend["Kennziffer"].map(cube.region_index).to_numpy()
+        df_trend["Wachstum_Prozent"] = cube.growth(trend_indikator, past_year, latest_year)[rows]
+    else:
+        df_trend["Wachstum_Prozent"] = 0
+
+    return df_trend.fillna(0)
+
+
+# ==========================================
+# STUFE: NORMALISIERUNG
+# ==========================================
+def normalize(df_trend, indikatoren=config.INDIKATOREN, invertiert=config.INVERTIERTE_INDIKATOREN,
+              normalisierung=config.NORMALISIERUNG, winsor=config.WINSOR_QUANTILE):
+    """
+    Normalisierung aller Indikatoren auf 0-100 (Spalten 'S_<Indikator>');
+    Verfahren siehe supplyscore/normalization.py.
+    """
+    cols = [c for c in indikatoren if c in df_trend.columns]
+    scores = normalize_matrix(df_trend[cols].to_numpy(dtype=float), [c in invertiert for c in cols], normalisierung,
+                              winsor)
+    return assign_columns(df_trend.copy(), [f"S_{c}" for c in cols], scores)
+
+
+# ==========================================
+# STUFE: KATEGORIE-AGGREGATION
+# ==========================================
+def aggregate_categories(df_scores, kategorien=None):
+    """Aggregation der normalisierten Indikatoren zu den Hauptkategorien ('Cat_*')."""
+    kategorien = config.KATEGORIEN if kategorien is None else kategorien
+    cols = [c for c in df_scores.columns if c.startswith("S_")]
+    membership = kernel.category_matrix([c[2:] for c in cols], kategorien)
+    cats = kernel.category_means(df_scores[cols].to_numpy(dtype=float), membership)
+    return assign_columns(df_scores.copy(), list(kategorien), cats)
+
+
+# ==========================================
+# STUFE: INDEXIERUNG
+# ==========================================
+def compute_index(df_cat, einwohner=None, filialen=None, gewichte=None, straf_faktor=config.STRAF_FAKTOR,
+                  default_einwohner=config.DEFAULT_EINWOHNER, default_filialen=config.DEFAULT_FILIALEN,
+                  normalisierung=config.NORMALISIERUNG, winsor=config.WINSOR_QUANTILE, kategorien=None):
+    """
+    Ergänzung der Referenzdaten (Einwohner, Filialen), Berechnung der KPIs des
+    Marktmodells, des Hunter-Index sowie von Index_Vorher und Index_Nachher.
+
+    'einwohner' und 'filialen' sind Serien mit Kennziffer-Index oder Mappings
+    {Kennziffer/Name: Wert}; ohne Angabe wird der aktuelle Stand aus dem
+    ReferenceStore geladen. Die Sub-Scores werden wie die Indikatoren mit
+    'normalisierung' skaliert; Index_Vorher mittelt die Spalten 'kategorien'
+    (wie bei aggregate_categories).
+    """
+    if einwohner is None or filialen is None:
+        store = ReferenceStore()
+        einwohner = store.load(EINWOHNER, config.REFERENZ_STAND) if einwohner is None else einwohner
+        filialen = store.load(FILIALEN, config.REFERENZ_STAND) if filialen is None else filialen
+    df = df_cat.copy()
+
+    # Ergänzung der Referenzdaten (Join über die Kennziffer)
+    regions = RegionIndex(df[["Kennziffer", "Name"]])
+    df["Einwohner"] = regions.lookup(df["Kennziffer"], einwohner, default_einwohner)
+    df["Filialen"] = regions.lookup(df["Kennziffer"], filialen, default_filialen)
+
+    derive_kpis(df)
+    sources = [source for source, _ in SUB_SCORES.values()]
+    invert = [inv for _, inv in SUB_SCORES.values()]
+    assign_columns(df, list(SUB_SCORES),
+                   normalize_matrix(df[sources].to_numpy(dtype=float), invert, normalisierung, winsor))
+    combine_indices(df, gewichte, straf_faktor, kategorien)
+    return df
+
+
+# Sub-Scores des Marktmodells: Spalte -> (Quellspalte, Invertierung)
+SUB_SCORES = {
+    "Score_Hunger": ("Versorgung", False),
+    "Score_Geld": ("Marktvolumen_Mio", False),
+    "Score_Security": ("Risiko", True),
+    "Score_Trend": ("Wachstum_Prozent", False),
+    "Score_Penalty": ("Dichte", False),
+}
+
+
+def derive_kpis(df):
+    """Berechnung spezifischer KPIs für das Marktmodell (zeilenweise, direkt im DataFrame)."""
+    df["Versorgung"] = df["Einwohner"] / df["Filialen"]  # Einwohner pro Filiale
+    if "Einzelhandelsrelevante Kaufkraft" in df.columns:
+        df["Marktvolumen_Mio"] = (df["Einzelhandelsrelevante Kaufkraft"] * df["Einwohner"]) / 1_000_000
+    else:
+        df["Marktvolumen_Mio"] = df["Einwohner"] * 25000 / 1_000_000
+    df["Risiko"] = df["Arbeitslosenquote"] if "Arbeitslosenquote" in df.columns else 3.0
+    df["Dichte"] = df["Filialen"] / df["Einwohner"]
+    return df
+
+
+def combine_indices(df, gewichte=None, straf_faktor=config.STRAF_FAKTOR, kategorien=None):
+    """
+    Hunter-Index (gewichteter Durchschnitt der Sub-Scores), Index_Vorher
+    (strukturelles Potenzial: Mittel der Kategorien 'kategorien') und
+    Index_Nachher (Einbeziehung Sättigung/Bankdichte), direkt im DataFrame.
+    """
+    gewichte = config.HUNTER_GEWICHTE if gewichte is None else gewichte
+    kategorien = config.KATEGORIEN if kategorien is None else kategorien
+    indices = kernel.composite_indices(
+        df[list(gewichte)].to_numpy(dtype=float), np.array(list(gewichte.values()), dtype=float),
+        df[list(kategorien)].to_numpy(dtype=float), df["Score_Penalty"].to_numpy(dtype=float),
+        straf_faktor)
+    return assign_columns(df, kernel.ScoringKernel.INDEX_COLUMNS, indices)
@@ -0,0 +1,112 @@
+"""
+Globale Datenselektion: Eingrenzung auf eine Regionsgruppe, Ausschluss
+(Blacklist) und Auswahl der besten Regionen nach einem Index.
+
+Gruppen und Blacklist werden als boolesche Masken über dem gemeinsamen
+Ergebnis-DataFrame ausgewertet; die Top-N werden per np.argpartition über die
+Indexspalte bestimmt, sortiert werden nur die N ausgewählten Zeilen. Erst das
+Ergebnis (N Zeilen) wird als DataFrame materialisiert. Bei Gleichstand
+entscheidet die Reihenfolge im DataFrame.
+"""
+
+import numpy as np
+import pandas as pd
+
+from supplyscore import config
+from supplyscore.instrument import instrumentation
+
+
+def group_mask(df, kennziffern=None, namen=None):
+    """
+    Zeilenmaske einer Regionsgruppe. 'kennziffern' sind Präfixe der Kennziffer
+    (z. B. '095' für alle Regionen in Mittelfranken), 'namen' exakte Namen.
+    Ohne Angaben gehören alle Regionen zur Gruppe.
+    """
+    if kennziffern is None and namen is None:
+        return df["Name"].notna()
+    mask = df["Name"].isin(namen or [])
+    if kennziffern:
+        mask |= df["Kennziffer"].astype(str).str.startswith(tuple(str(k) for k in kennziffern))
+    return mask
+
+
+def selection_mask(df, blacklist=config.BLACKLIST, kennziffern=None, namen=None):
+    """Boolesche Maske (NumPy) der wählbaren Regionen: Gruppe ohne Blacklist."""
+    mask = group_mask(df, kennziffern, namen).to_numpy(dtype=bool)
+    if blacklist:
+        mask = mask & ~df["Name"].isin(list(blacklist)).to_numpy()
+    return mask
+
+
+def top_k_positions(values, k, mask=None):
+    """
+    Positionen der k größten Werte (absteigend sortiert) unter den Zeilen mit
+    mask=True. Fehlende Werte stehen hinten; bei Gleichstand gilt die Position.
+    """
+    candidates = np.arange(len(values)) if mask is None else np.flatnonzero(mask)
+    if k <= 0:
+        return candidates[:0]
+    scores = np.asarray(values, dtype=float)[candidates]
+    scores = np.where(np.isnan(scores), -np.inf, scores)
+    if k < len(candidates):
+        # Schwellenwert des k-ten Elements; gleichauf liegende Werte nach Position auffüllen
+        threshold = -np.partition(-scores, k - 1)[k - 1]
+        above = np.flatnonzero(scores > threshold)
+        tied = np.flatnonzero(scores == threshold)[:k - len(above)]
+        keep = np.concatenate([above, tied])
+        candidates, scores = candidates[keep], scores[keep]
+    order = np.lexsort((candidates, -scores))
+    return candidates[order][:k]
+
+
+def select_top(df, blacklist=config.BLACKLIST, top_n=config.TOP_N, sort_by=config.SORT_BY, kennziffern=None,
+               namen=None):
+    """Selektion der Top-N Regionen einer Gruppe nach 'sort_by' (absteigend), ohne Blacklist."""
+    with instrumentation.stage("select") as record:
+        positions = top_k_positions(df[sort_by].to_numpy(), top_n, selection_mask(df, blacklist, kennziffern, namen))
+        top = df.iloc[positions]
+        record["rows"] = len(top)
+    return top
+
+
+# ==========================================
+# TOP-N JE GRUPPE
+# ==========================================
+def regierungsbezirk(df):
+    """Schlüssel des Regierungsbezirks (erste drei Stellen der Kennziffer); None für die Bezirke selbst."""
+    kz = df["Kennziffer"].astype(str)
+    return kz.str[:3].where(kz.str.len() > 3)
+
+
+def select_top_per_group(df, by=regierungsbezirk, blacklist=config.BLACKLIST, top_n=config.TOP_N,
+                         sort_by=config.SORT_BY):
+    """
+    Top-N je Gruppe in einem Durchlauf. 'by' ist ein Spaltenname, eine Serie
+    von Gruppenschlüsseln oder eine Funktion(df) (Standard: Regierungsbezirk);
+    Zeilen ohne Schlüssel werden ignoriert. Rückgabe: DataFrame mit den Spalten
+    'Gruppe' und 'Rang' vor den Ergebnisspalten, nach Gruppe und Rang sortiert.
+    """
+    with instrumentation.stage("select_groups") as record:
+        keys = by(df) if callable(by) else (df[by] if isinstance(by, str) else by)
+        codes, labels = pd.factorize(np.asarray(keys), sort=True)
+        mask = selection_mask(df, blacklist) & (codes >= 0)
+        values = df[sort_by].to_numpy()
+
+        # Zeilen nach Gruppe bündeln (ganzzahliger, stabiler Sort), dann Top-N je Abschnitt
+        order = np.argsort(np.where(mask, codes, len(labels)), kind="stable")
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(codes[mask], minlength=len(labels)))])
+        positions, gruppen, raenge = [], [], []
+        for g in range(len(labels)):
+            rows = order[bounds[g]:bounds[g + 1]]
+            top = rows[top_k_positions(values[rows], top_n)]
+            positions.append(top)
+            gruppen.append(np.full(len(top), g))
+            raenge.append(np.arange(1, len(top) + 1))
+
+        positions = np.concatenate(positions) if positions else np.array([], dtype=int)
+        top = df.iloc[positions]
+        top.insert(0, "Rang", np.concatenate(raenge) if raenge else [])
+        top.insert(0, "Gruppe", np.asarray(labels)[np.concatenate(gruppen)] if gruppen else [])
+        record["rows"] = len(top)
+    return top
+
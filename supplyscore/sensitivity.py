@@ -0,0 +1,324 @@
+"""
+Sensitivitätsanalyse der Gewichte und Rangstabilität.
+
+Die Zielgrößen sind linear in ihren Parametern:
+    Score = Basis + Merkmale @ Parameter
+(Hunter-Index: Sub-Scores / Divisor mit den Gewichten als Parameter;
+Index_Nachher: Index_Vorher - Score_Penalty * straf_faktor; Index_Final:
+Index_Vorher - Abweichung Einwohner/Bank * scaling_factor wie in Abbildung 4b).
+Damit werden alle Parameter-Stichproben (Gitter, Latin Hypercube oder
+Dirichlet) in einem Matrixprodukt (Regionen x Parameter) @ (Parameter x
+Stichproben) bewertet, blockweise über die Stichproben.
+
+Je Region werden berichtet: Rang mit den Standardparametern, Wahrscheinlichkeit
+für die Top-N, Rangintervall (Minimum, 5 %-, 50 %-, 95 %-Quantil, Maximum)
+sowie je Stichprobe Kendalls Tau gegenüber der Basis-Rangfolge. Tau wird
+sortierbasiert berechnet; der Speicherbedarf je Block wächst linear mit
+Regionen x Stichproben.
+
+Statt eines vollständigen Rang-Histogramms (Regionen x Ränge) werden nur die
+berichteten Kennzahlen gehalten: Top-N-Zähler, kleinster und größter Rang
+sowie ein grobes Histogramm mit höchstens RANK_BINS Rangklassen je Region.
+Es bestimmt die Klasse, in der ein Quantil liegt; ein zweiter Durchlauf über
+die Stichproben zählt die Ränge nur innerhalb dieser Klassen (exakte
+Quantile, Speicher linear in der Anzahl der Regionen). Bei höchstens
+RANK_BINS Regionen ist das Histogramm exakt und der zweite Durchlauf entfällt.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from supplyscore import config
+from supplyscore.selection import selection_mask
+
+METHODS = ("dirichlet", "lhs", "grid")
+
+# Regionen x Stichproben je Block (bestimmt den Speicherbedarf je Block)
+CHUNK_ELEMENTS = 2_000_000
+# Rangklassen je Region im groben Histogramm der Rangverteilung
+RANK_BINS = 256
+# Berichtete Quantile der Rangverteilung
+RANK_QUANTILES = {"Rang_P05": 0.05, "Rang_Median": 0.5, "Rang_P95": 0.95}
+
+
+# ==========================================
+# ZIELGRÖSSEN
+# ==========================================
+def hunter_target(df):
+    cols = list(config.HUNTER_GEWICHTE)
+    features = df[cols].to_numpy(dtype=float) / config.HUNTER_DIVISOR
+    return np.zeros(len(df)), features, cols, np.array(list(config.HUNTER_GEWICHTE.values()))
+
+
+def nachher_target(df):
+    features = -df[["Score_Penalty"]].to_numpy(dtype=float)
+    return df["Index_Vorher"].to_numpy(dtype=float), features, ["straf_faktor"], np.array([config.STRAF_FAKTOR])
+
+
+def final_target(df):
+    abweichung = (df["Einwohner"] / df["Filialen"] - config.REF_EW_PRO_BANK).to_numpy(dtype=float)
+    return (df["Index_Vorher"].to_numpy(dtype=float), -abweichung[:, None], ["scaling_factor"],
+            np.array([config.SCALING_FAKTOR]))
+
+
+# Zielgröße -> Funktion(df) -> (Basis, Merkmale, Parameternamen, Standardparameter)
+TARGETS = {
+    "Hunter_Index": hunter_target,
+    "Index_Nachher": nachher_target,
+    "Index_Final": final_target,
+}
+
+
+# ==========================================
+# STICHPROBEN
+# ==========================================
+def sample_grid(lo, hi, steps):
+    """Gleichmäßiges Gitter mit 'steps' Punkten je Parameter (steps ** Parameteranzahl Stichproben)."""
+    axes = [np.linspace(a, b, steps) for a, b in zip(lo, hi)]
+    return np.array(list(itertools.product(*axes)))
+
+
+def sample_lhs(lo, hi, n, rng):
+    """Latin-Hypercube-Stichprobe: je Parameter genau ein Wert pro Schicht, Schichten zufällig kombiniert."""
+    lo, hi = np.asarray(lo, dtype=float), np.asarray(hi, dtype=float)
+    strata = np.argsort(rng.random((n, len(lo))), axis=0)
+    u = (strata + rng.random((n, len(lo)))) / n
+    return lo + u * (hi - lo)
+
+
+def sample_dirichlet(baseline, n, rng, konzentration=1.0):
+    """
+    Gewichtsvektoren mit gleicher Summe wie die Standardgewichte, gleichverteilt
+    auf dem Simplex (konzentration=1) bzw. um die Standardgewichte konzentriert
+    (konzentration > 1: Dirichlet mit alpha = konzentration * Anteil * Anzahl).
+    """
+    baseline = np.asarray(baseline, dtype=float)
+    if len(baseline) < 2:
+        raise ValueError("Dirichlet-Stichproben erfordern mindestens zwei Parameter")
+    total = baseline.sum()
+    alpha = np.ones(len(baseline)) if konzentration == 1.0 else konzentration * baseline / total * len(baseline)
+    return rng.dirichlet(alpha, size=n) * total
+
+
+def sample_parameters(baseline, method="dirichlet", n=10_000, lo=None, hi=None, steps=10, seed=0, konzentration=1.0):
+    """
+    Parameter-Stichproben (Stichproben x Parameter). Ohne Angabe gilt der
+    Wertebereich 0 bis zum Doppelten des Standardwerts je Parameter.
+    """
+    baseline = np.asarray(baseline, dtype=float)
+    lo = np.zeros(len(baseline)) if lo is None else np.broadcast_to(np.asarray(lo, dtype=float), baseline.shape)
+    hi = 2 * baseline if hi is None else np.broadcast_to(np.asarray(hi, dtype=float), baseline.shape)
+    rng = np.random.default_rng(seed)
+    if method == "dirichlet":
+        return sample_dirichlet(baseline, n, rng, konzentration)
+    if method == "lhs":
+        return sample_lhs(lo, hi, n, rng)
+    if method == "grid":
+        return sample_grid(lo, hi, steps)
+    raise ValueError(f"Unbekannte Methode '{method}' (erlaubt: {', '.join(METHODS)})")
+
+
+def default_method(target):
+    """Dirichlet für die Gewichte des Hunter-Index, Latin Hypercube für die einzelnen Faktoren."""
+    return "dirichlet" if target == "Hunter_Index" else "lhs"
+
+
+# ==========================================
+# RANGSTABILITÄT
+# ==========================================
+def sort_order(values):
+    """
+    Stabile Sortierreihenfolge entlang der letzten Achse und die Maske gleicher
+    Nachbarn der sortierten Werte. Ohne Gleichstände (der Regelfall bei
+    stetigen Scores) wird das schnellere, nicht stabile Standardverfahren
+    verwendet; die Reihenfolge ist dann identisch.
+    """
+    ordered = np.sort(values, axis=-1)
+    same = ordered[..., 1:] == ordered[..., :-1]
+    return np.argsort(values, axis=-1, kind="stable" if same.any() else None), same
+
+
+def ranks_of(scores):
+    """Rang je Stichprobe (Zeile) und Region (Spalte), 1 = höchster Score; bei Gleichstand gilt die Position."""
+    order, _ = sort_order(-scores)
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, scores.shape[-1] + 1)[None, :], axis=-1)
+    return ranks
+
+
+def tie_pairs(same):
+    """Anzahl gleicher Paare je Zeile aus der Maske 'same' (benachbarte Elemente einer sortierten Folge gleich)."""
+    idx = np.arange(same.shape[-1] + 1)
+    starts = np.where(np.concatenate([np.zeros(same.shape[:-1] + (1,), dtype=bool), same], axis=-1), 0, idx)
+    return (idx - np.maximum.accumulate(starts, axis=-1)).sum(axis=-1)
+
+
+def key_inversions(keys):
+    """
+    Anzahl der Fehlstellungen (i < j mit keys[i] > keys[j]) je Zeile einer
+    Permutation von 0 bis n - 1. Ein Paar ist am höchsten Bit entschieden, in
+    dem sich die Schlüssel unterscheiden. Je Bit werden die höheren Bits
+    (Präfix), die Position und der Schlüssel in eine Ganzzahl gepackt und
+    einmal sortiert: Jede Präfix-Gruppe liegt danach zusammenhängend und nach
+    Position geordnet vor, je zur Hälfte mit gesetztem Bit. Die Paare
+    'gesetzt vor nicht gesetzt' folgen aus der Positionssumme der gesetzten
+    Bits (ein Matrix-Vektor-Produkt je Bit).
+    """
+    m, n = keys.shape
+    size = 1 << max(n - 1, 0).bit_length()
+    levels = size.bit_length() - 1
+    count = np.zeros(m, dtype=np.int64)
+    if levels == 0:
+        return count
+    dtype = np.uint32 if 3 * levels <= 32 else np.uint64
+    keys = keys.astype(dtype)
+    if size > n:
+        # Auffüllen mit größeren Schlüsseln am Ende (keine zusätzlichen Fehlstellungen)
+        keys = np.concatenate([keys, np.broadcast_to(np.arange(n, size, dtype=dtype), (m, size - n))], axis=1)
+    packed = (keys << dtype(2 * levels)) | (np.arange(size, dtype=dtype) << dtype(levels)) | keys
+    exact = np.float32 if size <= 4096 else np.float64  # Positionssummen ganzzahlig exakt
+    for bit in range(levels - 1, -1, -1):
+        group = 2 << bit
+        if group == size:
+            ordered = packed  # eine Gruppe: Reihenfolge der Positionen
+        else:
+            mask = np.iinfo(dtype).max ^ (((1 << (bit + 1)) - 1) << (2 * levels))
+            ordered = np.sort(packed & dtype(mask), axis=-1)
+        is_set = ((ordered >> dtype(bit)) & dtype(1)).astype(exact)
+        positions = np.tile(np.arange(group, dtype=exact), size // group)
+        half = group // 2
+        count += (size // group) * (group * (group - 1) // 2 - half * (half - 1) // 2)
+        count -= (is_set @ positions).astype(np.int64)
+    return count
+
+
+def inversions(values):
+    """Anzahl der Fehlstellungen (i < j mit values[i] > values[j]) je Zeile."""
+    # Die Sortierreihenfolge ist die inverse Permutation der Ränge (gleich viele Fehlstellungen)
+    return key_inversions(np.argsort(values, axis=-1, kind="stable"))
+
+
+def kendall_tau(scores, baseline):
+    """
+    Kendalls Tau (Tau-a) jeder Stichprobe (Spalte von 'scores') gegenüber
+    'baseline'. Sortierbasiert (Verfahren nach Knight) statt über alle
+    Regionspaare: Speicherbedarf linear in der Anzahl der Regionen.
+    """
+    n = len(baseline)
+    total = n * (n - 1) / 2
+    if total == 0:
+        return np.full(scores.shape[1], np.nan)
+    x = np.asarray(baseline, dtype=float)
+    x_order = np.argsort(x, kind="stable")
+    same_x = x[x_order][1:] == x[x_order][:-1]
+    x_ties = tie_pairs(same_x)
+
+    # Stichprobe in Basis-Reihenfolge; gleiche Stichprobenwerte bleiben nach Position (stabil) geordnet
+    y = np.asarray(scores, dtype=float).T[:, x_order]  # Stichproben x Regionen
+    order, same_y = sort_order(y)
+    y_ties = tie_pairs(same_y) if same_y.any() else 0
+    joint_ties = 0
+    if x_ties:
+        # Basis-Gleichstände: diskordant sind Paare mit echt größerer Basis-Gruppe bei kleinerem
+        # Stichprobenwert, d. h. echte Fehlstellungen der Gruppennummern in Stichproben-Reihenfolge
+        groups = np.concatenate([[0], np.cumsum(~same_x)]).astype(np.min_scalar_type(n))[order]
+        if same_y.any():
+            joint_ties = tie_pairs(same_y & (groups[:, 1:] == groups[:, :-1]))
+        order = np.argsort(groups, axis=-1, kind="stable")
+    discordant = key_inversions(order)  # Fehlstellungen der Permutation = die ihrer Inversen
+    return (total - x_ties - y_ties + joint_ties - 2 * discordant) / total
+
+
+def sample_scores(offset, features, samples, chunk_size):
+    """Scores (Stichproben x Regionen) blockweise über die Stichproben: (Startindex, Scores)."""
+    for start in range(0, len(samples), chunk_size):
+        scores = samples[start:start + chunk_size] @ features.T
+        scores += offset
+        yield start, scores
+
+
+def region_counts(values, n_values, mask=None):
+    """
+    Häufigkeit je Region (Spalte von 'values') und Wert 0 <= v < n_values über
+    np.bincount der flachen Indizes; mit 'mask' nur die markierten Einträge.
+    """
+    n_regions = values.shape[1]
+    flat = np.arange(n_regions) * n_values + values
+    flat = flat[mask] if mask is not None else flat.ravel()
+    return np.bincount(flat, minlength=n_regions * n_values).reshape(n_regions, n_values)
+
+
+def rank_stability(df, target="Hunter_Index", samples=None, top_n=config.TOP_N, blacklist=config.BLACKLIST,
+                   kennziffern=None, namen=None, chunk_size=None, **sampling):
+    """
+    Rangstabilität der Regionen einer Gruppe unter variierenden Parametern.
+
+    'samples' sind Parameter-Stichproben (Stichproben x Parameter); ohne Angabe
+    werden sie mit sample_parameters(**sampling) erzeugt. Die Stichproben
+    werden in Blöcken zu 'chunk_size' bewertet (Standard: CHUNK_ELEMENTS /
+    Anzahl der Regionen). Rückgabe: Tabelle je Region (sortiert nach
+    Basis-Rang) und Kendalls Tau je Stichprobe.
+    """
+    pool = df[selection_mask(df, blacklist, kennziffern, namen)]
+    offset, features, names, baseline = TARGETS[target](pool)
+    if samples is None:
+        sampling.setdefault("method", default_method(target))
+        samples = sample_parameters(baseline, **sampling)
+    samples = np.atleast_2d(np.asarray(samples, dtype=float))
+    if samples.shape[1] != len(names):
+        raise ValueError(f"Stichproben für '{target}' benötigen {len(names)} Parameter ({', '.join(names)})")
+
+    n_regions = len(pool)
+    if chunk_size is None:
+        chunk_size = max(1, CHUNK_ELEMENTS // max(n_regions, 1))
+    base_scores = offset + features @ baseline
+    base_ranks = ranks_of(base_scores[None, :])[0]
+
+    # Erster Durchlauf: Tau je Stichprobe, Top-N-Zähler, Extremwerte und grobes Histogramm (Rangklassen)
+    n_samples = len(samples)
+    width = max(1, -(-n_regions // RANK_BINS))
+    n_bins = max(1, -(-n_regions // width))
+    coarse = np.zeros((n_regions, n_bins), dtype=np.int64)
+    in_top = np.zeros(n_regions, dtype=np.int64)
+    rang_min = np.full(n_regions, n_regions, dtype=np.int64)
+    rang_max = np.zeros(n_regions, dtype=np.int64)
+    taus = np.empty(n_samples)
+    for start, scores in sample_scores(offset, features, samples, chunk_size):
+        ranks = ranks_of(scores)
+        coarse += region_counts((ranks - 1) // width, n_bins)
+        in_top += (ranks <= top_n).sum(axis=0)
+        np.minimum(rang_min, ranks.min(axis=0, initial=n_regions), out=rang_min)
+        np.maximum(rang_max, ranks.max(axis=0, initial=0), out=rang_max)
+        taus[start:start + len(scores)] = kendall_tau(scores.T, base_scores)
+
+    # Rangklasse je Quantil; bei breiteren Klassen zweiter Durchlauf innerhalb der Klasse
+    cumulative = coarse.cumsum(axis=1)
+    bins = {col: (cumulative / n_samples >= q).argmax(axis=1) for col, q in RANK_QUANTILES.items()}
+    quantiles = {col: b + 1 for col, b in bins.items()}
+    if width > 1 and n_samples:
+        fine = {col: np.zeros((n_regions, width), dtype=np.int64) for col in bins}
+        for _, scores in sample_scores(offset, features, samples, chunk_size):
+            ranks = ranks_of(scores) - 1
+            for col, b in bins.items():
+                offset_in_bin = ranks - b * width
+                fine[col] += region_counts(offset_in_bin, width, (offset_in_bin >= 0) & (offset_in_bin < width))
+        for col, q in RANK_QUANTILES.items():
+            b = bins[col]
+            below = np.take_along_axis(cumulative - coarse, b[:, None], axis=1)
+            inner = ((below + fine[col].cumsum(axis=1)) / n_samples >= q).argmax(axis=1)
+            quantiles[col] = b * width + inner + 1
+
+    table = pd.DataFrame({
+        "Kennziffer": pool["Kennziffer"].to_numpy(),
+        "Name": pool["Name"].to_numpy(),
+        "Rang_Basis": base_ranks,
+        f"P_Top_{top_n}": in_top / n_samples,
+        "Rang_Min": rang_min,
+        "Rang_P05": quantiles["Rang_P05"],
+        "Rang_Median": quantiles["Rang_Median"],
+        "Rang_P95": quantiles["Rang_P95"],
+        "Rang_Max": rang_max,
+    })
+    return table.sort_values("Rang_Basis").reset_index(drop=True), taus
@@ -0,0 +1,223 @@
+"""
+Out-of-core-Verarbeitung großer INKAR-Extrakte (z. B. bundesweit, alle Jahre).
+
+Der Long-Extrakt wird nie vollständig geladen:
+
+1. Würfel (stream_cube): zwei Durchläufe über die Datei in Blöcken
+   (Arrow RecordBatches). Der erste ermittelt Regionen, Indikatoren und Jahre,
+   der zweite summiert die Werte je Zelle (Region, Indikator, Jahr) direkt in
+   den dichten Würfel. Im Speicher liegen nur der Würfel und ein Block.
+2. Scoring (stream_scores): zwei Durchläufe über Regionsblöcke des Würfels.
+   Der erste baut je normalisierter Spalte eine Quantil-Skizze auf (Extremwerte,
+   Quantile, Momente; siehe normalization.py), der zweite berechnet damit
+   S_*, Cat_*, Score_* und die Indizes je Block und schreibt sie direkt in eine
+   Parquet-Datei.
+
+Die Ergebnisse entsprechen denen der speicherresidenten Pipeline
+(cube.IndicatorCube.from_long bzw. ScoringPipeline.run).
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from supplyscore import kernel, scoring
+from supplyscore.cube import IndicatorCube
+from supplyscore.data import BATCH_SIZE, INKAR_PATH, iter_inkar_batches
+from supplyscore.normalization import Normalizer
+from supplyscore.regions import RegionIndex
+
+# Regionen je Block beim Scoring
+CHUNK_REGIONS = 100_000
+
+
+class InkarBatches:
+    """Wiederholt lesbare Blockfolge eines INKAR-Extrakts (Filter und Projektion wie load_inkar)."""
+
+    def __init__(self, path=INKAR_PATH, indikatoren=None, zeitbezug=None, nordbayern=True, batch_size=BATCH_SIZE):
+        self.path = path
+        self.indikatoren = indikatoren
+        self.zeitbezug = zeitbezug
+        self.nordbayern = nordbayern
+        self.batch_size = batch_size
+
+    def __iter__(self):
+        return iter_inkar_batches(self.path, self.indikatoren, self.zeitbezug, self.nordbayern, self.batch_size)
+
+
+# ==========================================
+# WÜRFEL
+# ==========================================
+def encode(column):
+    """Dictionary-Kodierung einer Block-Spalte: (Codes je Zeile, eindeutige Werte als Zeichenketten)."""
+    encoded = pc.dictionary_encode(column)
+    return encoded.indices.to_numpy(zero_copy_only=False), encoded.dictionary.to_numpy(zero_copy_only=False).astype(str)
+
+
+def scan_dimensions(batches):
+    """Erster Durchlauf: Regionen (mit Namen), Indikatoren und Jahre, jeweils sortiert."""
+    names, indikatoren, years = {}, set(), set()
+    for batch in batches:
+        codes, kennziffern = encode(batch.column("Kennziffer"))
+        # Letzter Name je Kennziffer im Block (wie drop_duplicates(keep="last"))
+        uniq, first_rev = np.unique(codes[::-1], return_index=True)
+        last = len(codes) - 1 - first_rev
+        namen = batch.column("Name").take(pa.array(last)).to_numpy(zero_copy_only=False).astype(str)
+        names.update(zip(kennziffern[uniq], namen))
+        indikatoren.update(encode(batch.column("Indikator"))[1])
+        years.update(encode(batch.column("Zeitbezug"))[1])
+    regions = sorted(names)
+    return regions, [names[r] for r in regions], sorted(indikatoren), sorted(years)
+
+
+def stream_cube(batches):
+    """
+    Baut den Indikator-Würfel blockweise auf (zwei Durchläufe über 'batches').
+    Mehrfache Einträge je Zelle werden wie bei IndicatorCube.from_long gemittelt.
+    """
+    regions, names, indikatoren, years = scan_dimensions(batches)
+    r_index, i_index, y_index = pd.Index(regions), pd.Index(indikatoren), pd.Index(years)
+    n_r, n_i, n_y = len(regions), len(indikatoren), len(years)
+
+    sums = np.zeros(n_r * n_i * n_y)
+    counts = np.zeros(n_r * n_i * n_y, dtype=np.int32)
+    for batch in batches:
+        wert = batch.column("Wert").to_numpy(zero_copy_only=False).astype("float64")
+        valid = ~np.isnan(wert)
+        # Nur die Wörterbücher der Blockspalten werden auf die Würfelachsen abgebildet
+        codes = []
+        for index, col in ((r_index, "Kennziffer"), (i_index, "Indikator"), (y_index, "Zeitbezug")):
+            local, values = encode(batch.column(col))
+            codes.append(index.get_indexer(values)[local[valid]])
+        flat = (codes[0].astype(np.int64) * n_i + codes[1]) * n_y + codes[2]
+
+        # Nur die im Block belegten Zellen aktualisieren
+        cells, inverse = np.unique(flat, return_inverse=True)
+        sums[cells] += np.bincount(inverse, weights=wert[valid], minlength=len(cells))
+        counts[cells] += np.bincount(inverse, minlength=len(cells)).astype(np.int32)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        np.divide(sums, counts, out=sums)
+    sums[counts == 0] = np.nan
+    return IndicatorCube(sums.reshape(n_r, n_i, n_y), regions, names, indikatoren, years)
+
+
+# ==========================================
+# SCORING IN REGIONSBLÖCKEN
+# ==========================================
+class StreamingScorer:
+    """
+    Zwei-Pass-Scoring über Regionsblöcke eines Würfels. Die Spaltenauswahl und
+    Regionsmenge entsprechen scoring.pivot_trend (Regionen mit Werten im
+    aktuellen und im Vergleichsjahr), die Normalisierung verwendet Skizzen
+    über alle Blöcke.
+    """
+
+    def __init__(self, cube, params, einwohner, filialen, chunk_regions=CHUNK_REGIONS):
+        self.cube = cube
+        self.params = params
+        self.chunk_regions = chunk_regions
+        self.latest_year, self.past_year = scoring.resolve_years(cube.years, params.latest_year, params.past_year)
+        self.now = cube.year_slice(self.latest_year)
+        self.old = cube.year_slice(self.past_year)
+
+        # Regionen und Spalten wie beim Querschnitt mit anschließendem Merge
+        self.rows = np.flatnonzero(~np.isnan(self.now).all(axis=1) & ~np.isnan(self.old).all(axis=1))
+        self.now_ind = ~np.isnan(self.now).all(axis=0)
+        self.old_ind = ~np.isnan(self.old).all(axis=0)
+        self.now_cols = list(cube.indikatoren[self.now_ind])
+        self.old_cols = [f"{c}_OLD" if c in self.now_cols else c for c in cube.indikatoren[self.old_ind]]
+        trend = params.trend_indikator
+        self.growth = (cube.growth(trend, self.past_year, self.latest_year)
+                       if trend in self.now_cols and f"{trend}_OLD" in self.old_cols else None)
+
+        self.s_sources = [c for c in params.indikatoren if c in self.now_cols + self.old_cols]
+        self.s_invert = np.array([c in params.invertiert for c in self.s_sources], dtype=bool)
+        self.membership = kernel.category_matrix(self.s_sources, dict(params.kategorien))
+        self.sub_sources = [source for source, _ in scoring.SUB_SCORES.values()]
+        self.sub_invert = np.array([invert for _, invert in scoring.SUB_SCORES.values()], dtype=bool)
+
+        # Referenzdaten für alle bewerteten Regionen (ein Wert je Region)
+        kz = pd.Series(cube.regions[self.rows], name="Kennziffer")
+        regions = RegionIndex(pd.DataFrame({"Kennziffer": kz, "Name": cube.names[self.rows]}))
+        self.einwohner = np.asarray(regions.lookup(kz, einwohner, params.default_einwohner), dtype=float)
+        self.filialen = np.asarray(regions.lookup(kz, filialen, params.default_filialen), dtype=float)
+
+    def chunks(self):
+        """Positionen (innerhalb von self.rows) je Regionsblock."""
+        for start in range(0, len(self.rows), self.chunk_regions):
+            yield np.arange(start, min(start + self.chunk_regions, len(self.rows)))
+
+    def frame(self, pos):
+        """Querschnitt eines Regionsblocks mit Rohwerten, Wachstum, Referenzdaten und KPIs."""
+        rows = self.rows[pos]
+        df = pd.DataFrame(self.now[rows][:, self.now_ind], columns=self.now_cols)
+        df.insert(0, "Name", self.cube.names[rows])
+        df.insert(0, "Kennziffer", self.cube.regions[rows])
+        old = pd.DataFrame(self.old[rows][:, self.old_ind], columns=self.old_cols)
+        df = pd.concat([df, old], axis=1)
+        df["Wachstum_Prozent"] = self.growth[rows] if self.growth is not None else 0
+        df = df.fillna(0)
+        df["Einwohner"] = self.einwohner[pos]
+        df["Filialen"] = self.filialen[pos]
+        return scoring.derive_kpis(df)
+
+    def fit(self):
+        """
+        Erster Durchlauf: Skizzen (Extremwerte, Quantile, Momente) der
+        Indikatoren und der Quellspalten der Sub-Scores, blockweise
+        zusammengeführt.
+        """
+        params = self.params
+        indicators = Normalizer(params.normalisierung, self.s_invert, params.winsor_quantile)
+        subs = Normalizer(params.normalisierung, self.sub_invert, params.winsor_quantile)
+        for pos in self.chunks():
+            df = self.frame(pos)
+            indicators.partial_fit(df[self.s_sources].to_numpy(dtype=float))
+            subs.partial_fit(df[self.sub_sources].to_numpy(dtype=float))
+        return indicators, subs
+
+    def score(self, pos, indicators, subs):
+        """Ergebnistabelle eines Regionsblocks (Spalten wie ScoringPipeline.run)."""
+        df = self.frame(pos)
+        S = indicators.transform(df[self.s_sources].to_numpy(dtype=float))
+        cats = kernel.category_means(S, self.membership)
+        sub = subs.transform(df[self.sub_sources].to_numpy(dtype=float))
+
+        kpis = df[["Einwohner", "Filialen", "Versorgung", "Marktvolumen_Mio", "Risiko", "Dichte"]]
+        df = df.drop(columns=kpis.columns)
+        scoring.assign_columns(df, [f"S_{c}" for c in self.s_sources], S)
+        scoring.assign_columns(df, list(dict(self.params.kategorien)), cats)
+        df = pd.concat([df, kpis], axis=1)
+        scoring.assign_columns(df, list(scoring.SUB_SCORES), sub)
+        return scoring.combine_indices(df, dict(self.params.gewichte), self.params.straf_faktor,
+                                       dict(self.params.kategorien))
+
+    def write(self, path):
+        """Zweiter Durchlauf: schreibt die Ergebnistabelle blockweise nach 'path' (Parquet)."""
+        indicators, subs = self.fit()
+        rows, writer = 0, None
+        try:
+            for pos in self.chunks():
+                table = pa.Table.from_pandas(self.score(pos, indicators, subs), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+                writer.write_table(table)
+                rows += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+
+def stream_scores(pipeline, path, params=None, chunk_regions=CHUNK_REGIONS):
+    """
+    Berechnet die Ergebnistabelle einer Pipeline in Regionsblöcken und schreibt
+    sie nach 'path'. Rückgabe: Anzahl der Regionen.
+    """
+    params = pipeline.params if params is None else params
+    einwohner, filialen = pipeline.reference_data(params)
+    scorer = StreamingScorer(pipeline.stage("cube", params), params, einwohner, filialen, chunk_regions)
+    return scorer.write(path)
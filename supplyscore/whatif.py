@@ -0,0 +1,264 @@
+"""
+Was-wäre-wenn-Abfragen auf einem warm gehaltenen Scoring-Modell.
+
+Das Modell hält die Ergebnistabelle eines Laufs, die Extremwerte der
+Quellspalten der Sub-Scores und deren Sortierreihenfolge im Speicher. Eine
+Abfrage überlagert Änderungen der Filialen bzw. Einwohner einzelner Regionen
+(z. B. 'Filiale in X schließt': -1, 'Y erhält zwei neue Filialen': +2), ohne die
+Basis zu verändern, und liefert Versorgung, Dichte, Sub-Scores, Hunter-Index,
+Index_Nachher und Rang aller Regionen.
+
+Neu normalisiert wird nur eine Spalte, deren Minimum oder Maximum sich durch
+die Überlagerung verschiebt; die Extremwerte ohne die geänderten Regionen
+werden über die vorab sortierten Basiswerte in O(Änderungen) bestimmt. Sonst
+werden nur die geänderten Regionen neu bewertet. Kategorien und Index_Vorher
+hängen nicht von Filialen und Einwohnern ab und bleiben unverändert.
+
+Beispiel:
+    model = WhatIfModel.from_pipeline(ScoringPipeline())
+    result = model.query(filialen={"Bamberg": -1}, einwohner={"09564000": 5000})
+    result["ergebnis"].head(8)
+
+Über HTTP (python -m supplyscore serve):
+    POST /szenario  {"filialen": {"Bamberg": -1}, "einwohner": {}, "top": 8}
+"""
+
+import json
+import numbers
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from supplyscore import config, kernel, scoring
+from supplyscore.regions import RegionIndex
+from supplyscore.selection import selection_mask
+
+# Spalten der Abfrageergebnisse
+RESULT_COLUMNS = ["Einwohner", "Filialen", "Versorgung", "Dichte", "Score_Hunger", "Score_Geld", "Score_Penalty",
+                  "Hunter_Index", "Index_Nachher"]
+
+# Filialen, Einwohner und die davon abhängigen Größen (vgl. scoring.derive_kpis)
+KPI_COLUMNS = ["Einwohner", "Filialen", "Versorgung", "Marktvolumen_Mio", "Dichte"]
+
+
+def ranks(values, mask):
+    """Rang (1 = höchster Wert) der Zeilen mit mask=True; Gleichstand nach Position, sonst 0."""
+    candidates = np.flatnonzero(mask)
+    scores = np.where(np.isnan(values[candidates]), -np.inf, values[candidates])
+    order = candidates[np.lexsort((candidates, -scores))]
+    out = np.zeros(len(values), dtype=int)
+    out[order] = np.arange(1, len(order) + 1)
+    return out
+
+
+class SortedColumn:
+    """Basiswerte einer Spalte mit Sortierreihenfolge für Extremwerte unter Ausschluss einzelner Zeilen."""
+
+    def __init__(self, values):
+        self.values = values
+        self.order = np.argsort(values, kind="stable")
+        self.n_valid = int((~np.isnan(values)).sum())  # NaN steht am Ende
+
+    def extrema_without(self, excluded):
+        """Minimum und Maximum der Basiswerte ohne die Zeilen 'excluded' (NaN, falls keine übrig)."""
+        lo = next((self.values[i] for i in self.order[:self.n_valid] if i not in excluded), np.nan)
+        hi = next((self.values[i] for i in self.order[self.n_valid - 1::-1] if i not in excluded), np.nan)
+        return lo, hi
+
+
+class WhatIfModel:
+    """Warm gehaltenes Scoring-Modell für Szenarien mit geänderten Filialen und Einwohnern."""
+
+    def __init__(self, table, gewichte=None, straf_faktor=config.STRAF_FAKTOR, blacklist=config.BLACKLIST,
+                 sort_by="Index_Nachher", kategorien=None):
+        self.table = table
+        self.gewichte = dict(config.HUNTER_GEWICHTE if gewichte is None else gewichte)
+        self.straf_faktor = straf_faktor
+        self.sort_by = sort_by
+        self.kennziffern = table["Kennziffer"].astype(str).to_numpy()
+        self.regions = RegionIndex(table)
+        self.mask = selection_mask(table, blacklist)
+
+        self.kpis = {col: table[col].to_numpy(dtype=float) for col in KPI_COLUMNS}
+        self.sub_scores = list(scoring.SUB_SCORES)
+        self.sub = table[self.sub_scores].to_numpy(dtype=float)
+        self.weights = np.array([float(self.gewichte.get(c, 0.0)) for c in self.sub_scores])
+        self.cats = table[list(config.KATEGORIEN if kategorien is None else kategorien)].to_numpy(dtype=float)
+        self.indices = table[list(kernel.ScoringKernel.INDEX_COLUMNS)].to_numpy(dtype=float)
+
+        # Nur Sub-Scores, deren Quelle von Filialen/Einwohnern abhängt
+        self.columns = {target: (source, invert) for target, (source, invert) in scoring.SUB_SCORES.items()
+                        if source in KPI_COLUMNS}
+        self.sorted = {source: SortedColumn(self.kpis[source])
+                       for source, _ in self.columns.values()}
+        self.extrema = {source: kernel.extrema(col.values[:, None]) for source, col in self.sorted.items()}
+        self.base_ranks = ranks(self._index(self.sort_by, self.indices), self.mask)
+        self._positions = {}
+
+    @classmethod
+    def from_pipeline(cls, pipeline, **kwargs):
+        """Modell aus der Ergebnistabelle einer Pipeline (Gewichte und straf_faktor aus deren Parametern)."""
+        params = pipeline.params
+        if params.normalisierung != "minmax":
+            raise ValueError(f"Was-wäre-wenn-Abfragen setzen Min-Max-Normalisierung voraus "
+                             f"(Pipeline: '{params.normalisierung}')")
+        return cls(pipeline.run(), gewichte=dict(params.gewichte), straf_faktor=params.straf_faktor,
+                   kategorien=dict(params.kategorien), **kwargs)
+
+    # ------------------------------------------
+    # Hilfsfunktionen
+    # ------------------------------------------
+    def position(self, key):
+        """Zeile einer Region (Kennziffer oder Name, Auflösung wie bei den Referenzdaten)."""
+        if key not in self._positions:
+            kz, reason = self.regions.resolve_key(key)
+            if kz is None:
+                raise ValueError(f"Region '{key}': {reason}")
+            self._positions[key] = int(np.flatnonzero(self.kennziffern == kz)[0])
+        return self._positions[key]
+
+    def _deltas(self, filialen, einwohner):
+        """Zeilen und Änderungen (Filialen, Einwohner) der betroffenen Regionen."""
+        deltas = {}
+        for i, (label, changes) in enumerate((("filialen", filialen), ("einwohner", einwohner))):
+            changes = {} if changes is None else changes
+            if not isinstance(changes, dict):
+                raise ValueError(f"'{label}' erwartet Änderungen der Form {{Region: Differenz}}")
+            for key, delta in changes.items():
+                if isinstance(delta, bool) or not isinstance(delta, numbers.Real) or not np.isfinite(delta):
+                    raise ValueError(f"'{label}': Differenz für Region '{key}' ist keine Zahl")
+                deltas.setdefault(self.position(key), [0.0, 0.0])[i] += float(delta)
+        pos = np.array(sorted(deltas), dtype=int)
+        d = np.array([deltas[p] for p in pos]).reshape(-1, 2)
+        return pos, d[:, 0], d[:, 1]
+
+    def _index(self, name, indices):
+        """Sortierspalte 'name' (Index des Szenarios bzw. unveränderte Spalte der Basis)."""
+        columns = list(kernel.ScoringKernel.INDEX_COLUMNS)
+        return indices[:, columns.index(name)] if name in columns else self.table[name].to_numpy(dtype=float)
+
+    # ------------------------------------------
+    # Abfrage
+    # ------------------------------------------
+    def query(self, filialen=None, einwohner=None):
+        """
+        Szenario mit Änderungen {Region: Differenz} der Filialen bzw. Einwohner.
+        Rückgabe: Bericht mit geänderten Regionen, neu normalisierten Spalten,
+        Laufzeit und der Ergebnistabelle aller Regionen (nach Rang sortiert).
+        """
+        start = time.perf_counter()
+        pos, d_fil, d_ew = self._deltas(filialen, einwohner)
+        rows = self.table.iloc[pos].assign(Einwohner=self.kpis["Einwohner"][pos] + d_ew,
+                                           Filialen=self.kpis["Filialen"][pos] + d_fil)
+        if (rows["Filialen"] < 1).any() or (rows["Einwohner"] <= 0).any():
+            raise ValueError("Szenario ergibt Regionen ohne Filialen bzw. Einwohner")
+        scoring.derive_kpis(rows)
+        kpis = {}
+        for col, values in self.kpis.items():
+            kpis[col] = values.copy()
+            kpis[col][pos] = rows[col].to_numpy(dtype=float)
+
+        # Sub-Scores: Spalten mit verschobenen Extremwerten vollständig, sonst nur die geänderten Zeilen
+        sub = self.sub.copy()
+        excluded = set(pos.tolist())
+        renormalized = []
+        for target, (source, invert) in self.columns.items():
+            j = self.sub_scores.index(target)
+            new = kpis[source][pos]
+            lo, hi = self.sorted[source].extrema_without(excluded)
+            lo, hi = np.fmin(lo, np.nanmin(new, initial=np.inf)), np.fmax(hi, np.nanmax(new, initial=-np.inf))
+            base_lo, base_hi = self.extrema[source]
+            if lo == base_lo[0] and hi == base_hi[0]:
+                sub[pos, j] = kernel.min_max(new[:, None], [invert], lo=base_lo, hi=base_hi)[:, 0]
+            else:
+                sub[:, j] = kernel.min_max(kpis[source][:, None], [invert], lo=np.array([lo]), hi=np.array([hi]))[:, 0]
+                renormalized.append(target)
+
+        # Indizes nur für Regionen mit geänderten Sub-Scores
+        indices = self.indices.copy()
+        touched = slice(None) if renormalized else pos
+        indices[touched] = kernel.composite_indices(sub[touched], self.weights, self.cats[touched],
+                                                    sub[touched, self.sub_scores.index("Score_Penalty")],
+                                                    self.straf_faktor)
+        result = self.result(kpis, sub, indices)
+        return {
+            "regionen": list(self.kennziffern[pos]),
+            "normalisiert": renormalized,
+            "neu_berechnet": len(self.table) if renormalized else len(pos),
+            "laufzeit_ms": (time.perf_counter() - start) * 1000,
+            "ergebnis": result,
+        }
+
+    def result(self, kpis=None, sub=None, indices=None):
+        """Ergebnistabelle (Basis bzw. Szenario) nach Rang, mit Rangänderung gegenüber der Basis."""
+        kpis = self.kpis if kpis is None else kpis
+        sub = self.sub if sub is None else sub
+        indices = self.indices if indices is None else indices
+        columns = dict(kpis)
+        columns.update({c: sub[:, j] for j, c in enumerate(self.sub_scores)})
+        columns.update({c: indices[:, j] for j, c in enumerate(kernel.ScoringKernel.INDEX_COLUMNS)})
+        rang = ranks(self._index(self.sort_by, indices), self.mask)
+        df = self.table[["Kennziffer", "Name"]].assign(**{c: columns[c] for c in RESULT_COLUMNS}, Rang=rang,
+                                                        Rang_Aenderung=np.where(rang > 0, self.base_ranks - rang, 0))
+        return df.iloc[np.lexsort((np.arange(len(df)), np.where(rang > 0, rang, len(df) + 1)))]
+
+
+# ==========================================
+# HTTP-DIENST
+# ==========================================
+def check_request(request):
+    """Prüft den Rumpf einer Szenario-Anfrage; Rückgabe: Anzahl 'top' der gelieferten Regionen (None = alle)."""
+    if not isinstance(request, dict):
+        raise ValueError("Anfrage erwartet ein JSON-Objekt")
+    unknown = set(request) - {"filialen", "einwohner", "top"}
+    if unknown:
+        raise ValueError(f"Unbekannte Felder: {', '.join(sorted(unknown))}")
+    top = request.get("top")
+    if top is not None and (isinstance(top, bool) or not isinstance(top, int) or top < 0):
+        raise ValueError("'top' erwartet eine nicht negative ganze Zahl")
+    return top
+
+
+def make_handler(model):
+    """Request-Handler mit JSON-Schnittstelle für ein Modell (GET /basis, POST /szenario)."""
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip("/") != "/basis":
+                return self._send(404, {"fehler": "unbekannter Pfad"})
+            self._send(200, {"ergebnis": model.result().to_dict(orient="records")})
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/szenario":
+                return self._send(404, {"fehler": "unbekannter Pfad"})
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                top = check_request(request)
+                report = model.query(request.get("filialen"), request.get("einwohner"))
+            except (ValueError, TypeError) as e:
+                return self._send(400, {"fehler": str(e)})
+            ergebnis = report.pop("ergebnis")
+            report["ergebnis"] = (ergebnis if top is None else ergebnis.head(top)).to_dict(orient="records")
+            self._send(200, report)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(model, host="127.0.0.1", port=8765):
+    """Startet den lokalen HTTP-Dienst (blockierend)."""
+    server = ThreadingHTTPServer((host, port), make_handler(model))
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
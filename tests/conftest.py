@@ -0,0 +1,39 @@
+"""Gemeinsame Fixtures: Pipeline über den im Repository enthaltenen INKAR-Extrakt."""
+
+from pathlib import Path
+
+import pytest
+
+from supplyscore import config
+from supplyscore.pipeline import ScoringPipeline
+from supplyscore.reference import REFERENZ_PATH, ReferenceStore
+
+ROOT = Path(__file__).resolve().parents[1]
+INKAR = ROOT / config.INKAR_PATH
+
+
+@pytest.fixture(scope="session")
+def reference():
+    return ReferenceStore(ROOT / REFERENZ_PATH)
+
+
+@pytest.fixture(scope="session")
+def pipeline(reference):
+    """Pipeline ohne persistenten Cache (Stufen werden je Testlauf einmal berechnet)."""
+    return ScoringPipeline(INKAR, reference=reference)
+
+
+@pytest.fixture()
+def count_stages(monkeypatch):
+    """Funktion(pipeline) -> Liste, in die jede tatsächlich berechnete Stufe eingetragen wird."""
+    def count(pipeline):
+        calls = []
+        compute = pipeline._compute
+
+        def counting_compute(stage, params, upstream):
+            calls.append(stage)
+            return compute(stage, params, upstream)
+
+        monkeypatch.setattr(pipeline, "_compute", counting_compute)
+        return calls
+    return count
@@ -0,0 +1,63 @@
+"""Batch-Berichte: Ergebnistabelle je Gruppe gegenüber der Top-N-Auswahl, Abdeckung der Referenzdaten."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from supplyscore import config
+from supplyscore.batch import COVERAGE_FILE, RESULTS_FILE, group_dirnames, run_batch
+from supplyscore.reference import EINWOHNER, FILIALEN
+from supplyscore.selection import select_top
+
+GROUPS = [
+    {"name": "mittelfranken", "kennziffern": ["095"], "blacklist": ["Mittelfranken", "Nürnberg"], "top_n": 5},
+    {"name": "unterfranken", "kennziffern": ["096"]},
+]
+
+
+@pytest.fixture(scope="module")
+def outputs(pipeline, tmp_path_factory):
+    return run_batch(GROUPS, tmp_path_factory.mktemp("reports"), pipeline=pipeline, render=False)
+
+
+@pytest.mark.parametrize("group", GROUPS, ids=lambda g: g["name"])
+def test_ranks_follow_blacklist(pipeline, outputs, group):
+    table = pd.read_csv(outputs[group["name"]] / RESULTS_FILE, dtype={"Kennziffer": str})
+    blacklist = group.get("blacklist", config.BLACKLIST)
+    top = select_top(pipeline.run(), blacklist=blacklist, top_n=group.get("top_n", config.TOP_N),
+                     kennziffern=group["kennziffern"])
+
+    # alle Regionen der Gruppe, ausgeschlossene ohne Rang am Ende
+    assert table["Kennziffer"].str.startswith(group["kennziffern"][0]).all()
+    assert table["ausgeschlossen"].tolist() == table["Name"].isin(blacklist).tolist()
+    assert table.loc[table["ausgeschlossen"], "Rang"].isna().all()
+    ranked = table[~table["ausgeschlossen"]]
+    assert ranked["Rang"].tolist() == list(range(1, len(ranked) + 1))
+    assert not table["ausgeschlossen"].iloc[:len(ranked)].any()
+    # die ersten Ränge sind genau die Regionen der Abbildungen
+    assert ranked["Kennziffer"].head(len(top)).tolist() == top["Kennziffer"].tolist()
+
+
+@pytest.mark.parametrize("group", GROUPS, ids=lambda g: g["name"])
+def test_coverage_per_group(pipeline, outputs, group):
+    table = pd.read_csv(outputs[group["name"]] / RESULTS_FILE, dtype={"Kennziffer": str})
+    with open(outputs[group["name"]] / COVERAGE_FILE, encoding="utf-8") as f:
+        abdeckung = json.load(f)
+    full = pipeline.coverage()
+    for dataset in (EINWOHNER, FILIALEN):
+        info = abdeckung[dataset]
+        assert info["regionen"] == len(table) == info["abgedeckt"] + info["fallback"]
+        expected = set(full[dataset]["fallback_kennziffern"]) & set(table["Kennziffer"])
+        assert sorted(info["fallback_kennziffern"]) == sorted(expected)
+
+
+def test_colliding_dirnames_get_suffix(pipeline, tmp_path):
+    groups = [{"name": "Ober franken", "kennziffern": ["094"]}, {"name": "Ober/franken", "kennziffern": ["094"]},
+              {"name": "ober_franken", "kennziffern": ["094"]}, {"name": "Ober_franken_2", "kennziffern": ["094"]}]
+    assert list(group_dirnames(groups).values()) == ["Ober_franken", "Ober_franken_2", "ober_franken_3",
+                                                     "Ober_franken_2_2"]
+    outputs = run_batch(groups, tmp_path, pipeline=pipeline, render=False)
+    assert len(set(outputs.values())) == len(groups) and all((p / RESULTS_FILE).exists() for p in outputs.values())
+    with pytest.raises(ValueError, match="Doppelte Gruppennamen"):
+        group_dirnames(groups + groups[:1])
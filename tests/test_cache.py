@@ -0,0 +1,59 @@
+"""Persistenter Ergebnis-Cache: Ablage, Laden in einem neuen Lauf und Schlüssel je Eingabe."""
+
+import shutil
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from conftest import INKAR
+from supplyscore.cache import ResultCache
+from supplyscore.pipeline import ScoringPipeline
+
+
+def cached_pipeline(path, reference, cache, count_stages):
+    """Frische Pipeline mit Ergebnis-Cache; berechnete Stufen werden in 'calls' protokolliert."""
+    pipeline = ScoringPipeline(path, reference=reference, result_cache=cache)
+    pipeline.calls = count_stages(pipeline)
+    return pipeline
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    return ResultCache(tmp_path / "cache")
+
+
+def test_round_trip(pipeline, reference, cache, count_stages):
+    first = cached_pipeline(INKAR, reference, cache, count_stages)
+    result = first.run()
+    assert first.calls[-1] == "index"
+    pd.testing.assert_frame_equal(result, pipeline.run())
+
+    # neuer Lauf (eigener Prozess-Zustand): Tabelle aus dem Cache, keine Stufe wird berechnet
+    second = cached_pipeline(INKAR, reference, ResultCache(cache.root), count_stages)
+    pd.testing.assert_frame_equal(second.run(), result)
+    assert second.calls == []
+    pd.testing.assert_frame_equal(cache.latest(), result)
+
+    (key, entry), = cache.manifest().items()
+    assert key == first.result_key() and entry["zeilen"] == len(result)
+
+
+def test_keys_follow_inputs(reference, cache, count_stages, tmp_path):
+    path = tmp_path / "inkar.parquet"
+    shutil.copy(INKAR, path)
+    pipeline = cached_pipeline(path, reference, cache, count_stages)
+    pipeline.run()
+    strenger = pipeline.run(straf_faktor=0.5)
+    keys = list(cache.manifest())
+    assert len(keys) == 2
+    pd.testing.assert_frame_equal(cache.latest(), strenger)
+
+    # geänderter Inhalt der Eingabedatei: neuer Schlüssel, neue Berechnung
+    table = pq.read_table(path).to_pandas()
+    table.loc[table.index[0], "Wert"] += 1
+    table.to_parquet(path, index=False)
+    changed = cached_pipeline(path, reference, ResultCache(cache.root), count_stages)
+    changed.run()
+    assert changed.calls[-1] == "index"
+    assert list(cache.manifest()) == keys + [changed.result_key()]
@@ -0,0 +1,57 @@
+"""Datenimport: Filter und Spaltenauswahl werden an den Parquet-Reader durchgereicht."""
+
+import itertools
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from supplyscore.data import CATEGORICAL_COLUMNS, INKAR_COLUMNS, load_inkar
+
+REGIONS = [("09564000", "Nürnberg, Stadt", True), ("09461000", "Bamberg, Stadt", True),
+           ("09162000", "München, Landeshauptstadt", False)]
+INDIKATOREN = ["Einwohner", "Kaufkraft", "Arbeitslosenquote"]
+JAHRE = ["2019", "2020", "2021"]
+
+
+@pytest.fixture(scope="module")
+def path(tmp_path_factory):
+    """Kleiner Extrakt im Schema der INKAR-Datei, mit zusätzlichen Spalten, die nicht gelesen werden sollen."""
+    rows = list(itertools.product(REGIONS, INDIKATOREN, JAHRE))
+    table = pa.table({
+        "Kennziffer": [r[0] for r, _, _ in rows],
+        "Name": [r[1] for r, _, _ in rows],
+        "Nordbayern": [r[2] for r, _, _ in rows],
+        "Raumbezug": ["Kreise"] * len(rows),
+        "Zeitbezug": [j for _, _, j in rows],
+        "Indikator": [i for _, i, _ in rows],
+        "Bereich": ["Test"] * len(rows),
+        "Wert": [float(k) if k % 5 else None for k in range(len(rows))],
+    })
+    path = tmp_path_factory.mktemp("inkar") / "inkar.parquet"
+    pq.write_table(table, path, row_group_size=9)
+    return path
+
+
+def test_load_filters_and_projection(path):
+    df = load_inkar(path, indikatoren=["Kaufkraft", "Einwohner"], zeitbezug=[2020, 2021])
+    assert list(df.columns) == INKAR_COLUMNS
+    assert len(df) == 2 * 2 * 2
+    assert set(df["Kennziffer"]) == {"09564000", "09461000"}
+    assert set(df["Indikator"]) == {"Kaufkraft", "Einwohner"}
+    assert set(df["Zeitbezug"]) == {"2020", "2021"}
+
+    # Kategorien ohne Werte herausgefilterter Zeilen, 'Wert' als float64 mit NaN
+    for col in CATEGORICAL_COLUMNS:
+        assert isinstance(df[col].dtype, pd.CategoricalDtype), col
+        assert set(df[col].cat.categories) == set(df[col]), col
+    assert df["Wert"].dtype == "float64" and df["Wert"].isna().any()
+
+
+def test_load_without_filters(path):
+    df = load_inkar(path, nordbayern=None)
+    assert list(df.columns) == INKAR_COLUMNS
+    assert len(df) == len(REGIONS) * len(INDIKATOREN) * len(JAHRE)
+    assert set(df["Name"].cat.categories) == {r[1] for r in REGIONS}
+    assert len(load_inkar(path, nordbayern=False)) == len(INDIKATOREN) * len(JAHRE)
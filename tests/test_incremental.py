@@ -0,0 +1,79 @@
+"""Inkrementelle Aktualisierung gegenüber einem vollständigen Lauf der Pipeline."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from supplyscore.incremental import IncrementalScorer, StructuralChange
+from supplyscore.pipeline import ScoringParams, ScoringPipeline
+
+from conftest import INKAR
+
+NUERNBERG, BAMBERG = "09564000", "09461000"
+
+
+def modified_extract(tmp_path, changes):
+    """Kopie des INKAR-Extrakts mit geänderten Werten {(Kennziffer, Indikator, Zeitbezug): Wert}."""
+    df = pd.read_parquet(INKAR)
+    for (kz, indikator, year), wert in changes.items():
+        cell = (df["Kennziffer"] == kz) & (df["Indikator"] == indikator) & (df["Zeitbezug"] == year)
+        assert cell.any()
+        df.loc[cell, "Wert"] = wert
+    path = tmp_path / "inkar.parquet"
+    df.to_parquet(path, index=False)
+    return path
+
+
+def delta_rows(changes):
+    return pd.DataFrame([{"Kennziffer": kz, "Indikator": i, "Zeitbezug": y, "Wert": w}
+                         for (kz, i, y), w in changes.items()])
+
+
+def assert_matches_full_run(tmp_path, reference, changes, params=None):
+    params = ScoringParams() if params is None else params
+    scorer = IncrementalScorer.build(tmp_path / "state", ScoringPipeline(INKAR, params, reference=reference))
+    report = scorer.apply(delta_rows(changes))
+    expected = ScoringPipeline(modified_extract(tmp_path, changes), params, reference=reference).run()
+
+    table = IncrementalScorer.open(tmp_path / "state").table
+    assert list(table["Kennziffer"]) == list(expected["Kennziffer"])
+    for col in expected.columns.drop(["Kennziffer", "Name"]):
+        np.testing.assert_allclose(table[col].to_numpy(dtype=float), expected[col].to_numpy(dtype=float),
+                                   rtol=1e-12, atol=1e-9, err_msg=col)
+    return report
+
+
+def test_value_within_range(tmp_path, reference):
+    report = assert_matches_full_run(tmp_path, reference, {(BAMBERG, "Medianeinkommen", "2023"): 3900.0})
+    assert report["regionen"] == [BAMBERG]
+
+
+def test_new_extreme_renormalizes(tmp_path, reference):
+    report = assert_matches_full_run(tmp_path, reference, {(NUERNBERG, "Medianeinkommen", "2023"): 9000.0,
+                                                           (BAMBERG, "Arbeitslosenquote", "2023"): 0.5})
+    assert {"S_Medianeinkommen", "S_Arbeitslosenquote"} <= set(report["normalisiert"])
+
+
+def test_past_year_column(tmp_path, reference):
+    assert_matches_full_run(tmp_path, reference, {(NUERNBERG, "Pkw-Dichte", "1995"): 400.0})
+
+
+def test_growth_with_missing_past_value(tmp_path, reference):
+    # Fehlender Vorjahreswert: Wachstum wie in der Pipeline 0 (nicht unendlich)
+    params = ScoringParams(past_year="2018")
+    assert_matches_full_run(tmp_path, reference, {(NUERNBERG, "Medianeinkommen", "2018"): np.nan,
+                                                  (BAMBERG, "Medianeinkommen", "2018"): 2500.0}, params)
+
+
+@pytest.mark.parametrize("changes", [
+    {(NUERNBERG, "Medianeinkommen", "1995"): 100.0},  # Vergleichsjahr ohne Spalte Medianeinkommen_OLD
+    {(NUERNBERG, "Medianeinkommen", "2010"): 100.0},  # weder aktuelles noch Vergleichsjahr
+    {(NUERNBERG, "Medianeinkommen", "2024"): 100.0},  # neues Jahr
+    {("09999999", "Medianeinkommen", "2023"): 100.0},  # neue Region
+])
+def test_structural_change(tmp_path, pipeline, changes):
+    scorer = IncrementalScorer.build(tmp_path / "state", pipeline)
+    before = scorer.table.copy()
+    with pytest.raises(StructuralChange):
+        scorer.apply(delta_rows(changes))
+    pd.testing.assert_frame_equal(scorer.table, before)
@@ -0,0 +1,73 @@
+"""Laufzeit-Instrumentierung: Aktivierung über die Umgebung, JSON-Ausgabe und Callbacks."""
+
+import json
+
+import pytest
+
+from supplyscore import instrument
+from supplyscore.cli import build_parser
+from supplyscore.instrument import ENV_VAR, Instrumentation
+
+
+@pytest.mark.parametrize("value", [None, "", "0", "false", "No", "OFF", " off "])
+def test_env_disabled(monkeypatch, value):
+    if value is None:
+        monkeypatch.delenv(ENV_VAR, raising=False)
+    else:
+        monkeypatch.setenv(ENV_VAR, value)
+    inst = Instrumentation.from_env()
+    assert not inst.enabled and inst.target is None
+
+
+@pytest.mark.parametrize("value", ["1", "stderr", "true", "Yes", "on"])
+def test_env_stderr(monkeypatch, capsys, value):
+    monkeypatch.setenv(ENV_VAR, value)
+    inst = Instrumentation.from_env()
+    assert inst.enabled and inst.target == "stderr"
+    with inst.stage("load") as record:
+        record["rows"] = 3
+    assert json.loads(capsys.readouterr().err)["rows"] == 3
+
+
+def test_env_file(monkeypatch, tmp_path):
+    path = tmp_path / "stufen.jsonl"
+    monkeypatch.setenv(ENV_VAR, str(path))
+    inst = Instrumentation.from_env()
+    for name in ("load", "cube"):
+        with inst.stage(name):
+            pass
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [r["stage"] for r in records] == ["load", "cube"]
+
+
+def test_hook_receives_pipeline_stages(pipeline, monkeypatch):
+    base = pipeline.run()  # Vorstufen berechnet, die Messung erfasst nur die Stufe 'index'
+    records = []
+    monkeypatch.setattr(instrument.instrumentation, "hooks", [])
+    monkeypatch.setattr(instrument.instrumentation, "enabled", False)
+    instrument.instrumentation.add_hook(records.append)
+    pipeline.run(straf_faktor=0.2345)
+    assert [r["stage"] for r in records] == ["index"]
+    record = records[0]
+    assert record["rows"] == len(base)
+    assert record["wall_s"] >= 0 and record["cpu_s"] >= 0 and record["peak_rss_prozess_bytes"] > 0
+
+
+def test_disabled_stage_records_nothing():
+    records = []
+    inst = Instrumentation("off")
+    with inst.stage("load") as record:
+        record["rows"] = 1
+    assert not inst.enabled and records == []
+    inst.add_hook(records.append)
+    inst.enable("0")  # Ausgabe aus, Callback bleibt aktiv
+    with inst.stage("load"):
+        pass
+    assert inst.enabled and [r["stage"] for r in records] == ["load"]
+
+
+def test_cli_flag_takes_a_value():
+    args = build_parser().parse_args(["--instrument", "stderr", "score"])
+    assert args.instrument == "stderr" and args.command == "score"
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["--instrument", "score"])
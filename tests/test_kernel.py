@@ -0,0 +1,77 @@
+"""Scoring-Kern gegenüber dem ursprünglichen pandas-Verfahren (Spalte für Spalte)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from supplyscore import config
+from supplyscore.kernel import ScoringKernel, min_max
+
+
+def norm(s, invert=False):
+    """Min-Max-Normalisierung wie im ursprünglichen Skript."""
+    if s.max() == s.min(): return 0
+    if invert: return (s.max() - s) / (s.max() - s.min()) * 100
+    return (s - s.min()) / (s.max() - s.min()) * 100
+
+
+def pandas_scores(df):
+    """S_*, Cat_*, Sub-Scores und Indizes mit pandas aus einem Querschnitt mit Einwohnern und Filialen."""
+    df = df.copy()
+    for col in config.INDIKATOREN:
+        if col in df.columns:
+            df[f"S_{col}"] = norm(df[col], invert=col in config.INVERTIERTE_INDIKATOREN)
+    for cat, cols in config.KATEGORIEN.items():
+        valid = [f"S_{c}" for c in cols if f"S_{c}" in df.columns]
+        df[cat] = df[valid].mean(axis=1) if valid else 0
+    df["Score_Hunger"] = norm(df["Einwohner"] / df["Filialen"])
+    df["Score_Geld"] = norm(df["Einzelhandelsrelevante Kaufkraft"] * df["Einwohner"] / 1_000_000)
+    df["Score_Security"] = norm(df["Arbeitslosenquote"], invert=True)
+    df["Score_Trend"] = norm(df["Wachstum_Prozent"])
+    df["Score_Penalty"] = norm(df["Filialen"] / df["Einwohner"])
+    df["Hunter_Index"] = (df["Score_Hunger"] * 2.0 + df["Score_Trend"] * 1.5 + df["Score_Security"] * 1.0 +
+                          df["Score_Geld"] * 0.5) / 5.0
+    df["Index_Vorher"] = df[list(config.KATEGORIEN)].mean(axis=1)
+    df["Index_Nachher"] = df["Index_Vorher"] - df["Score_Penalty"] * config.STRAF_FAKTOR
+    return df
+
+
+@pytest.fixture(scope="module")
+def table(pipeline):
+    return pipeline.run()
+
+
+def test_pipeline_matches_pandas(pipeline, table):
+    pivot = pipeline.stage("pivot").copy()
+    pivot[["Einwohner", "Filialen"]] = table[["Einwohner", "Filialen"]].to_numpy()
+    expected = pandas_scores(pivot)
+    cols = [c for c in expected.columns if c.startswith(("S_", "Cat_", "Score_"))] + list(ScoringKernel.INDEX_COLUMNS)
+    for col in cols:
+        np.testing.assert_allclose(table[col], expected[col], rtol=1e-12, atol=1e-9, err_msg=col)
+
+
+def test_kernel_matches_table(pipeline, table):
+    kernel = ScoringKernel.from_frame(table)
+    X, K = kernel.inputs(table)
+    out = kernel(X, K)
+    np.testing.assert_allclose(out, table[kernel.columns].to_numpy(dtype=float), rtol=1e-12, atol=1e-9)
+    # Wiederholter Lauf mit 'out=' liefert dasselbe Ergebnis
+    np.testing.assert_array_equal(kernel(X, K, out=np.empty_like(out)), out)
+
+
+def test_custom_categories(pipeline):
+    kategorien = (("Cat_A", ("Medianeinkommen", "Pkw-Dichte")), ("Cat_B", ("Arbeitslosenquote",)))
+    df = pipeline.run(kategorien=kategorien)
+    expected = pd.concat([(df["S_Medianeinkommen"] + df["S_Pkw-Dichte"]) / 2, df["S_Arbeitslosenquote"]], axis=1)
+    np.testing.assert_allclose(df["Index_Vorher"], expected.mean(axis=1))
+    assert "Cat_Wohlstand" not in df.columns
+
+
+@pytest.mark.parametrize("inplace", [False, True], ids=["kopie", "out=X"])
+def test_min_max_inverted_columns(inplace):
+    X = np.array([[0.0, 100.0, 5.0], [50.0, 50.0, 5.0], [100.0, 0.0, 5.0]])
+    expected = np.array([[0.0, 0.0, 0.0], [50.0, 50.0, 0.0], [100.0, 100.0, 0.0]])
+    result = min_max(X, invert=[False, True, True], out=X if inplace else None)
+    np.testing.assert_array_equal(result, expected)
+    if inplace:
+        assert result is X
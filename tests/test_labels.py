@@ -0,0 +1,49 @@
+"""Beschriftungsplatzierung: überlappungsfreie Texte, Spatial Hash gegenüber dem paarweisen Vergleich."""
+
+import itertools
+
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from supplyscore.labels import SpatialGrid, artist_box, marker_boxes, overlap_area, place_labels
+
+
+def random_boxes(rng, n, scale=500.0, size=60.0):
+    x0, y0 = rng.uniform(0, scale, n), rng.uniform(0, scale, n)
+    w, h = rng.uniform(1, size, n), rng.uniform(1, size, n)
+    return list(zip(x0, y0, x0 + w, y0 + h))
+
+
+@pytest.mark.parametrize("cell_size", [0.5, 7.0, 40.0, 1000.0])
+def test_spatial_grid_matches_pairwise(cell_size):
+    rng = np.random.default_rng(0)
+    boxes, queries = random_boxes(rng, 200), random_boxes(rng, 100, size=120.0)
+    grid = SpatialGrid(cell_size)
+    for box in boxes:
+        grid.insert(box)
+    for query in queries:
+        assert grid.overlap(query) == pytest.approx(sum(overlap_area(query, box) for box in boxes))
+
+
+def test_placed_labels_do_not_overlap():
+    rng = np.random.default_rng(1)
+    fig = Figure(figsize=(10, 8))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    # dicht gedrängte Punkte: an der Wunschposition überlappen sich die Beschriftungen
+    x, y = rng.normal(0, 1, 20), rng.normal(0, 1, 20)
+    ax.set_xlim(-8, 8)
+    ax.set_ylim(-8, 8)
+    scatter = ax.scatter(x, y, s=200)
+    annotations = [ax.annotate(f"Region {i}", xy=(a, b), xytext=(a, b), textcoords="data", fontsize=12)
+                   for i, (a, b) in enumerate(zip(x, y))]
+
+    assert place_labels(ax, annotations, obstacles=marker_boxes(scatter)) == 0
+    fig.draw_without_rendering()
+    renderer = fig.canvas.get_renderer()
+    boxes = [artist_box(ann, renderer) for ann in annotations]
+    assert all(overlap_area(a, b) == 0 for a, b in itertools.combinations(boxes, 2))
+    limits = ax.get_window_extent(renderer)
+    assert all(limits.x0 <= b[0] and b[2] <= limits.x1 and limits.y0 <= b[1] and b[3] <= limits.y1 for b in boxes)
@@ -0,0 +1,41 @@
+"""Panel-Scoring: Score-Historie gegenüber Läufen der Pipeline je Jahr, Trendmerkmale je Region."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from supplyscore.normalization import METHODS
+from supplyscore.panel import score_panel
+
+
+@pytest.mark.parametrize("normalisierung", METHODS)
+def test_history_matches_pipeline_per_year(pipeline, normalisierung):
+    params = pipeline.params.replace(normalisierung=normalisierung)
+    _, historie = score_panel(pipeline, params)
+    cube = pipeline.stage("cube", params)
+    cols = [c for c in historie.columns if c.startswith("Cat_")] + ["Score_Penalty", "Index_Vorher",
+                                                                     "Index_Nachher"]
+    assert list(historie["Zeitbezug"].unique()) == list(cube.years)
+    for year in cube.years:
+        expected = pipeline.stage("index", params.replace(latest_year=year)).set_index("Kennziffer")
+        jahr = historie[historie["Zeitbezug"] == year].set_index("Kennziffer")
+        assert sorted(jahr.index) == sorted(expected.index), year
+        np.testing.assert_allclose(jahr.loc[expected.index, cols], expected[cols], rtol=1e-12, atol=1e-9,
+                                   err_msg=year)
+
+
+def test_trend_features(pipeline):
+    trends, _ = score_panel(pipeline)
+    cube = pipeline.stage("cube")
+    indikator = pipeline.params.trend_indikator
+    series = pd.DataFrame(cube.series(indikator), index=cube.regions, columns=cube.year_numbers)
+    trends = trends.set_index("Kennziffer")
+
+    cagr = pd.Series(cube.cagr(indikator), index=cube.regions).loc[trends.index]
+    np.testing.assert_allclose(trends[f"Trend_CAGR_{indikator}"], cagr, rtol=1e-12, equal_nan=True)
+    for kz, row in series.loc[trends.index].iterrows():
+        row = row.dropna()
+        steigung = np.polyfit(row.index, row.to_numpy(), 1)[0] if len(row) > 1 else np.nan
+        np.testing.assert_allclose(trends.loc[kz, f"Trend_Steigung_{indikator}"], steigung, rtol=1e-8,
+                                   equal_nan=True, err_msg=kz)
+    assert trends["Index_Trend"].between(0, 100).all()
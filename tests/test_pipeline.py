@@ -0,0 +1,39 @@
+"""Zwischengespeicherte Stufen der Pipeline: Neuberechnung nur geänderter Stufen, LRU je Stufe."""
+
+import pandas as pd
+import pytest
+
+from conftest import INKAR
+from supplyscore.pipeline import CACHE_ENTRIES, STAGE_NAMES, ScoringPipeline
+
+
+@pytest.fixture()
+def computed(reference, count_stages):
+    """Frische Pipeline und Liste der berechneten Stufen."""
+    pipeline = ScoringPipeline(INKAR, reference=reference)
+    return pipeline, count_stages(pipeline)
+
+
+def test_only_changed_stages_are_recomputed(computed):
+    pipeline, calls = computed
+    base = pipeline.run()
+    assert calls == list(STAGE_NAMES)
+    pipeline.run(straf_faktor=0.5)
+    assert calls[len(STAGE_NAMES):] == ["index"]
+    pd.testing.assert_frame_equal(pipeline.run(), base)
+    assert len(calls) == len(STAGE_NAMES) + 1
+
+
+def test_stage_cache_is_bounded(computed):
+    pipeline, calls = computed
+    faktoren = [0.1 * i for i in range(CACHE_ENTRIES + 2)]
+    results = {f: pipeline.run(straf_faktor=f) for f in faktoren}
+    assert all(len(cache) <= CACHE_ENTRIES for cache in pipeline._cache.values())
+    assert len(pipeline._cache["index"]) == CACHE_ENTRIES
+    assert calls.count("index") == len(faktoren) and calls.count("load") == 1
+
+    # die jüngsten Einträge bleiben erhalten, die ältesten werden neu berechnet
+    pipeline.run(straf_faktor=faktoren[-1])
+    assert calls.count("index") == len(faktoren)
+    pd.testing.assert_frame_equal(pipeline.run(straf_faktor=faktoren[0]), results[faktoren[0]])
+    assert calls.count("index") == len(faktoren) + 1
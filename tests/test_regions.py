@@ -0,0 +1,63 @@
+"""Auflösung von Referenzschlüsseln: Kennziffer, Landkreis/kreisfreie Stadt, normalisierter Name."""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from supplyscore.regions import RegionIndex
+
+FUERTH_STADT, FUERTH_LK = "09563000", "09573000"
+NEA, NEW = "09575000", "09374000"
+WEIDEN = "09363000"
+
+REGIONS = pd.DataFrame({
+    "Kennziffer": [FUERTH_STADT, FUERTH_LK, NEA, NEW, WEIDEN],
+    "Name": ["Fürth, Stadt", "Fürth", "Neustadt a.d.Aisch-Bad Windsheim", "Neustadt a.d.Waldnaab",
+             "Weiden i.d.OPf., Stadt"],
+})
+
+
+@pytest.fixture()
+def index():
+    return RegionIndex(REGIONS)
+
+
+@pytest.mark.parametrize("key, expected", [
+    (FUERTH_LK, FUERTH_LK),  # Kennziffer vor jedem Namen
+    ("Fürth", FUERTH_STADT),  # 'X' -> 'X, Stadt'
+    ("Fürth, Stadt", FUERTH_STADT),
+    ("Fürth, Landkreis", FUERTH_LK),
+    (" Weiden ", WEIDEN),  # eindeutiger normalisierter Name
+    ("Neustadt a.d.Waldnaab", NEW),  # exakter Name
+])
+def test_resolve_key(index, key, expected):
+    assert index.resolve_key(key) == (expected, None)
+
+
+@pytest.mark.parametrize("key, reason", [
+    ("Neustadt", "mehrdeutig"),
+    ("Atlantis", "nicht gefunden"),
+    ("Atlantis, Landkreis", "nicht gefunden"),
+    ("99999999", "unbekannte Kennziffer"),
+])
+def test_unresolved_key(index, key, reason):
+    assert index.resolve_key(key) == (None, reason)
+
+
+def test_resolve_warns_on_ambiguous_keys(index):
+    reference = {"Fürth": 1.0, "Fürth, Landkreis": 2.0, "Neustadt": 3.0, "Atlantis": 4.0, FUERTH_STADT: 5.0}
+    with pytest.warns(UserWarning, match="nicht eindeutig") as record:
+        values = index.resolve(reference)
+    message = str(record[0].message)
+    assert "Neustadt" in message and FUERTH_STADT in message and "Atlantis" not in message
+    assert values.to_dict() == {FUERTH_STADT: 1.0, FUERTH_LK: 2.0}
+    assert index.problems == {"Neustadt": "mehrdeutig", "Atlantis": "nicht gefunden", FUERTH_STADT: "doppelt"}
+
+
+def test_lookup_fills_default(index):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # nicht gefundene Schlüssel werden nicht gewarnt
+        values = index.lookup(REGIONS["Kennziffer"], {"Fürth, Landkreis": 2.0, "Weiden": 7.0, "Atlantis": 1.0}, -1)
+    np.testing.assert_array_equal(values, [-1, 2.0, -1, -1, 7.0])
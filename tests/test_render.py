@@ -0,0 +1,45 @@
+"""Render-Cache: übersprungene Abbildungen und Manifest der Zielordner."""
+
+import pytest
+
+from supplyscore import render
+from supplyscore.render import read_manifest, render_all
+from supplyscore.selection import select_top
+
+FIGURES = ["1_Bankdichte", "4b_Finaler_Score_Bankdichte"]
+
+
+@pytest.fixture()
+def rendered(pipeline, monkeypatch):
+    """Top-N der Pipeline und Liste der tatsächlich gezeichneten Abbildungen."""
+    calls = []
+    job = render.render_job
+
+    def counting_job(name, *args):
+        calls.append(name)
+        return job(name, *args)
+
+    monkeypatch.setattr(render, "render_job", counting_job)
+    return select_top(pipeline.run()), calls
+
+
+def test_unchanged_figures_are_skipped(rendered, tmp_path):
+    top, calls = rendered
+    paths = render_all(top, tmp_path, figures=FIGURES, processes=1)
+    assert calls == FIGURES and all(path.exists() for path in paths)
+    assert render_all(top, tmp_path, figures=FIGURES, processes=1) == paths
+    assert calls == FIGURES
+
+
+def test_rendering_without_cache_keeps_manifest(rendered, tmp_path):
+    top, calls = rendered
+    render_all(top, tmp_path, figures=FIGURES, processes=1)
+    manifest = read_manifest(tmp_path)
+    assert len(manifest) == len(FIGURES)
+
+    # Neuzeichnen einer Abbildung ohne Cache: die übrigen Einträge bleiben erhalten
+    render_all(top, tmp_path, figures=FIGURES[:1], processes=1, cache=False)
+    assert calls == FIGURES + FIGURES[:1]
+    assert read_manifest(tmp_path) == manifest
+    render_all(top, tmp_path, figures=FIGURES, processes=1)
+    assert calls == FIGURES + FIGURES[:1]
@@ -0,0 +1,56 @@
+"""Top-N-Auswahl gegenüber sort_values().head(n): Gleichstand an der Grenze, Blacklist, Gruppen."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from supplyscore.selection import select_top, select_top_per_group
+
+N_REGIONS = 200
+
+
+@pytest.fixture(scope="module")
+def df():
+    """Regionen in sieben Regierungsbezirken mit vielen gleichen Indexwerten und einigen Fehlwerten."""
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 6, N_REGIONS).astype(float)
+    values[rng.choice(N_REGIONS, 10, replace=False)] = np.nan
+    bezirke = rng.integers(1, 8, N_REGIONS)
+    return pd.DataFrame({
+        "Kennziffer": [f"09{b}{i:05d}" for i, b in zip(range(N_REGIONS), bezirke)],
+        "Name": [f"Region {i}" for i in range(N_REGIONS)],
+        "Index_Vorher": values,
+    })
+
+
+def reference_top(df, top_n, blacklist=()):
+    """Erwartete Auswahl: absteigend, stabil (bei Gleichstand die Position), Fehlwerte zuletzt."""
+    pool = df[~df["Name"].isin(list(blacklist))]
+    return pool.sort_values("Index_Vorher", ascending=False, kind="stable", na_position="last").head(top_n)
+
+
+@pytest.mark.parametrize("top_n", [0, 1, 8, 33, 190, N_REGIONS, N_REGIONS + 50])
+def test_select_top_matches_sort_values(df, top_n):
+    # Werte 0..5 mit je ~30 Regionen: die Grenze fällt fast immer in einen Gleichstand
+    pd.testing.assert_frame_equal(select_top(df, blacklist=(), top_n=top_n), reference_top(df, top_n))
+
+
+def test_select_top_blacklist(df):
+    best = reference_top(df, 5)["Name"].tolist()
+    blacklist = best[::2] + ["Atlantis"]
+    top = select_top(df, blacklist=blacklist, top_n=8)
+    assert not top["Name"].isin(blacklist).any()
+    pd.testing.assert_frame_equal(top, reference_top(df, 8, blacklist))
+
+
+@pytest.mark.parametrize("top_n", [3, 8, N_REGIONS])
+def test_select_top_per_group(df, top_n):
+    blacklist = df["Name"].iloc[::11].tolist()
+    top = select_top_per_group(df, blacklist=blacklist, top_n=top_n)
+    bezirk = df["Kennziffer"].str[:3]
+    for gruppe, rows in top.groupby("Gruppe", sort=False):
+        expected = reference_top(df[bezirk == gruppe], top_n, blacklist)
+        assert rows["Rang"].tolist() == list(range(1, len(expected) + 1))
+        pd.testing.assert_frame_equal(rows.drop(columns=["Gruppe", "Rang"]), expected)
+    assert top["Gruppe"].tolist() == sorted(top["Gruppe"])
+    assert set(top["Gruppe"]) == set(bezirk)
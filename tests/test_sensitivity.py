@@ -0,0 +1,80 @@
+"""Kendalls Tau und Rangstabilität: sortierbasiertes Verfahren gegenüber dem paarweisen Vergleich."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import INKAR
+from supplyscore import sensitivity
+from supplyscore.cli import main
+from supplyscore.sensitivity import inversions, kendall_tau, rank_stability
+
+
+def pairwise_tau(scores, baseline):
+    i, j = np.triu_indices(len(baseline), k=1)
+    return (np.sign(scores[i] - scores[j]) * np.sign(baseline[i] - baseline[j])[:, None]).mean(axis=0)
+
+
+@pytest.mark.parametrize("n", [2, 3, 16, 17, 100])
+def test_kendall_tau_with_ties(n):
+    rng = np.random.default_rng(n)
+    baseline = rng.integers(0, 5, n).astype(float)
+    scores = rng.integers(0, 5, (n, 40)).astype(float)
+    np.testing.assert_allclose(kendall_tau(scores, baseline), pairwise_tau(scores, baseline), atol=1e-12)
+
+
+def test_kendall_tau_continuous():
+    rng = np.random.default_rng(0)
+    baseline = rng.random(300)
+    scores = baseline[:, None] + rng.normal(0, 0.2, (300, 25))
+    np.testing.assert_allclose(kendall_tau(scores, baseline), pairwise_tau(scores, baseline), atol=1e-12)
+    np.testing.assert_allclose(kendall_tau(baseline[:, None], baseline), [1.0])
+
+
+@pytest.mark.parametrize("n", [1, 2, 37, 1025, 5000])  # 1025/5000: 64-Bit-Schlüssel bzw. float64-Summen
+def test_inversions(n):
+    rng = np.random.default_rng(n)
+    values = rng.integers(0, n // 3 + 2, (3, n)).astype(float)
+    expected = [sum(int((row[:j] > row[j]).sum()) for j in range(n)) for row in values]
+    np.testing.assert_array_equal(inversions(values), expected)
+
+
+def rank_reference(df, samples, top_n=8):
+    """Kennzahlen aus der vollständigen Rangmatrix (Regionen x Stichproben)."""
+    offset, features, _, _ = sensitivity.hunter_target(df)
+    ranks = sensitivity.ranks_of(offset + samples @ features.T).T
+    n_regions, n_samples = ranks.shape
+    share = (ranks[:, :, None] <= np.arange(1, n_regions + 1)).sum(axis=1) / n_samples
+    return {f"P_Top_{top_n}": (ranks <= top_n).mean(axis=1), "Rang_Min": ranks.min(axis=1),
+            **{col: (share >= q).argmax(axis=1) + 1 for col, q in sensitivity.RANK_QUANTILES.items()},
+            "Rang_Max": ranks.max(axis=1)}
+
+
+@pytest.mark.parametrize("rank_bins", [sensitivity.RANK_BINS, 4])  # 4: Rangklassen, zweiter Durchlauf
+def test_rank_stability_matches_full_histogram(pipeline, monkeypatch, rank_bins):
+    monkeypatch.setattr(sensitivity, "RANK_BINS", rank_bins)
+    df = pipeline.run()
+    samples = sensitivity.sample_parameters(sensitivity.hunter_target(df)[3], "dirichlet", n=500)
+    table, _ = rank_stability(df, "Hunter_Index", samples=samples, blacklist=(), chunk_size=64)
+    expected = pd.DataFrame(rank_reference(df, samples), index=df["Kennziffer"]).loc[table["Kennziffer"]]
+    for col in expected:
+        np.testing.assert_array_equal(table[col], expected[col], err_msg=col)
+
+
+def test_rank_stability_independent_of_chunks(pipeline):
+    df = pipeline.run()
+    table, taus = rank_stability(df, "Hunter_Index", method="dirichlet", n=1_000)
+    chunked, chunked_taus = rank_stability(df, "Hunter_Index", method="dirichlet", n=1_000, chunk_size=7)
+    pd.testing.assert_frame_equal(table, chunked)
+    np.testing.assert_array_equal(taus, chunked_taus)
+    assert (table["Rang_Min"] <= table["Rang_Median"]).all() and (table["Rang_Median"] <= table["Rang_Max"]).all()
+    assert table["P_Top_8"].between(0, 1).all()
+
+
+@pytest.mark.parametrize("ziel", ["Index_Nachher", "Index_Final"])
+def test_cli_single_factor_targets(capsys, ziel):
+    argv = ["--data", str(INKAR), "--ohne-cache", "sensitivity", "--ziel", ziel, "--stichproben", "200"]
+    main(argv)  # Standard: lhs, da nur ein Faktor variiert wird
+    assert "Kendalls Tau" in capsys.readouterr().out
+    with pytest.raises(SystemExit, match="dirichlet"):
+        main(argv + ["--methode", "dirichlet"])
@@ -0,0 +1,40 @@
+"""Out-of-core-Verarbeitung gegenüber Würfel und Ergebnistabelle der speicherresidenten Pipeline."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import INKAR
+from supplyscore import config
+from supplyscore.cube import IndicatorCube
+from supplyscore.data import load_inkar
+from supplyscore.normalization import METHODS
+from supplyscore.pipeline import ScoringPipeline
+from supplyscore.streaming import InkarBatches, stream_cube, stream_scores
+
+BATCH_SIZE = 1_000  # mehrere Blöcke auch für den kleinen Extrakt
+CHUNK_REGIONS = 7
+
+
+def test_stream_cube_matches_from_long():
+    expected = IndicatorCube.from_long(load_inkar(INKAR, indikatoren=config.INDIKATOREN))
+    cube = stream_cube(InkarBatches(INKAR, indikatoren=config.INDIKATOREN, batch_size=BATCH_SIZE))
+    for axis in ("regions", "names", "indikatoren", "years"):
+        np.testing.assert_array_equal(getattr(cube, axis), getattr(expected, axis), err_msg=axis)
+    np.testing.assert_allclose(cube.values, expected.values, rtol=1e-12, equal_nan=True)
+
+
+def test_batched_pipeline_matches(pipeline, reference):
+    batched = ScoringPipeline(INKAR, reference=reference, batch_size=BATCH_SIZE)
+    pd.testing.assert_frame_equal(batched.run(), pipeline.run(), rtol=1e-12)
+
+
+@pytest.mark.parametrize("normalisierung", METHODS)
+def test_stream_scores_match_pipeline(pipeline, normalisierung, tmp_path):
+    params = pipeline.params.replace(normalisierung=normalisierung)
+    rows = stream_scores(pipeline, tmp_path / "ergebnisse.parquet", params, chunk_regions=CHUNK_REGIONS)
+    result = pd.read_parquet(tmp_path / "ergebnisse.parquet")
+    expected = pipeline.stage("index", params).reset_index(drop=True)
+    assert rows == len(expected)
+    assert list(result.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, rtol=1e-9, atol=1e-9)
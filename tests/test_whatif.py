@@ -0,0 +1,80 @@
+"""Was-wäre-wenn-Abfragen gegenüber einem vollständigen Lauf und Fehlerbehandlung des HTTP-Dienstes."""
+
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from supplyscore.whatif import WhatIfModel, make_handler
+
+NUERNBERG, BAMBERG = "09564000", "09461000"
+
+
+@pytest.fixture(scope="module")
+def model(pipeline):
+    return WhatIfModel.from_pipeline(pipeline)
+
+
+def test_query_matches_full_run(pipeline, model):
+    base = pipeline.run().set_index("Kennziffer")
+    filialen, einwohner = base["Filialen"].to_dict(), base["Einwohner"].to_dict()
+    filialen[NUERNBERG] += 500  # neues Maximum der Dichte: Score_Penalty wird neu normalisiert
+    filialen[BAMBERG] -= 1
+    einwohner[BAMBERG] += 5000
+
+    result = model.query(filialen={NUERNBERG: 500, BAMBERG: -1}, einwohner={BAMBERG: 5000})
+    expected = pipeline.run(filialen=tuple(filialen.items()), einwohner=tuple(einwohner.items()))
+    ergebnis = result["ergebnis"].set_index("Kennziffer").loc[expected["Kennziffer"]]
+    for col in ["Versorgung", "Dichte", "Score_Hunger", "Score_Geld", "Score_Penalty", "Hunter_Index",
+                "Index_Nachher"]:
+        np.testing.assert_allclose(ergebnis[col], expected[col], rtol=1e-12, atol=1e-9, err_msg=col)
+    assert "Score_Penalty" in result["normalisiert"]
+    # Die Basis bleibt unverändert
+    np.testing.assert_array_equal(model.result()["Filialen"].sort_index(), base["Filialen"].to_numpy())
+
+
+@pytest.fixture(scope="module")
+def server(model):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(model))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, body):
+    conn = http.client.HTTPConnection(*server.server_address, timeout=10)
+    conn.request("POST", "/szenario", body=body.encode("utf-8"), headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    payload = json.loads(response.read())
+    conn.close()
+    return response.status, payload
+
+
+@pytest.mark.parametrize("body", [
+    '{"filialen": {"Bamberg, Stadt": null}}',
+    '{"filialen": {"Bamberg, Stadt": "x"}}',
+    '{"filialen": [1, 2]}',
+    '{"einwohner": {"Bamberg, Stadt": true}}',
+    '{"filialen": {"Bamberg, Stadt": -1}, "top": "x"}',
+    '{"filialen": {"Bamberg, Stadt": -1}, "top": -1}',
+    '{"filialen": {"Unbekannt": -1}}',
+    '{"filialen": {"Bamberg, Stadt": -1000}}',
+    '{"filiale": {}}',
+    '[1, 2]',
+    'kein json',
+])
+def test_bad_request(server, body):
+    status, payload = post(server, body)
+    assert status == 400
+    assert payload["fehler"]
+
+
+def test_valid_request(server):
+    status, payload = post(server, '{"filialen": {"Bamberg, Stadt": -1}, "top": 8}')
+    assert status == 200
+    assert len(payload["ergebnis"]) == 8